@@ -35,6 +35,7 @@ CREATE TABLE IF NOT EXISTS documents (
     metadata JSONB,
     patient_id VARCHAR(100),
     document_type VARCHAR(100),
+    checksum VARCHAR(64),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -42,6 +43,8 @@ CREATE TABLE IF NOT EXISTS documents (
 CREATE INDEX idx_documents_patient_id ON documents(patient_id);
 CREATE INDEX idx_documents_document_type ON documents(document_type);
 CREATE INDEX idx_documents_upload_date ON documents(upload_date);
+-- Pagination par curseur (keyset) sur (created_at, id)
+CREATE INDEX idx_documents_created_at_id ON documents(created_at, id);
 
 -- Connexion à la base docqa_deid
 \c docqa_deid;
@@ -106,6 +109,7 @@ CREATE TABLE IF NOT EXISTS audit_logs (
 CREATE INDEX idx_audit_user_id ON audit_logs(user_id);
 CREATE INDEX idx_audit_action ON audit_logs(action);
 CREATE INDEX idx_audit_created_at ON audit_logs(created_at);
+CREATE INDEX idx_audit_created_at_id ON audit_logs(created_at, id);
 
 -- Table des sessions utilisateurs
 CREATE TABLE IF NOT EXISTS user_sessions (
@@ -0,0 +1,230 @@
+"""
+File d'admission des routes LLM (/api/qa/ask, /api/synthesis/*)
+
+Ollama ne traite efficacement qu'une ou deux générations à la fois : au-delà,
+les requêtes s'empilent côté modèle et toutes finissent en timeout. La
+gateway n'en laisse donc passer que `max_concurrency` en parallèle ; les
+suivantes attendent dans une file ordonnée par classe de priorité (les
+questions interactives avant les synthèses), puis par ordre d'arrivée.
+
+La latence reste bornée sous surcharge :
+- file pleine (`max_queue`) : refus immédiat (503 + Retry-After) ;
+- attente estimée (durée moyenne d'une génération x position) au-delà du
+  délai de la classe : refus immédiat plutôt qu'un timeout plus tard ;
+- délai dépassé pendant l'attente : la requête quitte la file et n'est
+  jamais envoyée au modèle.
+
+Chaque requête admise connaît sa position à l'arrivée et son temps d'attente
+(en-têtes X-Queue-Position et X-Queue-Wait).
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+QUEUE_POSITION_HEADER = "X-Queue-Position"
+QUEUE_WAIT_HEADER = "X-Queue-Wait"
+
+# Poids de la dernière génération dans la durée moyenne (moyenne mobile exponentielle)
+SERVICE_TIME_ALPHA = 0.2
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    """Classe de priorité : plus `priority` est petit, plus tôt la requête est servie"""
+    name: str
+    priority: int
+    max_wait: float
+
+
+class AdmissionRejected(Exception):
+    """Requête refusée sans appel au modèle (file pleine ou délai intenable)"""
+
+    def __init__(self, reason: str, retry_after: float, position: int = 0):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.position = position
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after))
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(self.retry_after_seconds)}
+
+
+class AdmissionTicket:
+    """Place accordée à une requête ; release() est idempotent"""
+
+    __slots__ = ("_queue", "position", "waited", "started", "_released")
+
+    def __init__(self, queue: "AdmissionQueue", position: int, waited: float):
+        self._queue = queue
+        self.position = position
+        self.waited = waited
+        self.started = queue._clock()
+        self._released = False
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            QUEUE_POSITION_HEADER: str(self.position),
+            QUEUE_WAIT_HEADER: str(round(self.waited * 1000)),
+        }
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._queue._release(self._queue._clock() - self.started)
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "deadline", "future", "cls")
+
+    def __init__(self, cls: PriorityClass, seq: int, deadline: float, future: asyncio.Future):
+        self.cls = cls
+        self.priority = cls.priority
+        self.seq = seq
+        self.deadline = deadline
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionQueue:
+    """Sémaphore à priorités avec profondeur maximale et délais d'attente"""
+
+    def __init__(
+        self,
+        name: str,
+        classes: List[PriorityClass],
+        max_concurrency: int = 2,
+        max_queue: int = 20,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.classes = {cls.name: cls for cls in classes}
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._clock = clock
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self.active = 0
+        self.service_time: Optional[float] = None
+        self.admitted = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "deadline": 0, "timeout": 0}
+
+    def estimated_wait(self, ahead: int) -> Optional[float]:
+        """Attente estimée derrière `ahead` requêtes, toutes les places étant prises"""
+        if self.service_time is None:
+            return None
+        return (ahead + 1) * self.service_time / self.max_concurrency
+
+    def _ahead(self, priority: int) -> int:
+        return sum(1 for waiter in self._waiters if waiter.priority <= priority)
+
+    async def admit(self, class_name: str, deadline: Optional[float] = None) -> AdmissionTicket:
+        """
+        Attend une place pour une requête de la classe donnée
+
+        `deadline` (horloge de la file) raccourcit le délai de la classe.
+        Lève AdmissionRejected si la requête ne peut pas être servie à temps.
+        """
+        cls = self.classes[class_name]
+        now = self._clock()
+        deadline = min(deadline if deadline is not None else math.inf, now + cls.max_wait)
+
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return AdmissionTicket(self, 0, 0.0)
+
+        ahead = self._ahead(cls.priority)
+        estimate = self.estimated_wait(ahead)
+        if len(self._waiters) >= self.max_queue:
+            self.shed["queue_full"] += 1
+            raise AdmissionRejected("queue_full", estimate or cls.max_wait, ahead)
+        if estimate is not None and now + estimate > deadline:
+            self.shed["deadline"] += 1
+            raise AdmissionRejected("deadline", estimate, ahead)
+
+        waiter = _Waiter(cls, next(self._seq), deadline, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await asyncio.wait_for(waiter.future, max(0.0, deadline - now))
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.shed["timeout"] += 1
+            raise AdmissionRejected("timeout", self.estimated_wait(ahead) or cls.max_wait, ahead)
+        except asyncio.CancelledError:
+            # Client parti : rendre la place si elle venait d'être accordée
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                self._release(None)
+            else:
+                self._discard(waiter)
+            raise
+
+        self.admitted += 1
+        return AdmissionTicket(self, ahead, self._clock() - now)
+
+    @asynccontextmanager
+    async def slot(self, class_name: str, deadline: Optional[float] = None):
+        """async with queue.slot("qa") as ticket: ... (place rendue à la sortie)"""
+        ticket = await self.admit(class_name, deadline)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def _discard(self, waiter: _Waiter):
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+
+    def _release(self, duration: Optional[float]):
+        if duration is not None:
+            self.service_time = duration if self.service_time is None else (
+                SERVICE_TIME_ALPHA * duration + (1 - SERVICE_TIME_ALPHA) * self.service_time
+            )
+        self.active -= 1
+        # Place transmise au premier en attente encore dans les temps
+        now = self._clock()
+        while self._waiters and self.active < self.max_concurrency:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.future.done():
+                continue
+            if now > waiter.deadline:
+                self.shed["timeout"] += 1
+                waiter.future.set_exception(AdmissionRejected("timeout", self.service_time or waiter.cls.max_wait))
+                continue
+            self.active += 1
+            waiter.future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "maxConcurrency": self.max_concurrency,
+            "queued": len(self._waiters),
+            "maxQueue": self.max_queue,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "avgServiceTime": round(self.service_time, 3) if self.service_time is not None else None,
+            "classes": {
+                name: {
+                    "priority": cls.priority,
+                    "maxWait": cls.max_wait,
+                    "queued": sum(1 for waiter in self._waiters if waiter.cls is cls),
+                    "estimatedWait": (
+                        self.estimated_wait(self._ahead(cls.priority)) if self.active >= self.max_concurrency else 0.0
+                    ),
+                }
+                for name, cls in self.classes.items()
+            },
+        }
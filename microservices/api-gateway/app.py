@@ -3,16 +3,38 @@ API Gateway - Point d'entrée unique pour tous les microservices DocQA
 """
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+from prometheus_client import CONTENT_TYPE_LATEST
 import httpx
 from typing import Optional, List
-import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 import uuid
 
 from config import settings
+from upstreams import UpstreamRegistry, build_upstream_configs
+from uploads import MultipartRelay, UploadTooLarge, UPLOAD_OPENAPI_SCHEMA
+from bulk_upload import BULK_UPLOAD_OPENAPI_SCHEMA, BulkUploader, BulkUploadError, collect_entries, parse_manifest
+from proxy import passthrough, relay_event_stream
+from health import HealthMonitor
+from cache import SWRCache, Uncacheable
+from document_cache import DocumentCache, not_modified
+from hedging import HedgeBudget, Hedger
+from state import build_state
+from rate_limit import RateLimitMiddleware, build_rate_limiter
+from singleflight import SingleFlight, coalesced_query_audit, question_key
+from admission import QUEUE_POSITION_HEADER, QUEUE_WAIT_HEADER, AdmissionQueue, AdmissionRejected, PriorityClass
+from notification_hub import NotificationHub
+from latency import LatencyWindow
+from request_id import RequestIdMiddleware
+from deadline import DEADLINE_HEADER, DeadlineMiddleware, build_route_budgets, current_deadline, without_deadline
+from json_response import FastJSONResponse
+from dashboard import DashboardAggregator, DashboardSource
+from batch import BatchError, BatchRunner, parse_batch
+from metrics import QA_STREAM_TTFT, MetricsMiddleware, register_stats_collector, render_metrics
 
 # Configuration du logging
 logging.basicConfig(
@@ -26,35 +48,108 @@ ERROR_DOC_INGESTOR_UNAVAILABLE = "Service doc-ingestor indisponible"
 ERROR_INDEXER_UNAVAILABLE = "Service indexeur indisponible"
 ERROR_DEID_UNAVAILABLE = "Service deid indisponible"
 ERROR_LLM_QA_UNAVAILABLE = "Service llm-qa indisponible"
+ERROR_LLM_BUSY = "Modèle surchargé, réessayez dans quelques instants"
 ERROR_AUDIT_UNAVAILABLE = "Service audit indisponible"
 ERROR_CONVERSATION_NOT_FOUND = "Conversation non trouvée"
 ERROR_NOTIFICATION_NOT_FOUND = "Notification non trouvée"
+ERROR_UPLOAD_TOO_LARGE = f"Fichier trop volumineux. Taille max: {settings.MAX_UPLOAD_SIZE} bytes"
 
-# Client HTTP asynchrone global
-http_client: Optional[httpx.AsyncClient] = None
+# Clients HTTP par service (un pool de connexions par microservice)
+upstreams: Optional[UpstreamRegistry] = None
 
-# Stockage en mémoire des notifications (en production, utiliser Redis/DB)
-notifications_store = []
+# Poller de santé des services (instantané servi depuis la mémoire)
+health_monitor: Optional[HealthMonitor] = None
 
-# Stockage en mémoire des conversations Q&A
-conversations_store = []
+# Prête à recevoir du trafic : démarrage terminé et arrêt non commencé (/health/ready)
+gateway_ready = False
+
+# Caches des agrégations coûteuses (stale-while-revalidate)
+dashboard_cache = SWRCache(
+    "dashboard",
+    ttl=settings.DASHBOARD_CACHE_TTL,
+    stale_ttl=settings.DASHBOARD_CACHE_STALE_TTL
+)
+audit_stats_cache = SWRCache(
+    "audit-stats",
+    ttl=settings.AUDIT_STATS_CACHE_TTL,
+    stale_ttl=settings.AUDIT_STATS_CACHE_STALE_TTL
+)
+
+# Corps des documents validés par ETag (réponses 304 sans appel amont)
+document_cache = DocumentCache(
+    max_bytes=settings.DOCUMENT_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.DOCUMENT_CACHE_MAX_ENTRY_BYTES,
+    ttl=settings.DOCUMENT_CACHE_TTL
+)
+
+# Lectures idempotentes de doc-ingestor relancées au p95 (budget commun)
+hedge_budget = HedgeBudget(ratio=settings.HEDGE_BUDGET_RATIO, burst=settings.HEDGE_BUDGET_BURST)
+document_hedgers = {
+    name: Hedger(
+        name,
+        hedge_budget,
+        enabled=settings.HEDGE_ENABLED,
+        percentile=settings.HEDGE_PERCENTILE,
+        min_samples=settings.HEDGE_MIN_SAMPLES,
+        min_delay=settings.HEDGE_MIN_DELAY_MS / 1000
+    )
+    for name in ("documents", "document-content")
+}
+
+# Questions Q/R identiques en cours : un seul appel au LLM
+qa_flight = SingleFlight("qa-ask")
+
+# Générations LLM simultanées (Ollama) : Q/R interactives servies avant les synthèses
+llm_queue = AdmissionQueue(
+    "llm",
+    classes=[
+        PriorityClass("qa", priority=0, max_wait=settings.LLM_QUEUE_QA_MAX_WAIT),
+        PriorityClass("synthesis", priority=1, max_wait=settings.LLM_QUEUE_SYNTHESIS_MAX_WAIT),
+    ],
+    max_concurrency=settings.LLM_QUEUE_CONCURRENCY,
+    max_queue=settings.LLM_QUEUE_MAX_DEPTH
+)
+
+# Réponses Q/R streamées : temps jusqu'au premier token et durée totale (ms)
+qa_stream_ttft = LatencyWindow()
+qa_stream_duration = LatencyWindow()
+
+# Etat des notifications et conversations Q&A (mémoire, SQLite ou PostgreSQL)
+gateway_state = build_state(settings)
+notifications_store = gateway_state.notifications
+conversations_store = gateway_state.conversations
+
+# Diffusion SSE des notifications aux onglets ouverts (remplace le polling)
+notification_hub = NotificationHub(
+    queue_size=settings.NOTIFICATIONS_STREAM_QUEUE_SIZE,
+    heartbeat=settings.NOTIFICATIONS_STREAM_HEARTBEAT
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application"""
-    global http_client
+    global upstreams, health_monitor, gateway_ready
     
     logger.info("[START] Demarrage de l'API Gateway...")
     
-    # Créer le client HTTP avec timeout configuré
-    http_client = httpx.AsyncClient(
-        timeout=httpx.Timeout(60.0, connect=10.0),
-        follow_redirects=True
-    )
+    # Créer un client HTTP (pool, limites, timeouts) par microservice
+    upstreams = UpstreamRegistry(build_upstream_configs(settings))
+    
+    # Schéma et écritures différées du backend d'état
+    await gateway_state.start()
     
-    # Vérifier la santé des services
-    await check_services_health()
+    # Découverte des services en tâche de fond : le démarrage n'attend aucun
+    # service (un service injoignable coûterait HEALTH_CHECK_TIMEOUT)
+    health_monitor = HealthMonitor(
+        services=[(client.name, client.base_url) for client in upstreams],
+        probe=check_service_health,
+        interval=settings.HEALTH_POLL_INTERVAL,
+        jitter=settings.HEALTH_POLL_JITTER,
+        history_size=settings.HEALTH_HISTORY_SIZE
+    )
+    health_monitor.start(immediate=True)
+    gateway_ready = True
     
     logger.info(f"[OK] API Gateway demarre sur http://{settings.HOST}:{settings.PORT}")
     
@@ -62,8 +157,13 @@ async def lifespan(app: FastAPI):
     
     # Cleanup
     logger.info("[STOP] Arret de l'API Gateway...")
-    if http_client:
-        await http_client.aclose()
+    gateway_ready = False
+    notification_hub.close()
+    if health_monitor:
+        await health_monitor.stop()
+    if upstreams:
+        await upstreams.aclose()
+    await gateway_state.aclose()
     logger.info("[OK] API Gateway arrete")
 
 
@@ -71,7 +171,8 @@ app = FastAPI(
     title="DocQA API Gateway",
     description="Point d'entrée unifié pour l'architecture microservices DocQA",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configuration CORS - Restreindre les origines autorisées
@@ -87,21 +188,45 @@ ALLOWED_ORIGINS = [
     "https://localhost:8000",
 ]
 
+# Limitation de débit (ajoutée avant CORS pour que les 429 portent les en-têtes CORS)
+rate_limiter = build_rate_limiter(settings)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED
+    )
+
+# Echéance de chaque requête selon le budget de sa route (X-Deadline-Ms vers les services)
+route_budgets, default_budget = build_route_budgets(settings)
+app.add_middleware(DeadlineMiddleware, budgets=route_budgets, default=default_budget)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Request-ID"],
+    allow_headers=["Content-Type", "Authorization", "X-Request-ID", "If-None-Match", DEADLINE_HEADER],
+    expose_headers=["ETag", "Retry-After", "X-Request-ID", QUEUE_POSITION_HEADER, QUEUE_WAIT_HEADER],
 )
 
+# Latence par route (englobe les 429 et les réponses CORS)
+app.add_middleware(MetricsMiddleware)
+
+# Identifiant de requête (le plus externe : présent sur toutes les réponses)
+app.add_middleware(RequestIdMiddleware)
+
 
 # ============ HEALTH CHECKS ============
 
 async def check_service_health(name: str, url: str) -> dict:
     """Vérifie la santé d'un service"""
     try:
-        response = await http_client.get(f"{url}/health", timeout=5.0)
+        response = await upstreams[name].get(
+            "/health",
+            timeout=settings.HEALTH_CHECK_TIMEOUT,
+            bypass_breaker=True
+        )
         return {
             "name": name,
             "url": url,
@@ -117,29 +242,22 @@ async def check_service_health(name: str, url: str) -> dict:
         }
 
 
-async def check_services_health():
-    """Vérifie la santé de tous les services"""
-    services = [
-        ("doc-ingestor", settings.DOC_INGESTOR_URL),
-        ("deid-service", settings.DEID_SERVICE_URL),
-        ("indexeur-semantique", settings.INDEXEUR_URL),
-        ("llm-qa-module", settings.LLM_QA_URL),
-        ("synthese-comparative", settings.SYNTHESE_URL),
-        ("audit-logger", settings.AUDIT_URL),
+def _with_circuit_state(results: List[dict]) -> List[dict]:
+    """Ajoute l'état courant du disjoncteur de chaque service"""
+    return [
+        {**result, "circuit": upstreams[result["name"]].breaker.snapshot()}
+        for result in results
     ]
-    
-    tasks = [check_service_health(name, url) for name, url in services]
-    results = await asyncio.gather(*tasks)
-    
-    for result in results:
-        status = result["status"]
-        name = result["name"]
-        if status == "healthy":
-            logger.info(f"[OK] {name} est disponible")
-        else:
-            logger.warning(f"[WARN] {name} est {status}")
-    
-    return results
+
+
+async def check_services_health():
+    """Interroge immédiatement tous les services et met à jour l'instantané"""
+    return _with_circuit_state(await health_monitor.refresh())
+
+
+def services_health_snapshot() -> List[dict]:
+    """Dernier état connu des services, sans requête réseau"""
+    return _with_circuit_state(health_monitor.snapshot())
 
 
 @app.get("/health")
@@ -148,90 +266,314 @@ async def health_check():
     return {"status": "healthy", "service": "api-gateway"}
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness : le processus répond (aucune dépendance vérifiée)"""
+    return {"status": "alive", "service": "api-gateway"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness : la gateway accepte du trafic
+    
+    Ne dépend pas de l'état des microservices (une route vers un service
+    indisponible répond 503 d'elle-même) : une nouvelle réplique est prête
+    dès la fin du démarrage, pendant que la découverte se poursuit.
+    """
+    if not gateway_ready:
+        return FastJSONResponse(content={"status": "not_ready", "service": "api-gateway"}, status_code=503)
+    return {
+        "status": "ready",
+        "service": "api-gateway",
+        "discovery": "complete" if health_monitor.discovered else "pending",
+        "services": {s["name"]: s["status"] for s in health_monitor.snapshot()}
+    }
+
+
 @app.get("/api/health/services")
-async def get_services_health():
-    """Récupère l'état de santé de tous les services"""
-    return await check_services_health()
+async def get_services_health(refresh: bool = False):
+    """Récupère l'état de santé de tous les services (refresh=true pour forcer une vérification)"""
+    if refresh:
+        return await check_services_health()
+    return services_health_snapshot()
+
+
+def gateway_stats() -> dict:
+    """Instantané des compteurs internes (servi par /api/gateway/stats et /metrics)"""
+    return {
+        "upstreams": upstreams.stats() if upstreams else {},
+        "caches": {
+            cache.name: cache.stats()
+            for cache in (dashboard_cache, audit_stats_cache)
+        },
+        "documentCache": document_cache.stats(),
+        "conversations": gateway_state.conversation_stats(),
+        "state": gateway_state.stats(),
+        "rateLimit": rate_limiter.stats(),
+        "coalescing": {qa_flight.name: qa_flight.stats()},
+        "notificationStream": notification_hub.stats(),
+        "qaStream": {"ttftMs": qa_stream_ttft.stats(), "durationMs": qa_stream_duration.stats()},
+        "batch": batch_runner.stats(),
+        "bulkUpload": bulk_uploader.stats(),
+        "llmQueue": llm_queue.stats(),
+        "dashboard": dashboard_aggregator.stats(),
+        "hedging": {
+            "budget": hedge_budget.stats(),
+            "routes": {name: hedger.stats() for name, hedger in document_hedgers.items()}
+        }
+    }
+
+
+register_stats_collector(gateway_stats)
+
+
+@app.get("/api/gateway/stats")
+async def get_gateway_stats():
+    """Statistiques internes de la gateway (pools HTTP, caches)"""
+    return gateway_stats()
+
+
+@app.get("/api/gateway/llm-queue")
+async def get_llm_queue():
+    """File d'admission LLM : places occupées, attente par classe (affichage de la position)"""
+    return llm_queue.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Métriques au format d'exposition Prometheus"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+# ============ REQUETES GROUPEES ============
+
+batch_runner = BatchRunner(
+    app,
+    max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+    max_requests=settings.BATCH_MAX_REQUESTS
+)
+
+
+@app.post("/api/batch")
+async def run_batch(request: Request):
+    """
+    Exécute plusieurs requêtes de lecture en un seul appel
+    
+    Corps : {"requests": [{"id": "docs", "method": "GET", "path": "/api/documents?limit=20"}, ...]}
+    Réponse : {"responses": [{"id": "docs", "status": 200, "body": {...}}, ...]} dans le même ordre.
+    Chaque sous-requête a son propre statut ; seul un lot invalide est rejeté en entier.
+    """
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Corps JSON invalide")
+    try:
+        items = parse_batch(payload, settings.BATCH_MAX_REQUESTS)
+    except BatchError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return {"responses": await batch_runner.run(items, request.scope)}
 
 
 # ============ DOCUMENTS (Doc-Ingestor) ============
 
-@app.post("/api/documents/upload")
-async def upload_document(
-    file: UploadFile = File(...),
-    patient_id: Optional[str] = Form(None),
-    document_type: Optional[str] = Form(None)
-):
-    """Upload un document vers le service d'ingestion"""
+def declared_length(request: Request) -> Optional[int]:
+    """Content-Length de la requête (None s'il est absent, 400 s'il est invalide)"""
+    value = request.headers.get("content-length")
+    if value is None:
+        return None
     try:
-        files = {"file": (file.filename, await file.read(), file.content_type)}
-        data = {}
-        if patient_id:
-            data["patient_id"] = patient_id
-        if document_type:
-            data["document_type"] = document_type
-        
-        response = await http_client.post(
-            f"{settings.DOC_INGESTOR_URL}/api/documents/upload",
-            files=files,
-            data=data
+        length = int(value)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPException(status_code=400, detail="En-tête Content-Length invalide")
+    return length
+
+
+@app.post("/api/documents/upload", openapi_extra=UPLOAD_OPENAPI_SCHEMA)
+async def upload_document(request: Request):
+    """Upload un document vers le service d'ingestion (corps multipart relayé en flux)"""
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Le corps doit être de type multipart/form-data")
+    
+    content_length = declared_length(request)
+    if content_length is not None and content_length > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=ERROR_UPLOAD_TOO_LARGE)
+    
+    headers = {"Content-Type": content_type}
+    if content_length is not None:
+        headers["Content-Length"] = str(content_length)
+    
+    upload = MultipartRelay(request.stream(), settings.MAX_UPLOAD_SIZE)
+    try:
+        response = await upstreams["doc-ingestor"].post(
+            "/api/documents/upload",
+            content=upload,
+            headers=headers
         )
+        try:
+            result = response.json()
+        except ValueError:
+            # Corps non JSON (page d'erreur d'un proxy, trace brute)
+            result = {"detail": response.text[:200]}
         
         if response.status_code == 200:
+            filename = result.get("filename", upload.filename)
             # Créer une notification de succès
             create_notification(
                 notification_type="document",
                 title="Document uploadé",
-                message=f"Le document '{file.filename}' a été uploadé avec succès.",
-                data={"filename": file.filename, "patientId": patient_id},
+                message=f"Le document '{filename}' a été uploadé avec succès.",
+                data={"filename": filename, "patientId": result.get("patient_id")},
                 priority="normal"
             )
         
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return FastJSONResponse(content=result, status_code=response.status_code)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=ERROR_UPLOAD_TOO_LARGE)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Upload document: {e}")
         create_notification(
             notification_type="error",
             title="Échec de l'upload",
-            message=f"L'upload du document '{file.filename}' a échoué.",
+            message=f"L'upload du document '{upload.filename or 'inconnu'}' a échoué.",
             priority="high"
         )
         raise HTTPException(status_code=503, detail=ERROR_DOC_INGESTOR_UNAVAILABLE)
 
 
+bulk_uploader = BulkUploader(
+    concurrency=settings.BULK_UPLOAD_CONCURRENCY,
+    max_file_size=settings.MAX_UPLOAD_SIZE
+)
+
+
+@app.post("/api/documents/upload/bulk", openapi_extra=BULK_UPLOAD_OPENAPI_SCHEMA)
+async def upload_documents_bulk(request: Request):
+    """
+    Upload groupé : plusieurs fichiers et/ou archives zip (champ `files`)
+    
+    Chaque document est transmis à doc-ingestor comme un upload individuel,
+    au plus BULK_UPLOAD_CONCURRENCY à la fois. `document_type` et `patient_id`
+    s'appliquent à tous les documents ; `manifest` (JSON) les précise par
+    nom de fichier. La réponse donne un résultat par document.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Le corps doit être de type multipart/form-data")
+    
+    content_length = declared_length(request)
+    if content_length is None:
+        raise HTTPException(status_code=411, detail="En-tête Content-Length requis pour un upload groupé")
+    if content_length > settings.BULK_UPLOAD_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"Upload groupé supérieur à {settings.BULK_UPLOAD_MAX_SIZE} octets")
+    
+    form = await request.form(max_files=settings.BULK_UPLOAD_MAX_FILES, max_fields=100)
+    try:
+        entries = collect_entries(
+            [part for part in form.getlist("files") if not isinstance(part, str)],
+            settings.BULK_UPLOAD_MAX_FILES
+        )
+        manifest = parse_manifest(form.get("manifest"))
+        fields = {"document_type": form.get("document_type"), "patient_id": form.get("patient_id")}
+        results = await bulk_uploader.run(upstreams["doc-ingestor"], entries, fields, manifest)
+    except BulkUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    finally:
+        await form.close()
+    
+    succeeded = sum(1 for r in results if 200 <= r["status"] < 300)
+    failed = len(results) - succeeded
+    create_notification(
+        notification_type="document" if not failed else "warning",
+        title="Upload groupé terminé",
+        message=f"{succeeded} document(s) uploadé(s), {failed} échec(s).",
+        data={"succeeded": succeeded, "failed": failed},
+        priority="normal" if not failed else "high"
+    )
+    return {"total": len(results), "succeeded": succeeded, "failed": failed, "results": results}
+
+
 @app.get("/api/documents")
 async def get_documents(
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     patient_id: Optional[str] = None,
     document_type: Optional[str] = None
 ):
-    """Récupère la liste des documents"""
+    """Récupère la liste des documents (page suivante : cursor = next_cursor de la réponse)"""
     try:
         params = {"limit": limit, "offset": offset}
+        if cursor:
+            params = {"limit": limit, "cursor": cursor}
         if patient_id:
             params["patient_id"] = patient_id
         if document_type:
             params["document_type"] = document_type
         
-        response = await http_client.get(
-            f"{settings.DOC_INGESTOR_URL}/api/documents",
-            params=params
+        response = await document_hedgers["documents"].run(
+            lambda: upstreams["doc-ingestor"].get("/api/documents", params=params, stream=True)
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get documents: {e}")
         raise HTTPException(status_code=503, detail=ERROR_DOC_INGESTOR_UNAVAILABLE)
 
 
+async def get_cached_document(path: str, request: Request, hedger: Optional[Hedger] = None):
+    """
+    GET conditionnel sur doc-ingestor via le cache de documents
+    
+    Une entrée fraîche est servie depuis la mémoire ; une entrée plus ancienne
+    est revalidée par If-None-Match. Le client reçoit un 304 s'il présente
+    l'ETag courant. Avec un hedger, l'appel amont est relancé au p95.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    entry = document_cache.get(path)
+    if entry is not None and document_cache.is_fresh(entry):
+        return document_cache.respond(entry, if_none_match)
+    
+    headers = {}
+    if entry is not None:
+        headers["If-None-Match"] = entry.etag
+    elif if_none_match:
+        headers["If-None-Match"] = if_none_match
+    
+    def fetch():
+        return upstreams["doc-ingestor"].get(path, headers=headers, stream=True)
+    
+    response = await (hedger.run(fetch) if hedger is not None else fetch())
+    
+    if response.status_code == 304:
+        await response.aclose()
+        etag = response.headers.get("etag")
+        if entry is not None and etag in (None, entry.etag):
+            document_cache.revalidated(entry)
+            return document_cache.respond(entry, if_none_match)
+        # Version non cachée mais déjà détenue par le client
+        return not_modified(etag or if_none_match)
+    
+    etag = response.headers.get("etag")
+    if response.status_code == 200 and etag and document_cache.accepts(response.headers.get("content-length")):
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        entry = document_cache.put(path, etag, content, response.headers.get("content-type"))
+        return document_cache.respond(entry, if_none_match)
+    
+    document_cache.invalidate(path)
+    return await passthrough(response)
+
+
 @app.get("/api/documents/{document_id}")
-async def get_document(document_id: int):
-    """Récupère un document par son ID"""
+async def get_document(document_id: int, request: Request):
+    """Récupère un document par son ID (cache validé par ETag)"""
     try:
-        response = await http_client.get(
-            f"{settings.DOC_INGESTOR_URL}/api/documents/{document_id}"
-        )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await get_cached_document(f"/api/documents/{document_id}", request)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get document {document_id}: {e}")
         raise HTTPException(status_code=503, detail=ERROR_DOC_INGESTOR_UNAVAILABLE)
@@ -241,8 +583,14 @@ async def get_document(document_id: int):
 async def delete_document(document_id: int):
     """Supprime un document"""
     try:
-        response = await http_client.delete(
-            f"{settings.DOC_INGESTOR_URL}/api/documents/{document_id}"
+        response = await upstreams["doc-ingestor"].delete(
+            f"/api/documents/{document_id}",
+            stream=True
+        )
+        
+        document_cache.invalidate(
+            f"/api/documents/{document_id}",
+            f"/api/documents/{document_id}/content"
         )
         
         if response.status_code == 200:
@@ -254,20 +602,21 @@ async def delete_document(document_id: int):
                 priority="normal"
             )
         
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Delete document {document_id}: {e}")
         raise HTTPException(status_code=503, detail=ERROR_DOC_INGESTOR_UNAVAILABLE)
 
 
 @app.get("/api/documents/{document_id}/content")
-async def get_document_content(document_id: int):
-    """Récupère le contenu textuel d'un document pour visualisation"""
+async def get_document_content(document_id: int, request: Request):
+    """Récupère le contenu textuel d'un document pour visualisation (cache validé par ETag)"""
     try:
-        response = await http_client.get(
-            f"{settings.DOC_INGESTOR_URL}/api/documents/{document_id}/content"
+        return await get_cached_document(
+            f"/api/documents/{document_id}/content",
+            request,
+            hedger=document_hedgers["document-content"]
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get document content {document_id}: {e}")
         raise HTTPException(status_code=503, detail=ERROR_DOC_INGESTOR_UNAVAILABLE)
@@ -280,11 +629,12 @@ async def anonymize_document(request: Request):
     """Anonymise un document"""
     try:
         body = await request.json()
-        response = await http_client.post(
-            f"{settings.DEID_SERVICE_URL}/api/deid/anonymize",
-            json=body
+        response = await upstreams["deid-service"].post(
+            "/api/deid/anonymize",
+            json=body,
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Anonymize: {e}")
         raise HTTPException(status_code=503, detail=ERROR_DEID_UNAVAILABLE)
@@ -294,10 +644,11 @@ async def anonymize_document(request: Request):
 async def get_mappings(document_id: int):
     """Récupère les mappings d'anonymisation"""
     try:
-        response = await http_client.get(
-            f"{settings.DEID_SERVICE_URL}/api/deid/mappings/{document_id}"
+        response = await upstreams["deid-service"].get(
+            f"/api/deid/mappings/{document_id}",
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get mappings: {e}")
         raise HTTPException(status_code=503, detail=ERROR_DEID_UNAVAILABLE)
@@ -310,11 +661,12 @@ async def search_documents(request: Request):
     """Recherche sémantique dans les documents"""
     try:
         body = await request.json()
-        response = await http_client.post(
-            f"{settings.INDEXEUR_URL}/api/search",
-            json=body
+        response = await upstreams["indexeur-semantique"].post(
+            "/api/search",
+            json=body,
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Search: {e}")
         raise HTTPException(status_code=503, detail=ERROR_INDEXER_UNAVAILABLE)
@@ -325,11 +677,12 @@ async def index_document(request: Request):
     """Indexe un document"""
     try:
         body = await request.json()
-        response = await http_client.post(
-            f"{settings.INDEXEUR_URL}/api/index",
-            json=body
+        response = await upstreams["indexeur-semantique"].post(
+            "/api/index",
+            json=body,
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Index: {e}")
         raise HTTPException(status_code=503, detail="Service indexeur indisponible")
@@ -337,20 +690,51 @@ async def index_document(request: Request):
 
 # ============ QUESTION-REPONSE (LLM-QA-Module) ============
 
+def llm_busy(rejected: AdmissionRejected) -> Response:
+    """503 sans appel au modèle : file LLM pleine ou attente au-delà du délai"""
+    logger.warning(f"[WARN] Requete LLM refusee ({rejected.reason}, position {rejected.position})")
+    return FastJSONResponse(
+        content={
+            "detail": ERROR_LLM_BUSY,
+            "reason": rejected.reason,
+            "queuePosition": rejected.position,
+            "retryAfter": rejected.retry_after_seconds
+        },
+        status_code=503,
+        headers=rejected.headers
+    )
+
+
+def with_queue_headers(response: Response, ticket) -> Response:
+    response.headers.update(ticket.headers)
+    return response
+
+
+async def log_audit(entry: dict):
+    """Envoie une entrée d'audit (non bloquant : une erreur est journalisée)"""
+    try:
+        # Exécuté après la réponse : l'échéance de la question ne s'applique plus
+        with without_deadline():
+            await upstreams["audit-logger"].post("/api/audit/log", json=entry)
+    except httpx.RequestError as e:
+        logger.warning(f"[WARN] AuditLogger non disponible - log non enregistre: {e}")
+
+
 @app.post("/api/qa/ask")
 async def ask_question(request: Request):
-    """Pose une question au système Q/R"""
-    try:
-        body = await request.json()
-        question = body.get("question", "")[:50]  # Limiter pour la notification
-        
-        response = await http_client.post(
-            f"{settings.LLM_QA_URL}/api/qa/ask",
-            json=body,
-            timeout=120.0  # Timeout plus long pour LLM
-        )
-        
+    """Pose une question au système Q/R (questions identiques en cours regroupées)"""
+    start = time.perf_counter()
+    body = await request.json()
+    leader = False
+
+    async def ask_upstream():
+        # Exécuté une seule fois pour toutes les requêtes regroupées (une seule place LLM)
+        nonlocal leader
+        leader = True
+        async with llm_queue.slot("qa", deadline=current_deadline()) as ticket:
+            response = await upstreams["llm-qa-module"].post("/api/qa/ask", json=body)
         if response.status_code == 200:
+            question = (body.get("question") or "")[:50]  # Limiter pour la notification
             create_notification(
                 notification_type="qa",
                 title="Réponse IA disponible",
@@ -358,8 +742,20 @@ async def ask_question(request: Request):
                 data={"question": body.get("question")},
                 priority="normal"
             )
-        
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return response.status_code, response.content, response.headers.get("content-type"), ticket.headers
+
+    try:
+        status_code, content, media_type, headers = await qa_flight.do(question_key(body), ask_upstream)
+        audit = None
+        if not leader and status_code == 200:
+            # L'appel amont n'a été audité qu'une fois, par llm-qa
+            processing_time = int((time.perf_counter() - start) * 1000)
+            audit = BackgroundTask(log_audit, coalesced_query_audit(body, content, processing_time))
+        return Response(
+            content=content, status_code=status_code, media_type=media_type, headers=headers, background=audit
+        )
+    except AdmissionRejected as e:
+        return llm_busy(e)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] QA Ask: {e}")
         create_notification(
@@ -369,21 +765,64 @@ async def ask_question(request: Request):
             priority="high"
         )
         # Fallback avec réponse simulée
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "answer": "Le service Q/R n'est pas disponible actuellement. Veuillez réessayer plus tard.",
             "sources": [],
             "confidence": 0
         }, status_code=200)
 
 
+@app.post("/api/qa/ask/stream")
+async def ask_question_stream(request: Request):
+    """Pose une question, réponse relayée en streaming (Server-Sent Events)"""
+    start = time.perf_counter()
+    body = await request.json()
+    try:
+        ticket = await llm_queue.admit("qa", deadline=current_deadline())
+    except AdmissionRejected as e:
+        return llm_busy(e)
+    try:
+        response = await upstreams["llm-qa-module"].post(
+            "/api/qa/ask/stream",
+            json=body,
+            stream=True
+        )
+    except httpx.RequestError as e:
+        ticket.release()
+        logger.error(f"[ERREUR] QA Ask stream: {e}")
+        raise HTTPException(status_code=503, detail=ERROR_LLM_QA_UNAVAILABLE)
+
+    if response.status_code != 200:
+        # 404 (aucun document), 5xx : réponse JSON classique
+        ticket.release()
+        return await passthrough(response)
+
+    def first_token():
+        elapsed = time.perf_counter() - start
+        qa_stream_ttft.record(elapsed * 1000)
+        QA_STREAM_TTFT.observe(elapsed)
+
+    def finished():
+        ticket.release()
+        qa_stream_duration.record((time.perf_counter() - start) * 1000)
+
+    # La place LLM est tenue jusqu'à la fin de la génération, donc du flux
+    stream = await relay_event_stream(
+        response, on_marker=first_token, background=BackgroundTask(finished), on_close=ticket.release
+    )
+    stream.headers.update(ticket.headers)
+    return stream
+
+
 @app.get("/api/qa/history/{session_id}")
 async def get_chat_history(session_id: str):
     """Récupère l'historique de chat"""
     try:
-        response = await http_client.get(
-            f"{settings.LLM_QA_URL}/api/qa/history/{session_id}"
+        response = await upstreams["llm-qa-module"].get(
+            f"/api/qa/history/{session_id}",
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get history: {e}")
         raise HTTPException(status_code=503, detail=ERROR_LLM_QA_UNAVAILABLE)
@@ -398,11 +837,12 @@ async def generate_synthesis(request: Request):
         body = await request.json()
         doc_count = len(body.get("documentIds", []))
         
-        response = await http_client.post(
-            f"{settings.SYNTHESE_URL}/api/synthesis/generate",
-            json=body,
-            timeout=120.0
-        )
+        async with llm_queue.slot("synthesis", deadline=current_deadline()) as ticket:
+            response = await upstreams["synthese-comparative"].post(
+                "/api/synthesis/generate",
+                json=body,
+                stream=True
+            )
         
         if response.status_code == 200:
             create_notification(
@@ -413,7 +853,9 @@ async def generate_synthesis(request: Request):
                 priority="normal"
             )
         
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return with_queue_headers(await passthrough(response), ticket)
+    except AdmissionRejected as e:
+        return llm_busy(e)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Generate synthesis: {e}")
         create_notification(
@@ -430,12 +872,15 @@ async def compare_documents(request: Request):
     """Compare des patients/documents"""
     try:
         body = await request.json()
-        response = await http_client.post(
-            f"{settings.SYNTHESE_URL}/api/synthesis/compare",
-            json=body,
-            timeout=120.0
-        )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        async with llm_queue.slot("synthesis", deadline=current_deadline()) as ticket:
+            response = await upstreams["synthese-comparative"].post(
+                "/api/synthesis/compare",
+                json=body,
+                stream=True
+            )
+        return with_queue_headers(await passthrough(response), ticket)
+    except AdmissionRejected as e:
+        return llm_busy(e)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Compare: {e}")
         raise HTTPException(status_code=503, detail="Service synthese indisponible")
@@ -447,22 +892,31 @@ async def compare_documents(request: Request):
 async def get_audit_logs(
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     action: Optional[str] = None,
     user: Optional[str] = None
 ):
-    """Récupère les logs d'audit"""
+    """
+    Récupère les logs d'audit
+    
+    Avec `cursor` (vide pour la première page, puis nextCursor de la réponse),
+    l'audit pagine par curseur au lieu de limit/offset.
+    """
     try:
         params = {"limit": limit, "offset": offset}
+        if cursor is not None:
+            params = {"limit": limit, "cursor": cursor}
         if action:
             params["action"] = action
         if user:
             params["user"] = user
         
-        response = await http_client.get(
-            f"{settings.AUDIT_URL}/api/audit/logs",
-            params=params
+        response = await upstreams["audit-logger"].get(
+            "/api/audit/logs",
+            params=params,
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get audit logs: {e}")
         raise HTTPException(status_code=503, detail="Service audit indisponible")
@@ -473,19 +927,27 @@ async def get_audit_stats(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None
 ):
-    """Récupère les statistiques d'audit"""
+    """Récupère les statistiques d'audit (mises en cache, voir AUDIT_STATS_CACHE_TTL)"""
+    params = {}
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        params["end_date"] = end_date
+    
+    async def load_audit_stats():
+        response = await upstreams["audit-logger"].get("/api/audit/stats", params=params)
+        cached = (response.status_code, response.content, response.headers.get("content-type"))
+        if response.status_code != 200:
+            # Les erreurs sont relayées telles quelles mais jamais mises en cache
+            raise Uncacheable(cached)
+        return cached
+    
     try:
-        params = {}
-        if start_date:
-            params["start_date"] = start_date
-        if end_date:
-            params["end_date"] = end_date
-        
-        response = await http_client.get(
-            f"{settings.AUDIT_URL}/api/audit/stats",
-            params=params
+        status_code, content, media_type = await audit_stats_cache.get_or_load(
+            (start_date, end_date),
+            load_audit_stats
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return Response(content=content, status_code=status_code, media_type=media_type)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Get audit stats: {e}")
         raise HTTPException(status_code=503, detail=ERROR_AUDIT_UNAVAILABLE)
@@ -496,43 +958,68 @@ async def create_audit_log(request: Request):
     """Crée un log d'audit"""
     try:
         body = await request.json()
-        response = await http_client.post(
-            f"{settings.AUDIT_URL}/api/audit/log",
-            json=body
+        response = await upstreams["audit-logger"].post(
+            "/api/audit/log",
+            json=body,
+            stream=True
         )
-        return JSONResponse(content=response.json(), status_code=response.status_code)
+        return await passthrough(response)
     except httpx.RequestError as e:
         logger.error(f"[ERREUR] Create audit log: {e}")
         # Ne pas lever d'erreur pour l'audit (non-bloquant)
-        return JSONResponse(content={"status": "queued"}, status_code=202)
+        return FastJSONResponse(content={"status": "queued"}, status_code=202)
 
 
 # ============ STATISTIQUES DASHBOARD ============
 
+dashboard_aggregator = DashboardAggregator()
+
+
+def dashboard_source(name: str, service: str, path: str, timeout: float) -> DashboardSource:
+    """Source du dashboard lue sur un service (cache stale-while-revalidate)"""
+    async def load():
+        response = await upstreams[service].get(path, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    return DashboardSource(name, lambda: dashboard_cache.get_or_load(name, load), timeout)
+
+
 @app.get("/api/dashboard/stats")
 async def get_dashboard_stats():
-    """Récupère les statistiques pour le dashboard"""
-    stats = {
-        "documents": {"total": 0, "processed": 0, "pending": 0},
-        "questions": {"total": 0, "today": 0},
-        "services": []
-    }
+    """
+    Récupère les statistiques pour le dashboard
     
-    # Récupérer les stats des documents
-    try:
-        response = await http_client.get(
-            f"{settings.DOC_INGESTOR_URL}/api/documents/stats",
-            timeout=5.0
-        )
-        if response.status_code == 200:
-            stats["documents"] = response.json()
-    except httpx.RequestError as e:
-        logger.warning(f"Could not fetch document stats: {e}")
+    doc-ingestor, llm-qa-module, audit-logger et l'état des services sont
+    interrogés en parallèle, chacun avec son timeout (DASHBOARD_*_TIMEOUT).
+    Une source lente ou indisponible garde ses valeurs par défaut ; `sources`
+    donne l'état et la latence de chacune.
+    """
+    async def load_health():
+        return services_health_snapshot()
+    
+    values, sources = await dashboard_aggregator.run([
+        dashboard_source("documents", "doc-ingestor", "/api/documents/stats", settings.DASHBOARD_DOCUMENTS_TIMEOUT),
+        dashboard_source("qa", "llm-qa-module", "/api/qa/stats", settings.DASHBOARD_QA_TIMEOUT),
+        dashboard_source("audit", "audit-logger", "/api/audit/stats", settings.DASHBOARD_AUDIT_TIMEOUT),
+        DashboardSource("services", load_health, settings.HEALTH_CHECK_TIMEOUT),
+    ])
     
-    # Récupérer l'état des services
-    stats["services"] = await check_services_health()
+    # Questions : total persistant de l'audit (action QUERY), sinon compteur de llm-qa-module
+    qa_counts = (values.get("qa") or {}).get("questions") or {}
+    audit = values.get("audit") or {}
+    audited = (audit.get("logsByAction") or {}).get("QUERY")
     
-    return stats
+    return {
+        "documents": values.get("documents") or {"total": 0, "processed": 0, "pending": 0},
+        "questions": {
+            "total": audited if audited is not None else qa_counts.get("total", 0),
+            "today": qa_counts.get("today", 0)
+        },
+        "audit": {"total": audit.get("totalLogs", 0), "errors": audit.get("errorCount", 0)},
+        "services": values.get("services", []),
+        "sources": sources
+    }
 
 
 if __name__ == "__main__":
@@ -568,11 +1055,10 @@ def create_notification(
         "createdAt": datetime.now(timezone.utc).isoformat(),
         "expiresAt": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
     }
-    notifications_store.insert(0, notification)
-    
-    # Limiter à 100 notifications max
-    if len(notifications_store) > 100:
-        notifications_store.pop()
+    # Hors de la boucle et sans lever : l'échec de la notification ne fait
+    # pas échouer l'opération qui l'a émise
+    gateway_state.submit(notifications_store.add, notification)
+    notification_hub.publish("notification", notification, user_id=user_id)
     
     logger.info(f"[NOTIF] Nouvelle notification: {title}")
     return notification
@@ -585,29 +1071,31 @@ async def get_notifications(
     limit: int = 50
 ):
     """Récupère les notifications pour un utilisateur"""
-    filtered = [
-        n for n in notifications_store
-        if n["userId"] in [user_id, "all"]
-    ]
-    
-    if unread_only:
-        filtered = [n for n in filtered if not n["read"]]
-    
+    unread_count = await gateway_state.call(notifications_store.unread_count, user_id)
     return {
-        "notifications": filtered[:limit],
-        "total": len(filtered),
-        "unreadCount": len([n for n in filtered if not n["read"]])
+        "notifications": await gateway_state.call(
+            notifications_store.visible, user_id, unread_only=unread_only, limit=limit
+        ),
+        "total": unread_count if unread_only else await gateway_state.call(notifications_store.total, user_id),
+        "unreadCount": unread_count
     }
 
 
+@app.get("/api/notifications/stream")
+async def stream_notifications(user_id: str = "all"):
+    """Flux SSE des notifications (événements notification, read, read-all, deleted, cleared)"""
+    subscription = notification_hub.subscribe(user_id)
+    return StreamingResponse(
+        notification_hub.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/notifications/unread-count")
 async def get_unread_count(user_id: str = "all"):
     """Récupère le nombre de notifications non lues"""
-    count = len([
-        n for n in notifications_store
-        if n["userId"] in [user_id, "all"] and not n["read"]
-    ])
-    return {"unreadCount": count}
+    return {"unreadCount": await gateway_state.call(notifications_store.unread_count, user_id)}
 
 
 @app.post("/api/notifications")
@@ -628,31 +1116,27 @@ async def create_notification_endpoint(request: Request):
 @app.put("/api/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str):
     """Marque une notification comme lue"""
-    for notification in notifications_store:
-        if notification["id"] == notification_id:
-            notification["read"] = True
-            return {"success": True, "notification": notification}
-    raise HTTPException(status_code=404, detail=ERROR_NOTIFICATION_NOT_FOUND)
+    notification = await gateway_state.call(notifications_store.mark_read, notification_id)
+    if notification is None:
+        raise HTTPException(status_code=404, detail=ERROR_NOTIFICATION_NOT_FOUND)
+    notification_hub.publish("read", {"id": notification_id}, user_id=notification["userId"])
+    return {"success": True, "notification": notification}
 
 
 @app.put("/api/notifications/read-all")
 async def mark_all_notifications_read(user_id: str = "all"):
     """Marque toutes les notifications comme lues"""
-    count = 0
-    for notification in notifications_store:
-        if notification["userId"] in [user_id, "all"] and not notification["read"]:
-            notification["read"] = True
-            count += 1
-    return {"success": True, "markedCount": count}
+    marked = await gateway_state.call(notifications_store.mark_all_read, user_id)
+    if marked:
+        notification_hub.publish("read-all", {"userId": user_id}, user_id=user_id)
+    return {"success": True, "markedCount": marked}
 
 
 @app.delete("/api/notifications/{notification_id}")
 async def delete_notification(notification_id: str):
     """Supprime une notification"""
-    global notifications_store
-    initial_len = len(notifications_store)
-    notifications_store = [n for n in notifications_store if n["id"] != notification_id]
-    if len(notifications_store) < initial_len:
+    if await gateway_state.call(notifications_store.delete, notification_id):
+        notification_hub.publish("deleted", {"id": notification_id})
         return {"success": True}
     raise HTTPException(status_code=404, detail=ERROR_NOTIFICATION_NOT_FOUND)
 
@@ -660,90 +1144,57 @@ async def delete_notification(notification_id: str):
 @app.delete("/api/notifications")
 async def clear_notifications(user_id: str = "all"):
     """Supprime toutes les notifications d'un utilisateur"""
-    global notifications_store
-    initial_len = len(notifications_store)
-    notifications_store = [n for n in notifications_store if n["userId"] not in [user_id, "all"]]
-    return {"success": True, "deletedCount": initial_len - len(notifications_store)}
+    deleted = await gateway_state.call(notifications_store.clear, user_id)
+    if deleted:
+        notification_hub.publish("cleared", {"userId": user_id}, user_id=user_id)
+    return {"success": True, "deletedCount": deleted}
 
 
 # ============ HISTORIQUE DES CONVERSATIONS Q&A ============
 
-def create_conversation(title: str, patient_id: str = None):
+async def create_conversation(title: str, patient_id: str = None):
     """Crée une nouvelle conversation"""
-    conversation = {
-        "id": str(uuid.uuid4()),
-        "title": title,
-        "patientId": patient_id,
-        "messages": [],
-        "createdAt": datetime.now().isoformat(),
-        "updatedAt": datetime.now().isoformat()
-    }
-    conversations_store.insert(0, conversation)
-    
-    # Limiter à 50 conversations max
-    if len(conversations_store) > 50:
-        conversations_store.pop()
-    
-    return conversation
+    conversation = await gateway_state.call(conversations_store.create, title, patient_id)
+    return conversation.to_dict()
 
 
-def add_message_to_conversation(conversation_id: str, role: str, content: str, sources: list = None):
+async def add_message_to_conversation(conversation_id: str, role: str, content: str, sources: list = None):
     """Ajoute un message à une conversation"""
-    for conv in conversations_store:
-        if conv["id"] == conversation_id:
-            message = {
-                "id": str(uuid.uuid4()),
-                "role": role,  # "user" ou "assistant"
-                "content": content,
-                "sources": sources or [],
-                "timestamp": datetime.now().isoformat()
-            }
-            conv["messages"].append(message)
-            conv["updatedAt"] = datetime.now().isoformat()
-            return message
-    return None
+    message = await gateway_state.call(conversations_store.add_message, conversation_id, role, content, sources)
+    return message.to_dict() if message else None
 
 
 @app.get("/api/conversations")
 async def get_conversations(patient_id: str = None, limit: int = 20):
     """Récupère la liste des conversations"""
-    filtered = conversations_store
-    
-    if patient_id:
-        filtered = [c for c in filtered if c["patientId"] == patient_id]
-    
     # Retourner un résumé (sans tous les messages)
-    result = []
-    for conv in filtered[:limit]:
-        last_message = conv["messages"][-1] if conv["messages"] else None
-        result.append({
-            "id": conv["id"],
-            "title": conv["title"],
-            "patientId": conv["patientId"],
-            "messageCount": len(conv["messages"]),
-            "lastMessage": last_message["content"][:100] + "..." if last_message and len(last_message["content"]) > 100 else (last_message["content"] if last_message else None),
-            "createdAt": conv["createdAt"],
-            "updatedAt": conv["updatedAt"]
-        })
-    
-    return {"conversations": result, "total": len(filtered)}
+    summaries, total = await gateway_state.call(conversations_store.recent, patient_id, limit)
+    return {"conversations": summaries, "total": total}
 
 
 @app.get("/api/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Récupère une conversation complète avec tous les messages"""
-    for conv in conversations_store:
-        if conv["id"] == conversation_id:
-            return conv
-    raise HTTPException(status_code=404, detail=ERROR_CONVERSATION_NOT_FOUND)
+    conversation = await gateway_state.call(conversations_store.get, conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail=ERROR_CONVERSATION_NOT_FOUND)
+    return conversation.to_dict()
+
+
+def conversation_title(body: dict, default: Optional[str] = None) -> Optional[str]:
+    """Titre d'une conversation lu dans le corps (400 s'il n'est pas une chaîne)"""
+    title = body.get("title", default)
+    if title is not None and not isinstance(title, str):
+        raise HTTPException(status_code=400, detail="Le titre doit être une chaîne de caractères")
+    return title
 
 
 @app.post("/api/conversations")
 async def create_conversation_endpoint(request: Request):
     """Crée une nouvelle conversation"""
     body = await request.json()
-    conversation = create_conversation(
-        title=body.get("title", "Nouvelle conversation"),
+    conversation = await create_conversation(
+        title=conversation_title(body, "Nouvelle conversation"),
         patient_id=body.get("patientId")
     )
     return conversation
@@ -753,7 +1204,7 @@ async def create_conversation_endpoint(request: Request):
 async def add_message(conversation_id: str, request: Request):
     """Ajoute un message à une conversation existante"""
     body = await request.json()
-    message = add_message_to_conversation(
+    message = await add_message_to_conversation(
         conversation_id=conversation_id,
         role=body.get("role", "user"),
         content=body.get("content", ""),
@@ -768,22 +1219,16 @@ async def add_message(conversation_id: str, request: Request):
 async def update_conversation(conversation_id: str, request: Request):
     """Met à jour le titre d'une conversation"""
     body = await request.json()
-    for conv in conversations_store:
-        if conv["id"] == conversation_id:
-            if "title" in body:
-                conv["title"] = body["title"]
-            conv["updatedAt"] = datetime.now().isoformat()
-            return conv
-    raise HTTPException(status_code=404, detail=ERROR_CONVERSATION_NOT_FOUND)
+    conversation = await gateway_state.call(conversations_store.rename, conversation_id, conversation_title(body))
+    if conversation is None:
+        raise HTTPException(status_code=404, detail=ERROR_CONVERSATION_NOT_FOUND)
+    return conversation.to_dict()
 
 
 @app.delete("/api/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str):
     """Supprime une conversation"""
-    global conversations_store
-    initial_len = len(conversations_store)
-    conversations_store = [c for c in conversations_store if c["id"] != conversation_id]
-    if len(conversations_store) < initial_len:
+    if await gateway_state.call(conversations_store.delete, conversation_id):
         return {"success": True}
     raise HTTPException(status_code=404, detail=ERROR_CONVERSATION_NOT_FOUND)
 
@@ -791,10 +1236,4 @@ async def delete_conversation(conversation_id: str):
 @app.delete("/api/conversations")
 async def clear_conversations(patient_id: str = None):
     """Supprime toutes les conversations (optionnellement filtrées par patient)"""
-    global conversations_store
-    initial_len = len(conversations_store)
-    if patient_id:
-        conversations_store = [c for c in conversations_store if c["patientId"] != patient_id]
-    else:
-        conversations_store = []
-    return {"success": True, "deletedCount": initial_len - len(conversations_store)}
+    return {"success": True, "deletedCount": await gateway_state.call(conversations_store.clear, patient_id)}
@@ -0,0 +1,208 @@
+"""
+Requêtes groupées (POST /api/batch)
+
+L'interface envoie en un seul appel les lectures d'une vue (liste de
+documents, contenus, conversations, notifications). Chaque sous-requête
+est rejouée en mémoire sur l'application ASGI de la gateway elle-même :
+elle suit exactement le chemin d'une requête isolée (routes, caches,
+disjoncteurs, limitation de débit par client) sans nouvelle connexion HTTP.
+
+Les sous-requêtes s'exécutent en parallèle, au plus max_concurrency à la
+fois ; chacune a son propre statut dans la réponse, un échec n'annule pas
+les autres.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+
+from request_id import current_request_id
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_METHODS = ("GET", "POST", "PUT", "DELETE")
+
+# En-têtes de la requête englobante transmis à chaque sous-requête
+INHERITED_HEADERS = (b"authorization", b"cookie", b"x-request-id", b"x-forwarded-for", b"accept-language")
+
+
+class BatchError(ValueError):
+    """Lot invalide (rejeté en entier avec un 400 ou un 413)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class BatchItem:
+    id: str
+    method: str
+    path: str
+    raw_path: bytes = b""
+    query: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[object] = None
+
+
+def is_batchable(path: str) -> bool:
+    """Routes exclues : le lot lui-même, flux SSE (jamais terminés), uploads multipart"""
+    return (
+        path.startswith("/api/")
+        and not path.startswith("/api/batch")
+        and not path.endswith("/stream")
+        and not path.startswith("/api/documents/upload")
+    )
+
+
+def parse_batch(payload: object, max_requests: int) -> List[BatchItem]:
+    """Valide le corps {"requests": [{"id", "method", "path", "headers", "body"}]}"""
+    requests = payload.get("requests") if isinstance(payload, dict) else None
+    if not isinstance(requests, list) or not requests:
+        raise BatchError("Le corps doit contenir une liste 'requests' non vide")
+    if len(requests) > max_requests:
+        raise BatchError(f"Au plus {max_requests} sous-requêtes par lot", status_code=413)
+
+    items = []
+    seen = set()
+    for index, raw in enumerate(requests):
+        if not isinstance(raw, dict) or not isinstance(raw.get("path"), str):
+            raise BatchError(f"Sous-requête {index} : 'path' manquant")
+        item_id = str(raw.get("id", index))
+        if item_id in seen:
+            raise BatchError(f"Identifiant de sous-requête en double : {item_id}")
+        seen.add(item_id)
+
+        method = str(raw.get("method", "GET")).upper()
+        if method not in ALLOWED_METHODS:
+            raise BatchError(f"Sous-requête {item_id} : méthode {method} non autorisée")
+        url = urlsplit(raw["path"])
+        if url.scheme or url.netloc or not is_batchable(unquote(url.path)):
+            raise BatchError(f"Sous-requête {item_id} : chemin non autorisé dans un lot ({url.path})")
+        headers = raw.get("headers") or {}
+        if not isinstance(headers, dict):
+            raise BatchError(f"Sous-requête {item_id} : 'headers' doit être un objet")
+
+        items.append(BatchItem(
+            id=item_id,
+            method=method,
+            path=unquote(url.path),
+            raw_path=url.path.encode("latin-1", errors="replace"),
+            query=url.query,
+            headers={str(k).lower(): str(v) for k, v in headers.items()},
+            body=raw.get("body")
+        ))
+    return items
+
+
+def _decode_body(body: bytes, content_type: str):
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        try:
+            return json.loads(body)
+        except ValueError:
+            pass
+    return body.decode("utf-8", errors="replace")
+
+
+class BatchRunner:
+    """Exécute les sous-requêtes d'un lot sur l'application ASGI, en parallèle borné"""
+
+    def __init__(self, app, max_concurrency: int = 6, max_requests: int = 20):
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.max_requests = max_requests
+        self.batches = 0
+        self.items = 0
+        self.failed_items = 0
+
+    async def run(self, items: List[BatchItem], parent_scope: dict) -> List[dict]:
+        """Résultats dans l'ordre des sous-requêtes : {"id", "status", "body"} (+ "etag")"""
+        self.batches += 1
+        self.items += len(items)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        inherited = [(k, v) for k, v in parent_scope.get("headers", []) if k in INHERITED_HEADERS]
+        request_id = current_request_id()
+        if request_id:
+            # Même identifiant pour tout le lot, y compris s'il a été généré par la gateway
+            inherited = [(k, v) for k, v in inherited if k != b"x-request-id"]
+            inherited.append((b"x-request-id", request_id.encode("latin-1")))
+
+        async def bounded(item: BatchItem) -> dict:
+            async with semaphore:
+                return await self._dispatch(item, parent_scope, inherited)
+
+        return list(await asyncio.gather(*(bounded(item) for item in items)))
+
+    async def _dispatch(self, item: BatchItem, parent_scope: dict, inherited: list) -> dict:
+        body = b"" if item.body is None else json.dumps(item.body).encode()
+        headers = [(k, v) for k, v in inherited if k.decode() not in item.headers]
+        headers += [(k.encode("latin-1"), v.encode("latin-1")) for k, v in item.headers.items()]
+        if body:
+            headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+        scope = {
+            "type": "http",
+            "asgi": parent_scope.get("asgi", {"version": "3.0"}),
+            "http_version": parent_scope.get("http_version", "1.1"),
+            "method": item.method,
+            "scheme": parent_scope.get("scheme", "http"),
+            "server": parent_scope.get("server"),
+            "client": parent_scope.get("client"),
+            "root_path": parent_scope.get("root_path", ""),
+            "path": item.path,
+            "raw_path": item.raw_path,
+            "query_string": item.query.encode(),
+            "headers": headers,
+        }
+
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                # Corps déjà lu : la sous-requête ne se déconnecte jamais d'elle-même
+                await asyncio.Event().wait()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        response = {"status": 500, "headers": {}, "chunks": []}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {
+                    k.decode("latin-1").lower(): v.decode("latin-1") for k, v in message.get("headers", [])
+                }
+            elif message["type"] == "http.response.body":
+                response["chunks"].append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception as e:
+            logger.error(f"[ERREUR] Sous-requete {item.method} {item.path}: {e}")
+            self.failed_items += 1
+            return {"id": item.id, "status": 500, "body": {"detail": "Erreur interne de la gateway"}}
+
+        if response["status"] >= 500:
+            self.failed_items += 1
+        result = {
+            "id": item.id,
+            "status": response["status"],
+            "body": _decode_body(b"".join(response["chunks"]), response["headers"].get("content-type", ""))
+        }
+        if "etag" in response["headers"]:
+            result["etag"] = response["headers"]["etag"]
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "failedItems": self.failed_items,
+            "maxConcurrency": self.max_concurrency,
+            "maxRequests": self.max_requests,
+        }
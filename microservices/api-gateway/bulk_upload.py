@@ -0,0 +1,225 @@
+"""
+Upload groupé de documents (POST /api/documents/upload/bulk)
+
+Le formulaire contient plusieurs parties `files` (fichiers et/ou archives
+zip). Les parties sont mises en fichiers temporaires au fil de la réception
+(au-delà de 1 Mo par partie, voir UploadFile) ; chaque document, ou chaque
+entrée d'une archive, est ensuite retransmis en flux à doc-ingestor comme
+un upload individuel, au plus `concurrency` à la fois.
+
+Le débit d'onboarding d'un corpus est ainsi limité par l'extraction côté
+doc-ingestor et non plus par les allers-retours un fichier à la fois.
+"""
+import asyncio
+import json
+import logging
+import mimetypes
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, List, Optional
+
+import httpx
+
+from uploads import UploadTooLarge
+
+logger = logging.getLogger(__name__)
+
+# Entrées d'archive ignorées (métadonnées d'OS, fichiers cachés)
+_IGNORED_PREFIXES = ("__MACOSX/", ".")
+
+
+# Schéma OpenAPI du formulaire (la route lit le formulaire elle-même)
+BULK_UPLOAD_OPENAPI_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                        "document_type": {"type": "string"},
+                        "patient_id": {"type": "string"},
+                        "manifest": {
+                            "type": "string",
+                            "description": "JSON {nom de fichier: {patient_id, document_type}}",
+                        },
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+class BulkUploadError(ValueError):
+    """Lot d'upload invalide (rejeté en entier)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class BulkEntry:
+    """Document à transmettre : nom, taille déclarée et ouverture différée du contenu"""
+    filename: str
+    size: int
+    open: Callable[[], IO[bytes]]
+    archive: Optional[str] = None
+
+
+class _LimitedReader:
+    """
+    Lecture séquentielle plafonnée d'un document
+
+    N'expose que read() : httpx transmet alors le fichier en chunked sans
+    chercher sa taille (ce qui décompresserait deux fois une entrée zip).
+    Le plafond protège des entrées d'archive dont la taille déclarée ment.
+    """
+
+    def __init__(self, raw: IO[bytes], limit: int):
+        self._raw = raw
+        self.limit = limit
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self.size += len(data)
+        if self.size > self.limit:
+            raise UploadTooLarge(f"Document supérieur à {self.limit} octets")
+        return data
+
+
+def _is_zip(filename: str, content_type: str) -> bool:
+    return filename.lower().endswith(".zip") or content_type in ("application/zip", "application/x-zip-compressed")
+
+
+def expand_archive(upload_file, filename: str) -> List[BulkEntry]:
+    """Entrées d'une archive zip (lues à la demande, sans extraction sur disque)"""
+    try:
+        archive = zipfile.ZipFile(upload_file)
+    except zipfile.BadZipFile:
+        raise BulkUploadError(f"Archive zip invalide : {filename}")
+
+    entries = []
+    for info in archive.infolist():
+        name = posixpath.basename(info.filename)
+        if info.is_dir() or not name or info.filename.startswith(_IGNORED_PREFIXES) or name.startswith("."):
+            continue
+        entries.append(BulkEntry(
+            filename=name,
+            size=info.file_size,
+            open=lambda info=info: archive.open(info),
+            archive=filename
+        ))
+    return entries
+
+
+def collect_entries(uploads: list, max_files: int) -> List[BulkEntry]:
+    """Documents du formulaire, archives zip développées"""
+    entries: List[BulkEntry] = []
+    for upload in uploads:
+        filename = posixpath.basename((upload.filename or "").replace("\\", "/")) or "document"
+        if _is_zip(filename, upload.content_type or ""):
+            entries.extend(expand_archive(upload.file, filename))
+        else:
+            upload.file.seek(0, 2)
+            size = upload.file.tell()
+            upload.file.seek(0)
+            entries.append(BulkEntry(filename=filename, size=size, open=lambda f=upload.file: f))
+        if len(entries) > max_files:
+            raise BulkUploadError(f"Au plus {max_files} documents par upload groupé", status_code=413)
+    if not entries:
+        raise BulkUploadError("Aucun document dans le formulaire (champ 'files')")
+    return entries
+
+
+def parse_manifest(raw: Optional[str]) -> Dict[str, dict]:
+    """Champs par fichier : {"<nom>": {"patient_id": ..., "document_type": ...}}"""
+    if not raw:
+        return {}
+    try:
+        manifest = json.loads(raw)
+    except ValueError:
+        raise BulkUploadError("Le champ 'manifest' doit être un objet JSON")
+    if not isinstance(manifest, dict) or not all(isinstance(v, dict) for v in manifest.values()):
+        raise BulkUploadError("Le champ 'manifest' doit associer chaque nom de fichier à un objet")
+    return manifest
+
+
+class BulkUploader:
+    """Transmet les documents d'un lot à doc-ingestor, en parallèle borné"""
+
+    def __init__(self, concurrency: int = 4, max_file_size: int = 50 * 1024 * 1024):
+        self.concurrency = concurrency
+        self.max_file_size = max_file_size
+        self.batches = 0
+        self.files = 0
+        self.failed = 0
+
+    async def run(self, client, entries: List[BulkEntry], fields: dict, manifest: Dict[str, dict]) -> List[dict]:
+        """Un résultat par document, dans l'ordre du formulaire"""
+        self.batches += 1
+        self.files += len(entries)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(entry: BulkEntry) -> dict:
+            async with semaphore:
+                result = await self._upload(client, entry, {**fields, **manifest.get(entry.filename, {})})
+            if not 200 <= result["status"] < 300:
+                self.failed += 1
+            if entry.archive:
+                result["archive"] = entry.archive
+            return result
+
+        return list(await asyncio.gather(*(bounded(entry) for entry in entries)))
+
+    async def _upload(self, client, entry: BulkEntry, fields: dict) -> dict:
+        if entry.size > self.max_file_size:
+            return {
+                "filename": entry.filename,
+                "status": 413,
+                "error": f"Document supérieur à {self.max_file_size} octets",
+            }
+
+        content_type = mimetypes.guess_type(entry.filename)[0] or "application/octet-stream"
+        data = {k: str(v) for k, v in fields.items() if v not in (None, "")}
+        stream = entry.open()
+        try:
+            response = await client.post(
+                "/api/documents/upload",
+                files={"file": (entry.filename, _LimitedReader(stream, self.max_file_size), content_type)},
+                data=data
+            )
+        except UploadTooLarge as e:
+            return {"filename": entry.filename, "status": 413, "error": str(e)}
+        except httpx.RequestError as e:
+            logger.error(f"[ERREUR] Upload groupe {entry.filename}: {e}")
+            return {"filename": entry.filename, "status": 503, "error": "Service doc-ingestor indisponible"}
+        finally:
+            if entry.archive:
+                stream.close()
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"detail": response.text[:200]}
+        if 200 <= response.status_code < 300:
+            return {
+                "filename": entry.filename,
+                "status": response.status_code,
+                "document_id": body.get("document_id"),
+                "text_length": body.get("text_length")
+            }
+        return {"filename": entry.filename, "status": response.status_code, "error": body.get("detail", body)}
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "files": self.files,
+            "failed": self.failed,
+            "concurrency": self.concurrency,
+        }
@@ -0,0 +1,125 @@
+"""
+Cache TTL + stale-while-revalidate pour les agrégations de la gateway
+
+- Entrée fraîche (âge < ttl) : servie directement.
+- Entrée périmée (ttl <= âge < ttl + stale_ttl) : servie immédiatement,
+  un seul rafraîchissement est lancé en tâche de fond.
+- Entrée absente ou trop vieille : chargée, les appels concurrents pour
+  la même clé partagent le même chargement.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+# Valeur et instant de chargement
+Entry = Tuple[Any, float]
+
+
+class Uncacheable(Exception):
+    """Levée par un loader pour renvoyer une valeur sans la mettre en cache"""
+
+    def __init__(self, value: Any):
+        super().__init__("valeur non cachable")
+        self.value = value
+
+
+class SWRCache:
+    """Cache mémoire borné avec TTL et stale-while-revalidate"""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = (value, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: Hashable, loader: Loader) -> Any:
+        try:
+            value = await loader()
+        except Uncacheable as e:
+            return e.value
+        self._store(key, value)
+        return value
+
+    def _start_load(self, key: Hashable, loader: Loader) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    def _on_refresh_done(self, future: asyncio.Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.refresh_errors += 1
+            logger.warning(f"[WARN] Cache {self.name}: rafraichissement echoue ({error})")
+
+    async def get_or_load(self, key: Hashable, loader: Loader) -> Any:
+        """Retourne la valeur en cache pour key, ou la charge via loader"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = self._clock() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._start_load(key, loader).add_done_callback(self._on_refresh_done)
+                return value
+
+        self.misses += 1
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def invalidate(self, key: Hashable = None):
+        """Supprime une entrée (ou tout le cache si key est None)"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl": self.ttl,
+            "staleTtl": self.stale_ttl,
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refreshErrors": self.refresh_errors,
+            "hitRatio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+        }
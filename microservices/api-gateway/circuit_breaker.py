@@ -0,0 +1,113 @@
+"""
+Disjoncteur (circuit breaker) par service en aval
+
+Après N échecs consécutifs, le circuit s'ouvre : les appels suivants
+échouent immédiatement, sans attendre les timeouts de connexion ou de
+lecture. Passé le délai de réarmement, quelques appels d'essai sont
+autorisés (demi-ouvert) ; un succès referme le circuit, un échec le rouvre.
+"""
+import time
+from typing import Callable
+
+import httpx
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.RequestError):
+    """
+    Levée quand le circuit d'un service est ouvert
+
+    Hérite de httpx.RequestError pour être traitée comme un service
+    indisponible par les routes existantes.
+    """
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"Circuit ouvert pour {service} (nouvel essai dans {retry_after:.1f}s)")
+        self.service = service
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Machine à états fermé / ouvert / demi-ouvert pour un service"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.total_rejections = 0
+        self.total_trips = 0
+
+    def before_request(self):
+        """Vérifie qu'un appel peut partir ; lève CircuitOpenError sinon"""
+        if self.state == STATE_OPEN:
+            elapsed = self._clock() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.total_rejections += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = STATE_HALF_OPEN
+            self.half_open_calls = 0
+
+        if self.state == STATE_HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.total_rejections += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self.half_open_calls += 1
+
+    def release(self):
+        """Libère un créneau d'essai sans verdict (requête annulée)"""
+        if self.state == STATE_HALF_OPEN and self.half_open_calls > 0:
+            self.half_open_calls -= 1
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        if self.state != STATE_CLOSED:
+            self.state = STATE_CLOSED
+            self.half_open_calls = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self):
+        self.state = STATE_OPEN
+        self.opened_at = self._clock()
+        self.half_open_calls = 0
+        self.total_trips += 1
+
+    @property
+    def current_state(self) -> str:
+        """Etat effectif : un circuit ouvert dont le délai est écoulé est demi-ouvert"""
+        if self.state == STATE_OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+            return STATE_HALF_OPEN
+        return self.state
+
+    def snapshot(self) -> dict:
+        """Etat courant du disjoncteur (pour /api/health/services)"""
+        snapshot = {
+            "state": self.current_state,
+            "consecutiveFailures": self.consecutive_failures,
+            "failureThreshold": self.failure_threshold,
+            "totalTrips": self.total_trips,
+            "totalRejections": self.total_rejections,
+        }
+        if snapshot["state"] == STATE_OPEN:
+            snapshot["retryAfter"] = round(max(self.reset_timeout - (self._clock() - self.opened_at), 0.0), 3)
+        return snapshot
@@ -18,11 +18,113 @@ class Settings:
     LLM_QA_URL: str = os.getenv("LLM_QA_MODULE_URL", os.getenv("LLM_QA_URL", "http://localhost:8004"))
     SYNTHESE_URL: str = os.getenv("SYNTHESE_SERVICE_URL", os.getenv("SYNTHESE_URL", "http://localhost:8005"))
     AUDIT_URL: str = os.getenv("AUDIT_SERVICE_URL", os.getenv("AUDIT_URL", "http://localhost:8006"))
-    
-    
-    # Rate limiting
+
+    # Pools HTTP par service (keep-alive, limites, timeouts)
+    UPSTREAM_MAX_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "50"))
+    UPSTREAM_MAX_KEEPALIVE: int = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+    UPSTREAM_KEEPALIVE_EXPIRY: float = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+    UPSTREAM_CONNECT_TIMEOUT: float = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+    UPSTREAM_READ_TIMEOUT: float = float(os.getenv("UPSTREAM_READ_TIMEOUT", "60"))
+    # Services LLM (llm-qa-module, synthese-comparative) : pool séparé et timeout long
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "10"))
+    LLM_READ_TIMEOUT: float = float(os.getenv("LLM_READ_TIMEOUT", "120"))
+    # Services joignables en HTTP/2 (noms séparés par des virgules, négocié via TLS/ALPN)
+    UPSTREAM_HTTP2: str = os.getenv("UPSTREAM_HTTP2", "")
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+
+    # Poller de santé en tâche de fond (intervalle en secondes, gigue en fraction)
+    HEALTH_POLL_INTERVAL: float = float(os.getenv("HEALTH_POLL_INTERVAL", "15"))
+    HEALTH_POLL_JITTER: float = float(os.getenv("HEALTH_POLL_JITTER", "0.2"))
+    HEALTH_HISTORY_SIZE: int = int(os.getenv("HEALTH_HISTORY_SIZE", "20"))
+
+    # Disjoncteur par service : échecs consécutifs avant ouverture, délai avant essai
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS", "1"))
+
+    # Cache des agrégations (dashboard, stats d'audit) : durée de fraîcheur puis
+    # fenêtre pendant laquelle la valeur périmée est servie pendant son rafraîchissement
+    DASHBOARD_CACHE_TTL: float = float(os.getenv("DASHBOARD_CACHE_TTL", "10"))
+    DASHBOARD_CACHE_STALE_TTL: float = float(os.getenv("DASHBOARD_CACHE_STALE_TTL", "60"))
+    AUDIT_STATS_CACHE_TTL: float = float(os.getenv("AUDIT_STATS_CACHE_TTL", "30"))
+    AUDIT_STATS_CACHE_STALE_TTL: float = float(os.getenv("AUDIT_STATS_CACHE_STALE_TTL", "120"))
+
+    # Dashboard : timeout de chaque source interrogée en parallèle (secondes) ;
+    # une source plus lente est omise de la réponse
+    DASHBOARD_DOCUMENTS_TIMEOUT: float = float(os.getenv("DASHBOARD_DOCUMENTS_TIMEOUT", "2"))
+    DASHBOARD_QA_TIMEOUT: float = float(os.getenv("DASHBOARD_QA_TIMEOUT", "2"))
+    DASHBOARD_AUDIT_TIMEOUT: float = float(os.getenv("DASHBOARD_AUDIT_TIMEOUT", "2"))
+
+    # Cache LRU des documents (validé par ETag) : budget mémoire total, taille
+    # maximale d'un corps mis en cache, délai avant revalidation auprès de doc-ingestor
+    DOCUMENT_CACHE_MAX_BYTES: int = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    DOCUMENT_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("DOCUMENT_CACHE_MAX_ENTRY_BYTES", str(4 * 1024 * 1024)))
+    DOCUMENT_CACHE_TTL: float = float(os.getenv("DOCUMENT_CACHE_TTL", "30"))
+
+    # Relance (hedging) des lectures de documents restées sans réponse au p95 de
+    # leur route ; budget partagé : relances par requête, réserve de jetons
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_MIN_DELAY_MS: float = float(os.getenv("HEDGE_MIN_DELAY_MS", "10"))
+    HEDGE_BUDGET_RATIO: float = float(os.getenv("HEDGE_BUDGET_RATIO", "0.1"))
+    HEDGE_BUDGET_BURST: float = float(os.getenv("HEDGE_BUDGET_BURST", "10"))
+
+    # Notifications conservées en mémoire (les plus anciennes sont évincées)
+    NOTIFICATIONS_MAX_ITEMS: int = int(os.getenv("NOTIFICATIONS_MAX_ITEMS", "100"))
+
+    # Flux SSE des notifications : file par abonné (déconnecté si pleine) et ping
+    NOTIFICATIONS_STREAM_QUEUE_SIZE: int = int(os.getenv("NOTIFICATIONS_STREAM_QUEUE_SIZE", "100"))
+    NOTIFICATIONS_STREAM_HEARTBEAT: float = float(os.getenv("NOTIFICATIONS_STREAM_HEARTBEAT", "15"))
+
+    # Conversations Q&A en mémoire : budget estimé, éviction LRU au-delà
+    CONVERSATIONS_MAX_BYTES: int = int(os.getenv("CONVERSATIONS_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Backend d'état des notifications et conversations : memory (un seul worker),
+    # sqlite (fichier WAL partagé) ou postgres (écritures regroupées en différé)
+    STATE_BACKEND: str = os.getenv("STATE_BACKEND", "memory")
+    STATE_SQLITE_PATH: str = os.getenv("STATE_SQLITE_PATH", "gateway-state.db")
+    STATE_POSTGRES_DSN: str = os.getenv("STATE_POSTGRES_DSN", "")
+    STATE_WRITE_BATCH_SIZE: int = int(os.getenv("STATE_WRITE_BATCH_SIZE", "100"))
+    STATE_FLUSH_INTERVAL: float = float(os.getenv("STATE_FLUSH_INTERVAL", "0.05"))
+    STATE_FLUSH_MAX_ATTEMPTS: int = int(os.getenv("STATE_FLUSH_MAX_ATTEMPTS", "3"))
+
+    # Uploads (même limite que doc-ingestor, + marge pour l'enveloppe multipart)
+    MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", str(50 * 1024 * 1024 + 64 * 1024)))
+
+    # Requêtes groupées (/api/batch) : sous-requêtes par lot et exécutées en parallèle
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "6"))
+
+    # Upload groupé (/api/documents/upload/bulk) : taille totale du formulaire,
+    # documents par lot (entrées d'archives comprises), envois parallèles vers doc-ingestor
+    BULK_UPLOAD_MAX_SIZE: int = int(os.getenv("BULK_UPLOAD_MAX_SIZE", str(500 * 1024 * 1024)))
+    BULK_UPLOAD_MAX_FILES: int = int(os.getenv("BULK_UPLOAD_MAX_FILES", "200"))
+    BULK_UPLOAD_CONCURRENCY: int = int(os.getenv("BULK_UPLOAD_CONCURRENCY", "4"))
+
+    # Budgets de latence par route (secondes) : échéance de chaque requête /api,
+    # transmise aux services en X-Deadline-Ms (un client peut la raccourcir)
+    BUDGET_DEFAULT: float = float(os.getenv("BUDGET_DEFAULT", "60"))
+    BUDGET_QA: float = float(os.getenv("BUDGET_QA", "120"))
+    BUDGET_SYNTHESIS: float = float(os.getenv("BUDGET_SYNTHESIS", "120"))
+    BUDGET_BULK_UPLOAD: float = float(os.getenv("BUDGET_BULK_UPLOAD", "600"))
+
+    # File d'admission des routes LLM (Q/R avant synthèses) : générations simultanées,
+    # requêtes en attente au plus, attente maximale par classe avant refus (503)
+    LLM_QUEUE_CONCURRENCY: int = int(os.getenv("LLM_QUEUE_CONCURRENCY", "2"))
+    LLM_QUEUE_MAX_DEPTH: int = int(os.getenv("LLM_QUEUE_MAX_DEPTH", "20"))
+    LLM_QUEUE_QA_MAX_WAIT: float = float(os.getenv("LLM_QUEUE_QA_MAX_WAIT", "30"))
+    LLM_QUEUE_SYNTHESIS_MAX_WAIT: float = float(os.getenv("LLM_QUEUE_SYNTHESIS_MAX_WAIT", "90"))
+
+    # Rate limiting (token bucket par client et par famille de routes /api/<famille>)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
     RATE_LIMIT_WINDOW: int = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+    # Routes LLM (/api/qa, /api/synthesis) : seau séparé, plus strict
+    RATE_LIMIT_LLM_REQUESTS: int = int(os.getenv("RATE_LIMIT_LLM_REQUESTS", "20"))
+    RATE_LIMIT_LLM_WINDOW: int = int(os.getenv("RATE_LIMIT_LLM_WINDOW", "60"))
+    # Identifier le client par X-Forwarded-For (uniquement derrière un proxy de confiance)
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
 
 
 settings = Settings()
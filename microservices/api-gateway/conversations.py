@@ -0,0 +1,419 @@
+"""
+Stockage des conversations Q&A de la gateway
+
+- Index par id et index secondaire par patient (dicts ordonnés par création)
+- Eviction LRU sous un budget mémoire estimé, au lieu d'un nombre fixe
+- Messages et conversations en objets à __slots__ (pas de dict par instance)
+
+SQLConversationStore offre la même interface sur une base partagée
+(voir state.py) pour les déploiements à plusieurs workers.
+"""
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+def summarize(
+    conversation_id: str,
+    title: str,
+    patient_id: Optional[str],
+    message_count: int,
+    last_message: Optional[str],
+    created_at: str,
+    updated_at: str
+) -> dict:
+    """Résumé d'une conversation pour les listes (sans les messages)"""
+    if last_message and len(last_message) > 100:
+        last_message = last_message[:100] + "..."
+    return {
+        "id": conversation_id,
+        "title": title,
+        "patientId": patient_id,
+        "messageCount": message_count,
+        "lastMessage": last_message,
+        "createdAt": created_at,
+        "updatedAt": updated_at,
+    }
+
+
+# Coût fixe estimé d'un objet (en-têtes, identifiants, horodatages)
+MESSAGE_OVERHEAD = 200
+CONVERSATION_OVERHEAD = 400
+
+
+class Message:
+    """Message d'une conversation"""
+
+    __slots__ = ("id", "role", "content", "sources", "timestamp", "size")
+
+    def __init__(self, role: str, content: str, sources: Optional[list] = None):
+        self.id = str(uuid.uuid4())
+        self.role = role  # "user" ou "assistant"
+        self.content = content
+        self.sources = sources or []
+        self.timestamp = datetime.now().isoformat()
+        self.size = (
+            MESSAGE_OVERHEAD
+            + len(content)
+            + (len(json.dumps(self.sources, default=str)) if self.sources else 0)
+        )
+
+    @classmethod
+    def restore(cls, message_id: str, role: str, content: str, sources: list, timestamp: str) -> "Message":
+        """Reconstruit un message persisté"""
+        message = cls.__new__(cls)
+        message.id = message_id
+        message.role = role
+        message.content = content
+        message.sources = sources
+        message.timestamp = timestamp
+        message.size = 0
+        return message
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "role": self.role,
+            "content": self.content,
+            "sources": self.sources,
+            "timestamp": self.timestamp,
+        }
+
+
+class Conversation:
+    """Conversation et ses messages"""
+
+    __slots__ = ("id", "title", "patient_id", "messages", "created_at", "updated_at", "size")
+
+    def __init__(self, title: str, patient_id: Optional[str] = None):
+        now = datetime.now().isoformat()
+        self.id = str(uuid.uuid4())
+        self.title = title
+        self.patient_id = patient_id
+        self.messages: List[Message] = []
+        self.created_at = now
+        self.updated_at = now
+        self.size = CONVERSATION_OVERHEAD + len(title)
+
+    @classmethod
+    def restore(
+        cls,
+        conversation_id: str,
+        title: str,
+        patient_id: Optional[str],
+        messages: List[Message],
+        created_at: str,
+        updated_at: str
+    ) -> "Conversation":
+        """Reconstruit une conversation persistée"""
+        conversation = cls.__new__(cls)
+        conversation.id = conversation_id
+        conversation.title = title
+        conversation.patient_id = patient_id
+        conversation.messages = messages
+        conversation.created_at = created_at
+        conversation.updated_at = updated_at
+        conversation.size = 0
+        return conversation
+
+    def touch(self):
+        self.updated_at = datetime.now().isoformat()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "patientId": self.patient_id,
+            "messages": [message.to_dict() for message in self.messages],
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+        }
+
+    def summary(self) -> dict:
+        """Résumé pour les listes (sans les messages)"""
+        return summarize(
+            self.id,
+            self.title,
+            self.patient_id,
+            len(self.messages),
+            self.messages[-1].content if self.messages else None,
+            self.created_at,
+            self.updated_at
+        )
+
+
+class ConversationStore:
+    """Conversations en mémoire, évincées (les moins récemment utilisées) au-delà de max_bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._by_id: Dict[str, Conversation] = {}
+        self._by_patient: Dict[Optional[str], Dict[str, Conversation]] = {}
+        self._lru: "OrderedDict[str, Conversation]" = OrderedDict()
+        self.current_bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _use(self, conversation: Conversation):
+        self._lru.move_to_end(conversation.id)
+
+    def _evict(self, keep: Conversation):
+        """Evince les moins récemment utilisées (jamais celle en cours d'utilisation)"""
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._lru.values()))
+            if oldest is keep:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _grow(self, conversation: Conversation, size: int):
+        conversation.size += size
+        self.current_bytes += size
+        self._evict(keep=conversation)
+
+    def _remove(self, conversation: Conversation):
+        del self._by_id[conversation.id]
+        del self._lru[conversation.id]
+        patient_conversations = self._by_patient[conversation.patient_id]
+        del patient_conversations[conversation.id]
+        if not patient_conversations:
+            del self._by_patient[conversation.patient_id]
+        self.current_bytes -= conversation.size
+
+    def create(self, title: str, patient_id: Optional[str] = None) -> Conversation:
+        conversation = Conversation(title, patient_id)
+        self._by_id[conversation.id] = conversation
+        self._by_patient.setdefault(patient_id, {})[conversation.id] = conversation
+        self._lru[conversation.id] = conversation
+        self.current_bytes += conversation.size
+        self._evict(keep=conversation)
+        return conversation
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        conversation = self._by_id.get(conversation_id)
+        if conversation is not None:
+            self._use(conversation)
+        return conversation
+
+    def add_message(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        sources: Optional[list] = None
+    ) -> Optional[Message]:
+        conversation = self.get(conversation_id)
+        if conversation is None:
+            return None
+        message = Message(role, content, sources)
+        conversation.messages.append(message)
+        conversation.touch()
+        self._grow(conversation, message.size)
+        return message
+
+    def rename(self, conversation_id: str, title: Optional[str]) -> Optional[Conversation]:
+        conversation = self.get(conversation_id)
+        if conversation is None:
+            return None
+        if title is not None:
+            self._grow(conversation, len(title) - len(conversation.title))
+            conversation.title = title
+        conversation.touch()
+        return conversation
+
+    def delete(self, conversation_id: str) -> bool:
+        conversation = self._by_id.get(conversation_id)
+        if conversation is None:
+            return False
+        self._remove(conversation)
+        return True
+
+    def clear(self, patient_id: Optional[str] = None) -> int:
+        if not patient_id:
+            count = len(self._by_id)
+            self._by_id.clear()
+            self._by_patient.clear()
+            self._lru.clear()
+            self.current_bytes = 0
+            return count
+        conversations = list(self._by_patient.get(patient_id, {}).values())
+        for conversation in conversations:
+            self._remove(conversation)
+        return len(conversations)
+
+    def recent(self, patient_id: Optional[str] = None, limit: int = 20) -> Tuple[List[dict], int]:
+        """Résumés des conversations les plus récemment créées d'abord, et leur nombre total"""
+        source = self._by_patient.get(patient_id, {}) if patient_id else self._by_id
+        summaries = []
+        for conversation in reversed(source.values()):
+            if len(summaries) >= limit:
+                break
+            summaries.append(conversation.summary())
+        return summaries, len(source)
+
+    def stats(self) -> dict:
+        return {
+            "conversations": len(self._by_id),
+            "patients": len(self._by_patient),
+            "bytes": self.current_bytes,
+            "maxBytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SQLConversationStore:
+    """Conversations persistées (backends sqlite / postgres), même interface que ConversationStore"""
+
+    _SUMMARY_SQL = """
+        SELECT c.id, c.title, c.patient_id,
+               (SELECT COUNT(*) FROM gateway_messages m WHERE m.conversation_id = c.id),
+               (SELECT m.content FROM gateway_messages m WHERE m.conversation_id = c.id
+                ORDER BY m.seq DESC LIMIT 1),
+               c.created_at, c.updated_at
+        FROM gateway_conversations c
+    """
+
+    def __init__(self, database):
+        self.database = database
+
+    def init_schema(self):
+        serial = self.database.serial_type
+        self.database.execute_script([
+            f"""
+            CREATE TABLE IF NOT EXISTS gateway_conversations (
+                seq {serial},
+                id VARCHAR(64) UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                patient_id VARCHAR(100),
+                created_at VARCHAR(32) NOT NULL,
+                updated_at VARCHAR(32) NOT NULL
+            )
+            """,
+            f"""
+            CREATE TABLE IF NOT EXISTS gateway_messages (
+                seq {serial},
+                id VARCHAR(64) UNIQUE NOT NULL,
+                conversation_id VARCHAR(64) NOT NULL,
+                role VARCHAR(20) NOT NULL,
+                content TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                timestamp VARCHAR(32) NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_gateway_conversations_patient "
+            "ON gateway_conversations (patient_id, seq)",
+            "CREATE INDEX IF NOT EXISTS idx_gateway_messages_conversation "
+            "ON gateway_messages (conversation_id, seq)",
+        ])
+
+    def __len__(self) -> int:
+        return self.database.query("SELECT COUNT(*) FROM gateway_conversations")[0][0]
+
+    def _exists(self, conversation_id: str) -> bool:
+        return bool(self.database.query("SELECT 1 FROM gateway_conversations WHERE id = ?", (conversation_id,)))
+
+    def _save(self, conversation: Conversation):
+        self.database.write(
+            "UPDATE gateway_conversations SET title = ?, updated_at = ? WHERE id = ?",
+            (conversation.title, conversation.updated_at, conversation.id)
+        )
+
+    def create(self, title: str, patient_id: Optional[str] = None) -> Conversation:
+        conversation = Conversation(title, patient_id)
+        self.database.write(
+            "INSERT INTO gateway_conversations (id, title, patient_id, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (conversation.id, title, patient_id, conversation.created_at, conversation.updated_at)
+        )
+        return conversation
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        rows = self.database.query(
+            "SELECT id, title, patient_id, created_at, updated_at FROM gateway_conversations WHERE id = ?",
+            (conversation_id,)
+        )
+        if not rows:
+            return None
+        message_rows = self.database.query(
+            "SELECT id, role, content, sources, timestamp FROM gateway_messages "
+            "WHERE conversation_id = ? ORDER BY seq",
+            (conversation_id,)
+        )
+        messages = [
+            Message.restore(message_id, role, content, json.loads(sources), timestamp)
+            for message_id, role, content, sources, timestamp in message_rows
+        ]
+        conversation_id, title, patient_id, created_at, updated_at = rows[0]
+        return Conversation.restore(conversation_id, title, patient_id, messages, created_at, updated_at)
+
+    def add_message(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        sources: Optional[list] = None
+    ) -> Optional[Message]:
+        if not self._exists(conversation_id):
+            return None
+        message = Message(role, content, sources)
+        self.database.write(
+            "INSERT INTO gateway_messages (id, conversation_id, role, content, sources, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (message.id, conversation_id, role, content, json.dumps(message.sources, default=str), message.timestamp)
+        )
+        self.database.write(
+            "UPDATE gateway_conversations SET updated_at = ? WHERE id = ?",
+            (message.timestamp, conversation_id)
+        )
+        return message
+
+    def rename(self, conversation_id: str, title: Optional[str]) -> Optional[Conversation]:
+        conversation = self.get(conversation_id)
+        if conversation is None:
+            return None
+        if title is not None:
+            conversation.title = title
+        conversation.touch()
+        self._save(conversation)
+        return conversation
+
+    def delete(self, conversation_id: str) -> bool:
+        if not self._exists(conversation_id):
+            return False
+        self.database.write("DELETE FROM gateway_messages WHERE conversation_id = ?", (conversation_id,))
+        self.database.write("DELETE FROM gateway_conversations WHERE id = ?", (conversation_id,))
+        return True
+
+    def clear(self, patient_id: Optional[str] = None) -> int:
+        if not patient_id:
+            count = len(self)
+            self.database.write("DELETE FROM gateway_messages")
+            self.database.write("DELETE FROM gateway_conversations")
+            return count
+        count = self.database.query(
+            "SELECT COUNT(*) FROM gateway_conversations WHERE patient_id = ?", (patient_id,)
+        )[0][0]
+        self.database.write(
+            "DELETE FROM gateway_messages WHERE conversation_id IN "
+            "(SELECT id FROM gateway_conversations WHERE patient_id = ?)",
+            (patient_id,)
+        )
+        self.database.write("DELETE FROM gateway_conversations WHERE patient_id = ?", (patient_id,))
+        return count
+
+    def recent(self, patient_id: Optional[str] = None, limit: int = 20) -> Tuple[List[dict], int]:
+        """Résumés des conversations les plus récemment créées d'abord, et leur nombre total"""
+        where, params = ("WHERE c.patient_id = ?", (patient_id,)) if patient_id else ("", ())
+        rows = self.database.query(f"{self._SUMMARY_SQL} {where} ORDER BY c.seq DESC LIMIT ?", (*params, limit))
+        total = self.database.query(f"SELECT COUNT(*) FROM gateway_conversations c {where}", params)[0][0]
+        return [summarize(*row) for row in rows], total
+
+    def stats(self) -> dict:
+        conversations, patients = self.database.query(
+            "SELECT COUNT(*), COUNT(DISTINCT patient_id) FROM gateway_conversations"
+        )[0]
+        return {"conversations": conversations, "patients": patients}
@@ -0,0 +1,65 @@
+"""
+Agrégation des statistiques du dashboard
+
+Les sources (stats de doc-ingestor, de llm-qa-module, de l'audit, état des
+services) sont interrogées en parallèle, chacune avec son propre timeout.
+Une source lente ou en erreur n'empêche pas la réponse : sa valeur est
+absente et son état (timeout, error) est signalé. Le dashboard répond donc
+au rythme de la source saine la plus lente, jamais au-delà du plus grand
+timeout.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DashboardSource:
+    """Source du dashboard : chargement asynchrone et timeout (secondes)"""
+    name: str
+    load: Callable[[], Awaitable[Any]]
+    timeout: float
+
+
+class DashboardAggregator:
+    """Interroge les sources en parallèle et compte leurs échecs"""
+
+    def __init__(self):
+        self.requests = 0
+        self.timeouts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def _fetch(self, source: DashboardSource) -> Tuple[Any, dict]:
+        start = time.perf_counter()
+        value = None
+        try:
+            value = await asyncio.wait_for(source.load(), source.timeout)
+            status = "ok"
+        except asyncio.TimeoutError:
+            status = "timeout"
+            self.timeouts[source.name] = self.timeouts.get(source.name, 0) + 1
+            logger.warning(f"[WARN] Dashboard: {source.name} sans reponse apres {source.timeout}s")
+        except Exception as e:
+            status = "error"
+            self.errors[source.name] = self.errors.get(source.name, 0) + 1
+            logger.warning(f"[WARN] Dashboard: {source.name} indisponible ({e})")
+        return value, {"status": status, "latencyMs": round((time.perf_counter() - start) * 1000, 1)}
+
+    async def run(self, sources: List[DashboardSource]) -> Tuple[Dict[str, Any], Dict[str, dict]]:
+        """Valeurs des sources qui ont répondu, et état de chaque source"""
+        self.requests += 1
+        results = await asyncio.gather(*(self._fetch(source) for source in sources))
+        values = {
+            source.name: value
+            for source, (value, report) in zip(sources, results)
+            if report["status"] == "ok"
+        }
+        reports = {source.name: report for source, (_, report) in zip(sources, results)}
+        return values, reports
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "timeouts": dict(self.timeouts), "errors": dict(self.errors)}
@@ -0,0 +1,137 @@
+"""
+Budgets de latence par route et propagation de l'échéance (X-Deadline-Ms)
+
+Chaque requête /api reçoit à son arrivée une échéance : maintenant + le
+budget de sa route (Q/R et synthèses plus longs que les lectures). Un
+client peut la raccourcir en envoyant lui-même X-Deadline-Ms, jamais
+l'allonger.
+
+Chaque appel amont (voir UpstreamClient.request) transmet le budget restant
+en X-Deadline-Ms et borne ses timeouts par ce budget : un service qui honore
+l'en-tête (llm-qa-module) abandonne un travail que plus personne n'attend,
+et un appel lancé après l'échéance échoue sans partir.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import httpx
+
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """
+    Echéance de la requête dépassée avant l'appel amont
+
+    Hérite de httpx.TimeoutException (donc de httpx.RequestError) pour être
+    traitée par les routes existantes comme un service qui n'a pas répondu.
+    """
+
+    def __init__(self, service: str):
+        super().__init__(f"Echeance depassee avant l'appel a {service}")
+        self.service = service
+
+
+@dataclass
+class RouteBudget:
+    """Budget (secondes) des routes commençant par l'un des préfixes"""
+    name: str
+    seconds: float
+    prefixes: Tuple[str, ...] = ()
+
+
+def build_route_budgets(settings) -> Tuple[List[RouteBudget], RouteBudget]:
+    """Budgets par groupe de routes (préfixe le plus long d'abord) et budget par défaut"""
+    budgets = [
+        RouteBudget("bulk-upload", settings.BUDGET_BULK_UPLOAD, ("/api/documents/upload/bulk",)),
+        RouteBudget("qa", settings.BUDGET_QA, ("/api/qa",)),
+        RouteBudget("synthesis", settings.BUDGET_SYNTHESIS, ("/api/synthesis",)),
+    ]
+    return budgets, RouteBudget("default", settings.BUDGET_DEFAULT)
+
+
+def current_deadline() -> Optional[float]:
+    """Echéance de la requête en cours (horloge time.monotonic), None hors requête /api"""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Budget restant en secondes (négatif une fois l'échéance passée)"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def without_deadline():
+    """Appels amont sans échéance (travail qui doit aboutir après la réponse, ex. audit)"""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def parse_deadline_ms(value: Optional[str]) -> Optional[float]:
+    """Budget en secondes d'un en-tête X-Deadline-Ms (None s'il est absent ou invalide)"""
+    if not value:
+        return None
+    try:
+        ms = int(value)
+    except ValueError:
+        return None
+    return ms / 1000 if ms >= 0 else None
+
+
+def clamp_timeout(timeout: httpx.Timeout, budget: float) -> httpx.Timeout:
+    """Chaque composante du timeout bornée par le budget restant"""
+    def bounded(value: Optional[float]) -> float:
+        return budget if value is None else min(value, budget)
+
+    return httpx.Timeout(
+        connect=bounded(timeout.connect),
+        read=bounded(timeout.read),
+        write=bounded(timeout.write),
+        pool=bounded(timeout.pool)
+    )
+
+
+class DeadlineMiddleware:
+    """Middleware ASGI : fixe l'échéance de chaque requête /api selon sa route"""
+
+    def __init__(self, app, budgets: List[RouteBudget], default: RouteBudget):
+        self.app = app
+        self.budgets = sorted(
+            ((prefix, budget) for budget in budgets for prefix in budget.prefixes),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self.default = default
+
+    def budget_for(self, path: str) -> RouteBudget:
+        for prefix, budget in self.budgets:
+            if path.startswith(prefix):
+                return budget
+        return self.default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            return await self.app(scope, receive, send)
+
+        seconds = self.budget_for(scope["path"]).seconds
+        for name, value in scope["headers"]:
+            if name == b"x-deadline-ms":
+                requested = parse_deadline_ms(value.decode("latin-1"))
+                if requested is not None:
+                    seconds = min(seconds, requested)
+                break
+
+        token = _deadline.set(time.monotonic() + seconds)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
@@ -0,0 +1,134 @@
+"""
+Cache LRU des corps de documents, indexé par chemin et validé par ETag
+
+Les réponses de doc-ingestor portant un ETag sont conservées en mémoire
+dans la limite d'un budget en octets. Pendant `ttl` secondes une entrée
+est servie sans appel amont ; ensuite elle est revalidée par une requête
+conditionnelle (If-None-Match) qui ne retransfère pas le corps. Un client
+qui présente l'ETag courant reçoit un 304.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from starlette.responses import Response
+
+# Données médicales : cache privé, toujours revalidé auprès de la gateway
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass
+class CachedDocument:
+    """Corps mis en cache avec son ETag"""
+    etag: str
+    content: bytes
+    media_type: Optional[str]
+    stored_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + len(self.etag)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible If-None-Match / ETag (le préfixe W/ est ignoré)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+class DocumentCache:
+    """LRU borné en octets"""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_entry_bytes: int,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified_responses = 0
+        self.evictions = 0
+
+    def accepts(self, content_length: Optional[str]) -> bool:
+        """Indique si un corps de cette taille (en-tête Content-Length) peut être mis en cache"""
+        return content_length is not None and int(content_length) <= self.max_entry_bytes
+
+    def get(self, key: str) -> Optional[CachedDocument]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if self.is_fresh(entry):
+            self.hits += 1
+        return entry
+
+    def is_fresh(self, entry: CachedDocument) -> bool:
+        return self._clock() - entry.stored_at < self.ttl
+
+    def put(self, key: str, etag: str, content: bytes, media_type: Optional[str]) -> CachedDocument:
+        entry = CachedDocument(etag=etag, content=content, media_type=media_type, stored_at=self._clock())
+        self.invalidate(key)
+        if entry.size > self.max_entry_bytes:
+            return entry
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            self.evictions += 1
+        return entry
+
+    def revalidated(self, entry: CachedDocument):
+        """L'amont a confirmé l'ETag (304) : l'entrée redevient fraîche"""
+        entry.stored_at = self._clock()
+        self.revalidations += 1
+
+    def invalidate(self, *keys: str):
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry.size
+
+    def respond(self, entry: CachedDocument, if_none_match: Optional[str]) -> Response:
+        """Réponse servie depuis le cache : 304 si le client a déjà cette version"""
+        if etag_matches(if_none_match, entry.etag):
+            self.not_modified_responses += 1
+            return not_modified(entry.etag)
+        return Response(
+            content=entry.content,
+            media_type=entry.media_type,
+            headers={"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "maxBytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "notModified": self.not_modified_responses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,133 @@
+"""
+Surveillance de la santé des microservices en tâche de fond
+
+Un poller interroge périodiquement (avec gigue) le /health de chaque
+service et conserve un instantané en mémoire avec l'historique des
+latences : les endpoints de santé et le dashboard le servent sans
+déclencher de requête vers les services.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[str, str], Awaitable[dict]]
+
+
+class HealthMonitor:
+    """Poller de santé avec instantané en mémoire"""
+
+    def __init__(
+        self,
+        services: List[Tuple[str, str]],
+        probe: Probe,
+        interval: float = 15.0,
+        jitter: float = 0.2,
+        history_size: int = 20,
+        stale_after: Optional[float] = None
+    ):
+        self.services = services
+        self.probe = probe
+        self.interval = interval
+        self.jitter = jitter
+        self.stale_after = stale_after if stale_after is not None else interval * 3
+        self._results: Dict[str, dict] = {}
+        self._history: Dict[str, deque] = {name: deque(maxlen=history_size) for name, _ in services}
+        self._checked_at: Dict[str, float] = {}
+        self._refreshing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self.total_polls = 0
+
+    def _next_delay(self) -> float:
+        spread = self.interval * self.jitter
+        return max(self.interval + random.uniform(-spread, spread), 0.0)
+
+    async def _probe_one(self, name: str, url: str) -> dict:
+        start = time.perf_counter()
+        result = await self.probe(name, url)
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        previous = self._results.get(name, {}).get("status")
+        if previous != result["status"]:
+            if result["status"] == "healthy":
+                logger.info(f"[OK] {name} est disponible")
+            else:
+                logger.warning(f"[WARN] {name} est {result['status']}")
+
+        self._history[name].append(latency_ms)
+        self._checked_at[name] = time.monotonic()
+        result["latencyMs"] = latency_ms
+        result["checkedAt"] = datetime.now(timezone.utc).isoformat()
+        self._results[name] = result
+        return result
+
+    async def _refresh_all(self):
+        await asyncio.gather(*[self._probe_one(name, url) for name, url in self.services])
+        self.total_polls += 1
+
+    async def refresh(self) -> List[dict]:
+        """Interroge tous les services maintenant (un seul rafraîchissement à la fois)"""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh_all())
+        await asyncio.shield(self._refreshing)
+        return self.snapshot()
+
+    async def _run(self, immediate: bool):
+        delay = 0.0 if immediate else self._next_delay()
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"[ERREUR] Poller de sante: {e}")
+            delay = self._next_delay()
+
+    def start(self, immediate: bool = False):
+        """
+        Démarre le poller en tâche de fond
+
+        immediate=True lance la première vérification tout de suite, sans
+        l'attendre : au démarrage, la gateway sert ses premières requêtes
+        pendant que les services sont découverts.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(immediate))
+
+    @property
+    def discovered(self) -> bool:
+        """Tous les services ont été interrogés au moins une fois"""
+        return len(self._results) == len(self.services)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> List[dict]:
+        """Dernier état connu de chaque service, avec métadonnées de fraîcheur"""
+        now = time.monotonic()
+        snapshot = []
+        for name, url in self.services:
+            result = self._results.get(name)
+            if result is None:
+                snapshot.append({"name": name, "url": url, "status": "unknown", "stale": True})
+                continue
+            age = now - self._checked_at[name]
+            history = list(self._history[name])
+            snapshot.append({
+                **result,
+                "ageSeconds": round(age, 3),
+                "stale": age > self.stale_after,
+                "latencyHistory": history,
+                "latencyAvgMs": round(sum(history) / len(history), 1) if history else None,
+            })
+        return snapshot
@@ -0,0 +1,167 @@
+"""
+Requêtes couvertes (hedging) pour les lectures idempotentes
+
+Si la première tentative n'a pas répondu au bout du p95 observé de la route,
+une seconde est envoyée et la première réponse arrivée est servie ; l'autre
+tentative est annulée (réponse fermée, connexion rendue au pool).
+
+Les relances sont plafonnées par un budget partagé entre les routes : chaque
+requête crédite `ratio` jeton, chaque relance en consomme un. Sur la durée,
+au plus `ratio` relances par requête ; un service saturé (toutes les
+requêtes lentes) ne reçoit donc jamais le double de sa charge.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from latency import LatencyWindow
+
+
+class HedgeBudget:
+    """Jetons de relance : `ratio` crédité par requête, `burst` au plus en réserve"""
+
+    def __init__(self, ratio: float = 0.1, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+        self.denied = 0
+
+    def credit(self):
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "ratio": self.ratio,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "denied": self.denied,
+        }
+
+
+class Hedger:
+    """
+    Relance d'une route après son p95
+
+    Sans assez de mesures (min_samples), aucune relance : le délai serait
+    arbitraire. Le délai est borné en bas par min_delay pour qu'une route
+    très rapide ne double pas ses requêtes au moindre écart.
+
+    Une tentative annulée (perdante, ou client parti) compte pour le temps
+    écoulé à son annulation : sa latence réelle est au moins celle-là. Sans
+    elle, seules les gagnantes seraient mesurées et le p95 sous-estimé.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget: HedgeBudget,
+        enabled: bool = True,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        min_delay: float = 0.01,
+        window: int = 500
+    ):
+        self.name = name
+        self.budget = budget
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latency = LatencyWindow(window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def delay(self) -> Optional[float]:
+        """Délai (s) avant la relance, None si la route n'est pas couverte"""
+        if not self.enabled or len(self.latency) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latency.percentile(self.percentile) / 1000)
+
+    async def _timed(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await send()
+        except asyncio.CancelledError:
+            self.latency.record((time.perf_counter() - start) * 1000)
+            raise
+        self.latency.record((time.perf_counter() - start) * 1000)
+        return response
+
+    async def run(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Exécute send() avec une relance éventuelle
+
+        send doit être rejouable sans effet de bord (GET) ; la réponse
+        retournée est celle de la tentative gagnante, les autres sont fermées.
+        """
+        self.requests += 1
+        self.budget.credit()
+        delay = self.delay()
+        if delay is None:
+            return await self._timed(send)
+
+        primary = asyncio.ensure_future(self._timed(send))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            # Appelant annulé (client parti, échéance) : libérer la connexion
+            await _discard(primary)
+            raise
+        if done:
+            return primary.result()
+        if not self.budget.try_spend():
+            self.budget_denied += 1
+            return await primary
+
+        self.hedged += 1
+        attempts = [primary, asyncio.ensure_future(self._timed(send))]
+        winner = None
+        try:
+            winner = await _first_success(attempts)
+        finally:
+            await asyncio.gather(*(_discard(task) for task in attempts if task is not winner))
+        if winner is not primary:
+            self.hedge_wins += 1
+        return winner.result()
+
+    def stats(self) -> dict:
+        delay = self.delay()
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedgeWins": self.hedge_wins,
+            "budgetDenied": self.budget_denied,
+            "delayMs": None if delay is None else round(delay * 1000, 1),
+            "latencyMs": self.latency.stats(),
+        }
+
+
+async def _first_success(attempts: list) -> asyncio.Future:
+    """Première tentative terminée sans erreur ; l'erreur de la première sinon"""
+    pending = set(attempts)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in attempts:
+            if task in done and task.exception() is None:
+                return task
+    return attempts[0]
+
+
+async def _discard(task: asyncio.Future):
+    """Annule une tentative perdante et ferme sa réponse si elle est arrivée"""
+    task.cancel()
+    (result,) = await asyncio.gather(task, return_exceptions=True)
+    if isinstance(result, httpx.Response):
+        await result.aclose()
@@ -0,0 +1,43 @@
+"""
+Fenêtre glissante de latences (percentiles des N dernières mesures)
+
+Utilisée pour le temps jusqu'au premier token des réponses Q/R streamées
+(la latence perçue par l'utilisateur, bien plus que la durée totale de
+génération) et pour le délai de relance des lectures de documents
+(hedging.py).
+"""
+from collections import deque
+from typing import Optional
+
+
+class LatencyWindow:
+    """Dernières mesures (ms) et leurs percentiles"""
+
+    def __init__(self, size: int = 1000):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, milliseconds: float):
+        self._samples.append(milliseconds)
+        self.count += 1
+
+    def __len__(self) -> int:
+        """Nombre de mesures dans la fenêtre"""
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentile par rang le plus proche (None sans mesure)"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return round(ordered[index], 1)
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "window": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
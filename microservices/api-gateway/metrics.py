@@ -0,0 +1,197 @@
+"""
+Métriques Prometheus de la gateway (GET /metrics)
+
+Deux sources :
+- mesures à chaque requête : latence par route (gabarit FastAPI, pas le
+  chemin brut, pour borner la cardinalité), latence des appels amont par
+  service, temps jusqu'au premier token des réponses Q/R streamées ;
+- jauges lues au moment du scrape à partir de l'instantané de
+  /api/gateway/stats : saturation des pools, files d'attente, caches.
+
+Les métriques vivent dans un registre propre à la gateway ; chaque worker
+uvicorn expose les siennes. Aucun serveur Prometheus n'est nécessaire :
+  curl http://localhost:8000/metrics
+"""
+import time
+from typing import Callable, Iterator
+
+from prometheus_client import CollectorRegistry, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+REGISTRY = CollectorRegistry()
+
+# De 5 ms (réponses en cache) à 2 min (génération LLM)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP servies, par route",
+    ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requêtes HTTP en cours de traitement",
+    registry=REGISTRY
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "gateway_upstream_request_duration_seconds",
+    "Durée des appels vers les microservices (jusqu'aux en-têtes de réponse)",
+    ("service", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+QA_STREAM_TTFT = Histogram(
+    "gateway_qa_stream_ttft_seconds",
+    "Temps jusqu'au premier token des réponses Q/R streamées",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+
+# Chemins jamais mesurés (le scrape lui-même)
+SKIP_PATHS = ("/metrics",)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : histogramme de latence par (méthode, route, statut)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # Gabarit de la route résolue par le routeur (ex. /api/documents/{document_id})
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status[0])).observe(
+                time.perf_counter() - start
+            )
+
+
+def _gauge(name: str, documentation: str, labels=()) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, labels=list(labels))
+
+
+def _counter(name: str, documentation: str, labels=()) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, labels=list(labels))
+
+
+class GatewayStatsCollector:
+    """Convertit l'instantané de /api/gateway/stats en métriques au moment du scrape"""
+
+    def __init__(self, snapshot: Callable[[], dict]):
+        self.snapshot = snapshot
+
+    def collect(self) -> Iterator:
+        stats = self.snapshot()
+        yield from self._upstreams(stats.get("upstreams") or {})
+        yield from self._queues(stats)
+        yield from self._caches(stats)
+        yield from self._hedging(stats["hedging"])
+
+    def _upstreams(self, upstreams: dict):
+        in_flight = _gauge("gateway_upstream_in_flight", "Appels en cours par service", ["service"])
+        max_connections = _gauge("gateway_upstream_max_connections", "Taille du pool par service", ["service"])
+        saturation = _gauge("gateway_upstream_pool_saturation", "Appels en cours / taille du pool", ["service"])
+        connections = _gauge("gateway_upstream_pool_connections", "Connexions du pool", ["service", "state"])
+        queued = _gauge("gateway_upstream_pool_queued", "Requêtes en attente d'une connexion", ["service"])
+        circuit = _gauge("gateway_circuit_open", "Disjoncteur ouvert (1) ou fermé/semi-ouvert (0)", ["service"])
+        errors = _counter("gateway_upstream_errors", "Erreurs réseau par service", ["service"])
+
+        for name, client in upstreams.items():
+            pool = client["pool"]
+            in_flight.add_metric([name], client["inFlight"])
+            max_connections.add_metric([name], client["limits"]["maxConnections"])
+            saturation.add_metric([name], client["saturation"])
+            connections.add_metric([name, "active"], pool["active"])
+            connections.add_metric([name, "idle"], pool["idle"])
+            queued.add_metric([name], pool["queued"])
+            circuit.add_metric([name], 1 if client["circuit"]["state"] == "open" else 0)
+            errors.add_metric([name], client["totalErrors"])
+        return in_flight, max_connections, saturation, connections, queued, circuit, errors
+
+    def _queues(self, stats: dict):
+        pending = _gauge("gateway_state_pending_writes", "Ecritures en attente du backend d'état")
+        pending.add_metric([], stats["state"].get("pendingWrites", 0))
+
+        stream = stats["notificationStream"]
+        subscribers = _gauge("gateway_notification_stream_subscribers", "Abonnés SSE connectés")
+        subscribers.add_metric([], stream["subscribers"])
+        dropped = _counter("gateway_notification_stream_dropped", "Abonnés SSE déconnectés car trop lents")
+        dropped.add_metric([], stream["dropped"])
+
+        inflight = _gauge("gateway_coalescing_inflight", "Appels partagés en cours", ["name"])
+        coalesced = _counter("gateway_coalesced_requests", "Requêtes servies par un appel déjà en cours", ["name"])
+        for name, flight in stats["coalescing"].items():
+            inflight.add_metric([name], flight["inflight"])
+            coalesced.add_metric([name], flight["coalesced"])
+
+        rate_limit = stats["rateLimit"]
+        buckets = _gauge("gateway_rate_limit_buckets", "Seaux de jetons actifs")
+        buckets.add_metric([], rate_limit["buckets"])
+        rejected = _counter("gateway_rate_limit_rejected", "Requêtes refusées (429) par règle", ["rule"])
+        for rule, count in rate_limit["rejected"].items():
+            rejected.add_metric([rule], count)
+
+        llm = stats["llmQueue"]
+        llm_active = _gauge("gateway_llm_queue_active", "Générations LLM en cours")
+        llm_active.add_metric([], llm["active"])
+        llm_queued = _gauge("gateway_llm_queue_waiting", "Requêtes LLM en attente, par classe", ["class"])
+        for name, cls in llm["classes"].items():
+            llm_queued.add_metric([name], cls["queued"])
+        llm_shed = _counter("gateway_llm_queue_shed", "Requêtes LLM refusées sans appel au modèle", ["reason"])
+        for reason, count in llm["shed"].items():
+            llm_shed.add_metric([reason], count)
+        return pending, subscribers, dropped, inflight, coalesced, buckets, rejected, llm_active, llm_queued, llm_shed
+
+    def _caches(self, stats: dict):
+        caches = dict(stats["caches"])
+        caches["documents"] = stats["documentCache"]
+        entries = _gauge("gateway_cache_entries", "Entrées en cache", ["cache"])
+        hits = _counter("gateway_cache_hits", "Hits de cache (y compris valeurs périmées servies)", ["cache"])
+        misses = _counter("gateway_cache_misses", "Miss de cache", ["cache"])
+        for name, cache in caches.items():
+            entries.add_metric([name], cache["entries"])
+            hits.add_metric([name], cache["hits"] + cache.get("staleHits", 0))
+            misses.add_metric([name], cache["misses"])
+        return entries, hits, misses
+
+    def _hedging(self, hedging: dict):
+        requests = _counter("gateway_hedge_eligible_requests", "Lectures pouvant être relancées", ["route"])
+        hedged = _counter("gateway_hedged_requests", "Lectures relancées après le p95", ["route"])
+        wins = _counter("gateway_hedge_wins", "Relances ayant répondu avant la première tentative", ["route"])
+        denied = _counter("gateway_hedge_budget_denied", "Relances refusées faute de budget", ["route"])
+        delay = _gauge("gateway_hedge_delay_seconds", "Délai avant relance (p95 observé)", ["route"])
+        for name, route in hedging["routes"].items():
+            requests.add_metric([name], route["requests"])
+            hedged.add_metric([name], route["hedged"])
+            wins.add_metric([name], route["hedgeWins"])
+            denied.add_metric([name], route["budgetDenied"])
+            if route["delayMs"] is not None:
+                delay.add_metric([name], route["delayMs"] / 1000)
+        tokens = _gauge("gateway_hedge_budget_tokens", "Jetons de relance disponibles")
+        tokens.add_metric([], hedging["budget"]["tokens"])
+        return requests, hedged, wins, denied, delay, tokens
+
+
+def register_stats_collector(snapshot: Callable[[], dict]):
+    REGISTRY.register(GatewayStatsCollector(snapshot))
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
@@ -0,0 +1,129 @@
+"""
+Diffusion des notifications en temps réel (Server-Sent Events)
+
+Chaque onglet ouvert s'abonne via GET /api/notifications/stream et reçoit
+les événements dans une file bornée qui lui est propre. La publication ne
+bloque jamais : un abonné dont la file est pleine (client trop lent ou
+bloqué) est déconnecté et sa file vidée ; EventSource se reconnecte seul
+et le client recharge alors la liste complète.
+
+Le hub est local au processus : avec plusieurs workers, un abonné ne
+reçoit que les événements publiés par le worker qui le sert.
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional, Set
+
+from notifications import BROADCAST
+
+logger = logging.getLogger(__name__)
+
+# Marqueur de fin placé dans la file d'un abonné déconnecté
+_CLOSED = None
+
+
+class Subscription:
+    """File d'événements d'un client connecté"""
+
+    __slots__ = ("user_id", "queue", "closed")
+
+    def __init__(self, user_id: str, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def wants(self, user_id: Optional[str]) -> bool:
+        """Evénement visible par cet abonné (même règle que NotificationStore.visible)"""
+        return user_id is None or user_id in (self.user_id, BROADCAST)
+
+
+def format_event(event: str, data: dict) -> bytes:
+    """Trame SSE : ligne event, ligne data JSON, ligne vide"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+class NotificationHub:
+    """Fan-out en mémoire vers les abonnés SSE"""
+
+    def __init__(self, queue_size: int = 100, heartbeat: float = 15.0):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._subscribers: Set[Subscription] = set()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: str = BROADCAST) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def _close(self, subscription: Subscription):
+        """Termine le flux d'un abonné (sa file est vidée puis fermée)"""
+        self._subscribers.discard(subscription)
+        subscription.closed = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(_CLOSED)
+
+    def _drop(self, subscription: Subscription):
+        """Déconnecte un abonné trop lent"""
+        self.dropped += 1
+        self._close(subscription)
+        logger.warning(f"[WARN] Abonne SSE trop lent deconnecte (user={subscription.user_id})")
+
+    def publish(self, event: str, data: dict, user_id: Optional[str] = None) -> int:
+        """
+        Publie un événement vers les abonnés concernés, sans jamais attendre
+
+        user_id : destinataire de l'événement (None = tous les abonnés).
+        Retourne le nombre d'abonnés servis.
+        """
+        self.published += 1
+        frame = format_event(event, data)
+        delivered = 0
+        for subscription in list(self._subscribers):
+            if not subscription.wants(user_id):
+                continue
+            try:
+                subscription.queue.put_nowait(frame)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        self.delivered += delivered
+        return delivered
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        """Trames SSE d'un abonné (commentaire ping si rien n'est publié)"""
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscription.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Garde la connexion ouverte à travers les proxys
+                    yield b": ping\n\n"
+                    continue
+                if frame is _CLOSED:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+    def close(self):
+        """Termine tous les flux (arrêt de la gateway)"""
+        for subscription in list(self._subscribers):
+            self._close(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "queueSize": self.queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,240 @@
+"""
+Stockage indexé des notifications de la gateway
+
+- Index par id (OrderedDict, ordre d'insertion = ordre d'éviction)
+- Une deque par destinataire, la plus récente à gauche
+- Compteurs de non-lues maintenus à chaque écriture
+
+Une notification adressée à "all" est visible par tous les utilisateurs :
+le compteur de non-lues d'un utilisateur est la somme de son compteur et
+de celui de "all", obtenue en O(1).
+
+SQLNotificationStore offre la même interface sur une base partagée
+(voir state.py) pour les déploiements à plusieurs workers.
+"""
+import heapq
+import itertools
+import json
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterator, List, Optional
+
+BROADCAST = "all"
+
+
+def _audiences(user_id: str) -> List[str]:
+    """Destinataires dont les notifications sont visibles par user_id"""
+    return [user_id] if user_id == BROADCAST else [user_id, BROADCAST]
+
+
+class NotificationStore:
+    """Notifications en mémoire, bornées à max_items (les plus anciennes sont évincées)"""
+
+    def __init__(self, max_items: int = 100):
+        self.max_items = max_items
+        self._by_id: "OrderedDict[str, dict]" = OrderedDict()
+        self._by_user: Dict[str, Deque[dict]] = {}
+        self._unread: Dict[str, int] = {}
+        self._seq: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Toutes les notifications, de la plus récente à la plus ancienne"""
+        return reversed(self._by_id.values())
+
+    def _count_unread(self, user_id: str, delta: int):
+        self._unread[user_id] = self._unread.get(user_id, 0) + delta
+
+    def _discard(self, notification: dict):
+        """Retire une notification des compteurs et des index secondaires"""
+        user_id = notification["userId"]
+        if not notification["read"]:
+            self._count_unread(user_id, -1)
+        del self._seq[notification["id"]]
+        if not self._by_user[user_id]:
+            del self._by_user[user_id]
+            self._unread.pop(user_id, None)
+
+    def add(self, notification: dict):
+        """Ajoute une notification (en tête de liste)"""
+        user_id = notification["userId"]
+        self._by_id[notification["id"]] = notification
+        self._seq[notification["id"]] = next(self._counter)
+        self._by_user.setdefault(user_id, deque()).appendleft(notification)
+        if not notification["read"]:
+            self._count_unread(user_id, 1)
+
+        while len(self._by_id) > self.max_items:
+            _, oldest = self._by_id.popitem(last=False)
+            # La plus ancienne globalement est aussi la plus ancienne de son destinataire
+            self._by_user[oldest["userId"]].pop()
+            self._discard(oldest)
+
+    def get(self, notification_id: str) -> Optional[dict]:
+        return self._by_id.get(notification_id)
+
+    def visible(self, user_id: str, unread_only: bool = False, limit: int = 50) -> List[dict]:
+        """Notifications d'un utilisateur (et diffusées à tous), les plus récentes d'abord"""
+        merged = heapq.merge(
+            *[self._by_user.get(audience, ()) for audience in _audiences(user_id)],
+            key=lambda n: -self._seq[n["id"]]
+        )
+        if unread_only:
+            merged = (n for n in merged if not n["read"])
+        return list(itertools.islice(merged, max(limit, 0)))
+
+    def total(self, user_id: str) -> int:
+        return sum(len(self._by_user.get(audience, ())) for audience in _audiences(user_id))
+
+    def unread_count(self, user_id: str) -> int:
+        return sum(self._unread.get(audience, 0) for audience in _audiences(user_id))
+
+    def mark_read(self, notification_id: str) -> Optional[dict]:
+        notification = self._by_id.get(notification_id)
+        if notification is not None and not notification["read"]:
+            notification["read"] = True
+            self._count_unread(notification["userId"], -1)
+        return notification
+
+    def mark_all_read(self, user_id: str) -> int:
+        count = 0
+        for audience in _audiences(user_id):
+            if not self._unread.get(audience):
+                continue
+            for notification in self._by_user.get(audience, ()):
+                if not notification["read"]:
+                    notification["read"] = True
+                    count += 1
+            self._unread[audience] = 0
+        return count
+
+    def delete(self, notification_id: str) -> bool:
+        notification = self._by_id.pop(notification_id, None)
+        if notification is None:
+            return False
+        self._by_user[notification["userId"]].remove(notification)
+        self._discard(notification)
+        return True
+
+    def clear(self, user_id: str) -> int:
+        count = 0
+        for audience in _audiences(user_id):
+            for notification in self._by_user.pop(audience, ()):
+                del self._by_id[notification["id"]]
+                del self._seq[notification["id"]]
+                count += 1
+            self._unread.pop(audience, None)
+        return count
+
+
+class SQLNotificationStore:
+    """Notifications persistées (backends sqlite / postgres), même interface que NotificationStore"""
+
+    def __init__(self, database, max_items: int = 100):
+        self.database = database
+        self.max_items = max_items
+
+    def init_schema(self):
+        self.database.execute_script([
+            f"""
+            CREATE TABLE IF NOT EXISTS gateway_notifications (
+                seq {self.database.serial_type},
+                id VARCHAR(64) UNIQUE NOT NULL,
+                user_id VARCHAR(255) NOT NULL,
+                is_read INTEGER NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_gateway_notifications_user "
+            "ON gateway_notifications (user_id, is_read, seq)",
+        ])
+
+    @staticmethod
+    def _load(payload: str, is_read: int) -> dict:
+        notification = json.loads(payload)
+        notification["read"] = bool(is_read)
+        return notification
+
+    @staticmethod
+    def _in(values: List[str]) -> str:
+        return "(" + ", ".join("?" for _ in values) + ")"
+
+    def __len__(self) -> int:
+        return self.database.query("SELECT COUNT(*) FROM gateway_notifications")[0][0]
+
+    def add(self, notification: dict):
+        self.database.write(
+            "INSERT INTO gateway_notifications (id, user_id, is_read, payload) VALUES (?, ?, ?, ?)",
+            (notification["id"], notification["userId"], int(notification["read"]), json.dumps(notification))
+        )
+        # Conserver au plus max_items notifications (les plus récentes)
+        self.database.write(
+            "DELETE FROM gateway_notifications "
+            "WHERE seq <= (SELECT MAX(seq) FROM gateway_notifications) - ?",
+            (self.max_items,)
+        )
+
+    def get(self, notification_id: str) -> Optional[dict]:
+        rows = self.database.query(
+            "SELECT payload, is_read FROM gateway_notifications WHERE id = ?",
+            (notification_id,)
+        )
+        return self._load(*rows[0]) if rows else None
+
+    def visible(self, user_id: str, unread_only: bool = False, limit: int = 50) -> List[dict]:
+        audiences = _audiences(user_id)
+        sql = f"SELECT payload, is_read FROM gateway_notifications WHERE user_id IN {self._in(audiences)}"
+        if unread_only:
+            sql += " AND is_read = 0"
+        sql += " ORDER BY seq DESC LIMIT ?"
+        rows = self.database.query(sql, (*audiences, max(limit, 0)))
+        return [self._load(*row) for row in rows]
+
+    def total(self, user_id: str) -> int:
+        audiences = _audiences(user_id)
+        return self.database.query(
+            f"SELECT COUNT(*) FROM gateway_notifications WHERE user_id IN {self._in(audiences)}",
+            audiences
+        )[0][0]
+
+    def unread_count(self, user_id: str) -> int:
+        audiences = _audiences(user_id)
+        return self.database.query(
+            f"SELECT COUNT(*) FROM gateway_notifications WHERE user_id IN {self._in(audiences)} AND is_read = 0",
+            audiences
+        )[0][0]
+
+    def mark_read(self, notification_id: str) -> Optional[dict]:
+        notification = self.get(notification_id)
+        if notification is not None and not notification["read"]:
+            notification["read"] = True
+            self.database.write("UPDATE gateway_notifications SET is_read = 1 WHERE id = ?", (notification_id,))
+        return notification
+
+    def mark_all_read(self, user_id: str) -> int:
+        audiences = _audiences(user_id)
+        count = self.unread_count(user_id)
+        if count:
+            self.database.write(
+                f"UPDATE gateway_notifications SET is_read = 1 WHERE user_id IN {self._in(audiences)} AND is_read = 0",
+                audiences
+            )
+        return count
+
+    def delete(self, notification_id: str) -> bool:
+        if self.get(notification_id) is None:
+            return False
+        self.database.write("DELETE FROM gateway_notifications WHERE id = ?", (notification_id,))
+        return True
+
+    def clear(self, user_id: str) -> int:
+        audiences = _audiences(user_id)
+        count = self.total(user_id)
+        if count:
+            self.database.write(
+                f"DELETE FROM gateway_notifications WHERE user_id IN {self._in(audiences)}",
+                audiences
+            )
+        return count
@@ -0,0 +1,100 @@
+"""
+Relais des réponses des microservices sans décodage JSON
+
+Le corps de la réponse amont est retransmis octet pour octet avec ses
+en-têtes utiles ; les gros corps (contenu intégral des documents, listes)
+sont relayés en flux au lieu d'être parsés puis re-sérialisés.
+"""
+from typing import Callable, Optional
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.responses import Response, StreamingResponse
+
+# En-têtes amont recopiés dans la réponse de la gateway
+PASSTHROUGH_HEADERS = (
+    "content-type",
+    "content-length",
+    "content-disposition",
+    "cache-control",
+    "etag",
+    "last-modified",
+)
+
+# En dessous de cette taille, le corps est lu d'un bloc (pas de transfert chunked)
+STREAM_THRESHOLD = 64 * 1024
+
+
+def _forwarded_headers(response: httpx.Response) -> dict:
+    headers = {
+        name: response.headers[name]
+        for name in PASSTHROUGH_HEADERS
+        if name in response.headers
+    }
+    if "content-encoding" in response.headers:
+        # Le corps est décodé par httpx : la longueur amont n'est plus valable
+        headers.pop("content-length", None)
+    return headers
+
+
+async def passthrough(response: httpx.Response) -> Response:
+    """
+    Convertit une réponse httpx ouverte en mode stream en réponse Starlette
+
+    La réponse amont doit avoir été obtenue avec stream=True ; elle est fermée
+    une fois le corps transmis.
+    """
+    headers = _forwarded_headers(response)
+    # Sans Content-Encoding, les octets bruts sont identiques au corps décodé
+    chunks = response.aiter_bytes() if "content-encoding" in response.headers else response.aiter_raw()
+
+    content_length = headers.get("content-length")
+    if content_length is not None and int(content_length) <= STREAM_THRESHOLD:
+        try:
+            body = b"".join([chunk async for chunk in chunks])
+        finally:
+            await response.aclose()
+        return Response(content=body, status_code=response.status_code, headers=headers)
+
+    return StreamingResponse(
+        chunks,
+        status_code=response.status_code,
+        headers=headers,
+        background=BackgroundTask(response.aclose)
+    )
+
+
+async def relay_event_stream(
+    response: httpx.Response,
+    marker: bytes = b"event: token",
+    on_marker: Optional[Callable[[], None]] = None,
+    background: Optional[BackgroundTask] = None,
+    on_close: Optional[Callable[[], None]] = None
+) -> StreamingResponse:
+    """
+    Relaie un flux Server-Sent Events amont fragment par fragment
+
+    Rien n'est mis en tampon : chaque fragment reçu est transmis aussitôt.
+    on_marker est appelé une fois, au premier fragment contenant marker
+    (mesure du temps jusqu'au premier token) ; on_close à la fin du flux,
+    y compris si le client se déconnecte.
+    """
+    async def chunks():
+        pending = on_marker
+        try:
+            async for chunk in response.aiter_raw():
+                if pending is not None and marker in chunk:
+                    pending()
+                    pending = None
+                yield chunk
+        finally:
+            await response.aclose()
+            if on_close is not None:
+                on_close()
+
+    headers = _forwarded_headers(response)
+    headers.pop("content-length", None)
+    headers.setdefault("cache-control", "no-cache")
+    # Désactive le tampon des proxys nginx en aval
+    headers["x-accel-buffering"] = "no"
+    return StreamingResponse(chunks(), status_code=response.status_code, headers=headers, background=background)
@@ -0,0 +1,163 @@
+"""
+Limitation de débit de la gateway (token buckets)
+
+Chaque client dispose d'un seau de jetons par groupe de routes : les
+routes LLM (/api/qa, /api/synthesis) ont leur propre seau, plus strict,
+les autres routes /api/<famille> un seau par famille. Un seau contient
+au plus `capacity` jetons et se remplit au rythme de capacity / window
+jetons par seconde. Une requête sans jeton reçoit un 429 avec Retry-After.
+
+Le middleware est un middleware ASGI pur (pas de BaseHTTPMiddleware) pour
+que son coût reste de l'ordre de quelques microsecondes par requête.
+"""
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+# Routes jamais limitées (sondes de santé, statistiques internes)
+EXEMPT_PREFIXES = ("/api/health", "/api/gateway")
+
+
+@dataclass
+class RateLimitRule:
+    """Limite d'un groupe de routes"""
+    name: str
+    capacity: float
+    window: float
+    prefixes: Tuple[str, ...] = ()
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.window
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """Seaux de jetons par (groupe de routes, client)"""
+
+    def __init__(
+        self,
+        rules: Tuple[RateLimitRule, ...],
+        default: RateLimitRule,
+        max_buckets: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rules = rules
+        self.default = default
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.allowed = 0
+        self.rejected: Dict[str, int] = {rule.name: 0 for rule in (*rules, default)}
+
+    def match(self, path: str) -> Optional[Tuple[RateLimitRule, str]]:
+        """Règle applicable à un chemin et clé du groupe (None si la route n'est pas limitée)"""
+        if not path.startswith("/api/") or path.startswith(EXEMPT_PREFIXES):
+            return None
+        for rule in self.rules:
+            if path.startswith(rule.prefixes):
+                return rule, rule.name
+        # Un seau par famille de routes : /api/documents, /api/search, ...
+        end = path.find("/", 5)
+        return self.default, path if end == -1 else path[:end]
+
+    def acquire(self, rule: RateLimitRule, group: str, client: str) -> float:
+        """Consomme un jeton ; retourne 0 si autorisé, sinon le délai avant le prochain jeton"""
+        now = self._clock()
+        key = (group, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                # Abandonner le plus ancien seau créé (dict ordonné par insertion)
+                del self._buckets[next(iter(self._buckets))]
+            bucket = self._buckets[key] = TokenBucket(rule.capacity, now)
+        else:
+            bucket.tokens = min(rule.capacity, bucket.tokens + (now - bucket.updated) * rule.refill_rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            self.allowed += 1
+            return 0.0
+        self.rejected[rule.name] += 1
+        return (1 - bucket.tokens) / rule.refill_rate
+
+    def stats(self) -> dict:
+        return {
+            "buckets": len(self._buckets),
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+            "limits": {
+                rule.name: {"requests": rule.capacity, "window": rule.window}
+                for rule in (*self.rules, self.default)
+            },
+        }
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI : 429 + Retry-After quand le seau du client est vide"""
+
+    def __init__(self, app, limiter: RateLimiter, trust_forwarded: bool = False):
+        self.app = app
+        self.limiter = limiter
+        self.trust_forwarded = trust_forwarded
+
+    def _client(self, scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.split(b",", 1)[0].strip().decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            return await self.app(scope, receive, send)
+
+        matched = self.limiter.match(scope["path"])
+        if matched is None:
+            return await self.app(scope, receive, send)
+
+        rule, group = matched
+        retry_after = self.limiter.acquire(rule, group, self._client(scope))
+        if not retry_after:
+            return await self.app(scope, receive, send)
+
+        seconds = max(math.ceil(retry_after), 1)
+        body = json.dumps({
+            "detail": f"Trop de requêtes, réessayez dans {seconds}s",
+            "limit": rule.name,
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(seconds).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def build_rate_limiter(settings) -> RateLimiter:
+    return RateLimiter(
+        rules=(
+            RateLimitRule(
+                "llm",
+                capacity=settings.RATE_LIMIT_LLM_REQUESTS,
+                window=settings.RATE_LIMIT_LLM_WINDOW,
+                prefixes=("/api/qa", "/api/synthesis")
+            ),
+        ),
+        default=RateLimitRule("default", capacity=settings.RATE_LIMIT_REQUESTS, window=settings.RATE_LIMIT_WINDOW)
+    )
@@ -0,0 +1,67 @@
+"""
+Identifiant de requête (X-Request-ID)
+
+La gateway attribue un identifiant à chaque requête entrante (ou reprend
+celui fourni par le client s'il est valide), le renvoie dans la réponse et
+le transmet à chaque appel amont (voir UpstreamClient.request). Les
+microservices rattachent leurs spans de temps à cet identifiant : une
+requête lente se retrouve ainsi dans les traces de chaque service.
+"""
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Identifiant fourni par le client : court et sans caractère de contrôle
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    """Identifiant de la requête en cours de traitement (None hors requête)"""
+    return _request_id.get()
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def accept_request_id(value: Optional[str]) -> str:
+    """Reprend l'identifiant du client s'il est valide, sinon en génère un"""
+    if value and _VALID_REQUEST_ID.match(value):
+        return value
+    return new_request_id()
+
+
+class RequestIdMiddleware:
+    """Middleware ASGI : attribue l'identifiant et l'ajoute aux en-têtes de réponse"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+        request_id = accept_request_id(incoming)
+        token = _request_id.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"x-request-id"]
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
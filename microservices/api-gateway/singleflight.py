@@ -0,0 +1,101 @@
+"""
+Regroupement des requêtes identiques en cours (single-flight)
+
+Quand plusieurs appels concurrents portent la même clé, un seul appel
+amont est lancé : les suivants attendent son résultat (ou son exception)
+au lieu de dupliquer le travail. Rien n'est conservé une fois l'appel
+terminé : ce n'est pas un cache, une question reposée plus tard repart
+vers le service.
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """Appels amont partagés par clé"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécute fn() pour key, ou attend l'exécution déjà en cours
+
+        L'appel partagé est protégé par asyncio.shield : la déconnexion du
+        client qui l'a lancé n'annule pas la réponse des autres.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._on_done(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _on_done(self, key: Hashable, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        requests = self.calls + self.coalesced
+        return {
+            "inflight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "coalescedRatio": round(self.coalesced / requests, 3) if requests else None,
+        }
+
+
+def normalize_question(question: Optional[str]) -> str:
+    """Casse et espaces ignorés : "Quel  traitement ?" == "quel traitement ?" """
+    return " ".join((question or "").split()).casefold()
+
+
+def question_key(body: dict) -> tuple:
+    """Clé de regroupement d'une requête /api/qa/ask"""
+    return (
+        normalize_question(body.get("question")),
+        body.get("patient_id"),
+        body.get("document_type"),
+        # Ne change pas le sens de la question mais bien la réponse
+        body.get("max_context_docs"),
+    )
+
+
+def coalesced_query_audit(body: dict, content: bytes, processing_time_ms: int) -> dict:
+    """
+    Entrée d'audit QUERY d'une requête servie par l'appel d'une autre
+
+    llm-qa n'audite que l'appel amont : chaque requête regroupée doit avoir
+    sa propre entrée (traçabilité par utilisateur, décompte des questions).
+    Mêmes champs que l'audit de llm-qa (AuditClient.log_query).
+    """
+    try:
+        answer = json.loads(content)
+    except ValueError:
+        answer = {}
+    if not isinstance(answer, dict):
+        answer = {}
+    return {
+        "user_id": body.get("user_id") or "anonymous",
+        "action": "QUERY",
+        "resource_type": "QA",
+        "query_text": body.get("question"),
+        "response_summary": (answer.get("answer") or "")[:500],
+        "documents_accessed": [
+            source.get("document_id") for source in answer.get("sources") or [] if isinstance(source, dict)
+        ],
+        "processing_time_ms": processing_time_ms,
+        "timestamp": datetime.now().isoformat(),
+        "service": "APIGateway",
+    }
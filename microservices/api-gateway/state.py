@@ -0,0 +1,345 @@
+"""
+Backends d'état de la gateway (notifications, conversations)
+
+- memory   : stores en mémoire du processus (un seul worker uvicorn)
+- sqlite   : fichier SQLite en mode WAL, partagé par les workers d'une même machine
+- postgres : base PostgreSQL partagée, écritures regroupées (write-behind)
+
+Avec sqlite ou postgres, l'état survit aux redémarrages et la gateway peut
+tourner avec plusieurs workers (WEB_CONCURRENCY).
+"""
+import abc
+import asyncio
+import functools
+import logging
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from notifications import NotificationStore, SQLNotificationStore
+from conversations import ConversationStore, SQLConversationStore
+
+logger = logging.getLogger(__name__)
+
+STATE_BACKENDS = ("memory", "sqlite", "postgres")
+
+
+class SQLDatabase(abc.ABC):
+    """
+    Connexion DB-API paresseuse avec tampon d'écritures
+
+    Avec batch_size > 1, les écritures sont mises en file et exécutées dans
+    une seule transaction quand la file est pleine, toutes les
+    flush_interval secondes (tâche de fond), ou avant toute lecture (un
+    worker relit toujours ses propres écritures).
+
+    Les drivers (sqlite3, psycopg2) sont bloquants : la gateway passe par
+    run() / submit(), qui exécutent les appels sur un thread dédié (un seul,
+    donc dans l'ordre de soumission) au lieu de la boucle d'événements.
+
+    Un lot en échec est retenté au plus max_flush_attempts fois puis
+    abandonné (journalisé) : une ligne invalide ne bloque pas les écritures
+    et lectures suivantes. Sans tampon (batch_size = 1), l'écriture en échec
+    est abandonnée tout de suite, l'appelant reçoit l'erreur.
+    """
+
+    placeholder = "?"
+    serial_type = "INTEGER PRIMARY KEY AUTOINCREMENT"
+    # Erreurs après lesquelles la connexion est rouverte
+    connection_errors: Tuple[type, ...] = ()
+
+    def __init__(self, batch_size: int = 1, flush_interval: float = 0.05, max_flush_attempts: int = 3):
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.max_flush_attempts = max(max_flush_attempts, 1)
+        self._connection = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[str, Sequence[Any]]] = []
+        self._failed_flushes = 0
+        self._task: Optional[asyncio.Task] = None
+        self.total_flushes = 0
+        self.total_writes = 0
+        self.dropped_writes = 0
+        self.reconnects = 0
+
+    @abc.abstractmethod
+    def _connect(self):
+        """Ouvre une connexion DB-API"""
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gateway-state")
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Exécute un appel bloquant (store ou base) sur le thread de la base"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Comme run(), sans attendre le résultat (les erreurs sont journalisées)"""
+        future = self.executor.submit(func, *args, **kwargs)
+        future.add_done_callback(_log_failure)
+        return future
+
+    def _sql(self, sql: str) -> str:
+        return sql if self.placeholder == "?" else sql.replace("?", self.placeholder)
+
+    def _recover(self, error: Exception):
+        """Annule la transaction en cours ; rouvre la connexion si elle est perdue"""
+        try:
+            if self._connection is not None:
+                self._connection.rollback()
+        except Exception:
+            pass
+        if isinstance(error, self.connection_errors):
+            logger.warning(f"[WARN] Connexion a la base d'etat perdue, reconnexion: {error}")
+            self.close()
+            self.reconnects += 1
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        try:
+            self.flush()
+        except Exception as e:
+            # Les écritures en échec ne doivent pas empêcher la lecture
+            logger.error(f"[ERREUR] Ecriture de l'etat avant lecture: {e}")
+        try:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(self._sql(sql), params)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            # Ne pas garder de transaction ouverte entre deux requêtes
+            self.connection.commit()
+        except Exception as e:
+            self._recover(e)
+            raise
+        return rows
+
+    def write(self, sql: str, params: Sequence[Any] = ()):
+        self._pending.append((sql, params))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Exécute les écritures en attente dans une seule transaction"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            cursor = self.connection.cursor()
+            try:
+                for sql, params in batch:
+                    cursor.execute(self._sql(sql), params)
+                self.connection.commit()
+            finally:
+                cursor.close()
+        except Exception as e:
+            self._recover(e)
+            self._failed_flushes += 1
+            if self.batch_size == 1 or self._failed_flushes >= self.max_flush_attempts:
+                self._failed_flushes = 0
+                self.dropped_writes += len(batch)
+                logger.error(f"[ERREUR] Ecritures de l'etat abandonnees ({len(batch)}): {batch}")
+            else:
+                # Conserver les écritures pour le prochain essai
+                self._pending[:0] = batch
+            raise
+        self._failed_flushes = 0
+        self.total_flushes += 1
+        self.total_writes += len(batch)
+
+    def execute_script(self, statements: Sequence[str]):
+        cursor = self.connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+            self.connection.commit()
+        finally:
+            cursor.close()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.run(self.flush)
+            except Exception as e:
+                logger.error(f"[ERREUR] Ecriture differee de l'etat: {e}")
+
+    def start(self):
+        """Démarre le vidage périodique du tampon (write-behind uniquement)"""
+        if self.batch_size > 1 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Arrête la tâche de fond, vide le tampon et ferme la connexion"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.run(self.flush)
+        except Exception as e:
+            logger.error(f"[ERREUR] Ecriture de l'etat a l'arret: {e}")
+        await self.run(self.close)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def stats(self) -> dict:
+        return {
+            "pendingWrites": len(self._pending),
+            "totalWrites": self.total_writes,
+            "totalFlushes": self.total_flushes,
+            "droppedWrites": self.dropped_writes,
+            "reconnects": self.reconnects,
+        }
+
+
+def _log_failure(future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"[ERREUR] Operation sur l'etat de la gateway: {future.exception()}")
+
+
+class SQLiteDatabase(SQLDatabase):
+    """Fichier SQLite en mode WAL (lecteurs et écrivain concurrents entre processus)"""
+
+    connection_errors = (sqlite3.OperationalError, sqlite3.InterfaceError)
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+
+    def _connect(self):
+        # Connexion ouverte et utilisée par le thread de la base (run / submit),
+        # ou par l'appelant quand les stores sont utilisés directement
+        connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+class PostgresDatabase(SQLDatabase):
+    """Base PostgreSQL partagée (psycopg2)"""
+
+    placeholder = "%s"
+    serial_type = "BIGSERIAL PRIMARY KEY"
+
+    def __init__(self, dsn: str, **kwargs):
+        super().__init__(**kwargs)
+        self.dsn = dsn
+
+    @property
+    def connection_errors(self):
+        import psycopg2
+        return (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+    def _connect(self):
+        import psycopg2
+        return psycopg2.connect(self.dsn)
+
+
+class GatewayState:
+    """Stores de la gateway et base éventuelle qui les porte"""
+
+    def __init__(self, backend: str, notifications, conversations, database: Optional[SQLDatabase] = None):
+        self.backend = backend
+        self.notifications = notifications
+        self.conversations = conversations
+        self.database = database
+        self._conversation_stats = {"conversations": 0, "patients": 0}
+
+    async def call(self, func: Callable, *args, **kwargs):
+        """Appel d'un store : direct en mémoire, sur le thread de la base sinon"""
+        if self.database is None:
+            return func(*args, **kwargs)
+        return await self.database.run(func, *args, **kwargs)
+
+    def submit(self, func: Callable, *args, **kwargs):
+        """Appel d'un store sans attendre ; une erreur est journalisée, jamais levée"""
+        if self.database is not None:
+            self.database.submit(func, *args, **kwargs)
+            return
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"[ERREUR] Operation sur l'etat de la gateway: {e}")
+
+    def _refresh_conversation_stats(self):
+        self._conversation_stats = self.conversations.stats()
+
+    def conversation_stats(self) -> dict:
+        """
+        Compteurs des conversations sans requête sur la boucle d'événements :
+        en SQL, valeur du relevé précédent (le relevé suivant est lancé)
+        """
+        if self.database is None:
+            return self.conversations.stats()
+        self.database.submit(self._refresh_conversation_stats)
+        return self._conversation_stats
+
+    async def start(self):
+        """Crée le schéma sur le thread de la base, puis lance les écritures différées"""
+        if self.database is not None:
+            await self.database.run(self.notifications.init_schema)
+            await self.database.run(self.conversations.init_schema)
+            self.database.start()
+            logger.info(f"[OK] Etat de la gateway: backend {self.backend}")
+
+    async def aclose(self):
+        if self.database is not None:
+            await self.database.stop()
+
+    def stats(self) -> dict:
+        stats = {"backend": self.backend}
+        if self.database is not None:
+            stats.update(self.database.stats())
+        return stats
+
+
+def build_state(settings) -> GatewayState:
+    """Construit les stores selon STATE_BACKEND"""
+    backend = settings.STATE_BACKEND
+    if backend not in STATE_BACKENDS:
+        raise ValueError(f"STATE_BACKEND inconnu: {backend} (attendu: {', '.join(STATE_BACKENDS)})")
+
+    if backend == "memory":
+        return GatewayState(
+            backend,
+            NotificationStore(max_items=settings.NOTIFICATIONS_MAX_ITEMS),
+            ConversationStore(max_bytes=settings.CONVERSATIONS_MAX_BYTES)
+        )
+
+    if backend == "sqlite":
+        database = SQLiteDatabase(settings.STATE_SQLITE_PATH)
+    else:
+        database = PostgresDatabase(
+            settings.STATE_POSTGRES_DSN,
+            batch_size=settings.STATE_WRITE_BATCH_SIZE,
+            flush_interval=settings.STATE_FLUSH_INTERVAL,
+            max_flush_attempts=settings.STATE_FLUSH_MAX_ATTEMPTS
+        )
+    return GatewayState(
+        backend,
+        SQLNotificationStore(database, max_items=settings.NOTIFICATIONS_MAX_ITEMS),
+        SQLConversationStore(database),
+        database
+    )
@@ -0,0 +1,70 @@
+"""
+Relais en flux des uploads multipart vers doc-ingestor
+
+Le corps multipart reçu par la gateway est retransmis tel quel, chunk par
+chunk : la mémoire consommée par un upload ne dépend plus de la taille du
+fichier.
+"""
+import re
+from typing import AsyncIterator, Optional
+
+# Taille max de l'en-tête multipart conservée pour retrouver le nom du fichier
+HEAD_SNIFF_LIMIT = 8 * 1024
+
+_FILENAME_RE = re.compile(rb'filename="([^"]*)"')
+
+# Schéma OpenAPI du formulaire (la route lit le flux brut, FastAPI ne peut pas l'inférer)
+UPLOAD_OPENAPI_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "patient_id": {"type": "string"},
+                        "document_type": {"type": "string"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+class UploadTooLarge(Exception):
+    """Le corps de l'upload dépasse la taille maximale autorisée"""
+
+
+class MultipartRelay:
+    """
+    Itérateur asynchrone relayant un corps multipart sans le bufferiser
+
+    Compte les octets transmis (coupure au-delà de max_size) et extrait au
+    passage le nom du fichier depuis les premiers octets du flux.
+    """
+
+    def __init__(self, stream: AsyncIterator[bytes], max_size: int):
+        self._stream = stream
+        self.max_size = max_size
+        self.size = 0
+        self.filename: Optional[str] = None
+        self._head = b""
+
+    def _sniff_filename(self, chunk: bytes):
+        self._head += chunk[:HEAD_SNIFF_LIMIT - len(self._head)]
+        match = _FILENAME_RE.search(self._head)
+        if match:
+            self.filename = match.group(1).decode("utf-8", errors="replace")
+            self._head = b""
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self.size += len(chunk)
+            if self.size > self.max_size:
+                raise UploadTooLarge(f"Upload supérieur à {self.max_size} octets")
+            if self.filename is None and len(self._head) < HEAD_SNIFF_LIMIT:
+                self._sniff_filename(chunk)
+            yield chunk
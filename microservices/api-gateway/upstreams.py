@@ -0,0 +1,266 @@
+"""
+Registre des clients HTTP vers les microservices en aval
+
+Chaque service dispose de son propre pool de connexions keep-alive, de ses
+limites et de ses timeouts : un appel LLM lent ne peut plus épuiser le pool
+utilisé par les lectures de documents.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from circuit_breaker import CircuitBreaker
+from deadline import DEADLINE_HEADER, DeadlineExceeded, clamp_timeout, remaining
+from metrics import UPSTREAM_REQUEST_DURATION
+from request_id import REQUEST_ID_HEADER, current_request_id
+
+logger = logging.getLogger(__name__)
+
+# Services dont les appels passent par le LLM (timeouts longs, pool dédié)
+LLM_SERVICES = ("llm-qa-module", "synthese-comparative")
+
+# Statuts amont comptés comme des échecs par le disjoncteur
+BREAKER_FAILURE_STATUSES = frozenset({502, 503, 504})
+
+
+@dataclass
+class UpstreamConfig:
+    """Configuration du pool HTTP d'un service en aval"""
+    name: str
+    base_url: str
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    http2: bool = False
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    breaker_half_open_max_calls: int = 1
+
+
+def _http2_available() -> bool:
+    """HTTP/2 nécessite le paquet optionnel h2 (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def build_upstream_configs(settings) -> List[UpstreamConfig]:
+    """Construit la configuration des pools à partir des Settings de la gateway"""
+    services = [
+        ("doc-ingestor", settings.DOC_INGESTOR_URL),
+        ("deid-service", settings.DEID_SERVICE_URL),
+        ("indexeur-semantique", settings.INDEXEUR_URL),
+        ("llm-qa-module", settings.LLM_QA_URL),
+        ("synthese-comparative", settings.SYNTHESE_URL),
+        ("audit-logger", settings.AUDIT_URL),
+    ]
+    http2_services = {s.strip() for s in settings.UPSTREAM_HTTP2.split(",") if s.strip()}
+
+    configs = []
+    for name, url in services:
+        is_llm = name in LLM_SERVICES
+        configs.append(UpstreamConfig(
+            name=name,
+            base_url=url,
+            max_connections=settings.LLM_MAX_CONNECTIONS if is_llm else settings.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=min(
+                settings.UPSTREAM_MAX_KEEPALIVE,
+                settings.LLM_MAX_CONNECTIONS if is_llm else settings.UPSTREAM_MAX_CONNECTIONS
+            ),
+            keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+            connect_timeout=settings.UPSTREAM_CONNECT_TIMEOUT,
+            read_timeout=settings.LLM_READ_TIMEOUT if is_llm else settings.UPSTREAM_READ_TIMEOUT,
+            http2=name in http2_services,
+            breaker_failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            breaker_reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+            breaker_half_open_max_calls=settings.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        ))
+    return configs
+
+
+class UpstreamClient:
+    """Client HTTP d'un service en aval, avec son propre pool de connexions"""
+
+    def __init__(self, config: UpstreamConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config
+        self.name = config.name
+        self.base_url = config.base_url.rstrip("/")
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.total_errors = 0
+        self.breaker = CircuitBreaker(
+            config.name,
+            failure_threshold=config.breaker_failure_threshold,
+            reset_timeout=config.breaker_reset_timeout,
+            half_open_max_calls=config.breaker_half_open_max_calls
+        )
+
+        http2 = config.http2 and _http2_available()
+        if config.http2 and not http2:
+            logger.warning(f"[WARN] HTTP/2 demande pour {self.name} mais le paquet h2 est absent")
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            http2=http2,
+            follow_redirects=True,
+            transport=transport
+        )
+        self.http2 = http2
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        stream: bool = False,
+        bypass_breaker: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Envoie une requête vers le service (chemin relatif à base_url)
+
+        Avec stream=True, seule l'en-tête de la réponse est lue : l'appelant
+        consomme le corps puis ferme la réponse (voir proxy.passthrough).
+        Si le disjoncteur du service est ouvert, CircuitOpenError est levée
+        immédiatement (bypass_breaker=True l'ignore, pour les health checks).
+        L'identifiant de la requête entrante est transmis en X-Request-ID ;
+        son budget restant en X-Deadline-Ms, qui borne aussi les timeouts.
+        """
+        budget = remaining()
+        if budget is not None and budget <= 0:
+            raise DeadlineExceeded(self.name)
+        if not bypass_breaker:
+            self.breaker.before_request()
+        # Timeout raccourci par l'échéance : son expiration ne dit rien de la santé du service
+        clamped = False
+
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            if budget is not None:
+                timeout = kwargs.get("timeout")
+                timeout = self._client.timeout if timeout is None else httpx.Timeout(timeout)
+                clamped = timeout.read is None or budget < timeout.read
+                kwargs["timeout"] = clamp_timeout(timeout, budget)
+            request = self._client.build_request(method, path, **kwargs)
+            request_id = current_request_id()
+            if request_id and REQUEST_ID_HEADER not in request.headers:
+                request.headers[REQUEST_ID_HEADER] = request_id
+            if budget is not None:
+                request.headers[DEADLINE_HEADER] = str(int(budget * 1000))
+            response = await self._client.send(request, stream=stream)
+        except httpx.RequestError as e:
+            UPSTREAM_REQUEST_DURATION.labels(self.name, "error").observe(time.perf_counter() - start)
+            self.total_errors += 1
+            if not bypass_breaker:
+                if clamped and isinstance(e, httpx.TimeoutException):
+                    self.breaker.release()
+                else:
+                    self.breaker.record_failure()
+            raise
+        except BaseException:
+            if not bypass_breaker:
+                self.breaker.release()
+            raise
+        finally:
+            self.in_flight -= 1
+
+        UPSTREAM_REQUEST_DURATION.labels(self.name, str(response.status_code)).observe(time.perf_counter() - start)
+        if not bypass_breaker:
+            if response.status_code in BREAKER_FAILURE_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        return response
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, **kwargs)
+
+    def pool_stats(self) -> dict:
+        """Etat du pool de connexions (lecture best-effort du transport httpcore)"""
+        pool = getattr(self._client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", None) or [])
+        requests = list(getattr(pool, "_requests", None) or [])
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "queued": sum(1 for r in requests if r.is_queued()),
+        }
+
+    def stats(self) -> dict:
+        """Statistiques d'utilisation du client"""
+        return {
+            "name": self.name,
+            "url": self.base_url,
+            "http2": self.http2,
+            "limits": {
+                "maxConnections": self.config.max_connections,
+                "maxKeepalive": self.config.max_keepalive_connections,
+                "keepaliveExpiry": self.config.keepalive_expiry,
+            },
+            "timeouts": {
+                "connect": self.config.connect_timeout,
+                "read": self.config.read_timeout,
+            },
+            "pool": self.pool_stats(),
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "saturation": round(self.in_flight / self.config.max_connections, 3),
+            "totalRequests": self.total_requests,
+            "totalErrors": self.total_errors,
+            "circuit": self.breaker.snapshot(),
+        }
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+class UpstreamRegistry:
+    """Ensemble des clients HTTP, indexés par nom de service"""
+
+    def __init__(self, configs: List[UpstreamConfig]):
+        self._clients: Dict[str, UpstreamClient] = {
+            config.name: UpstreamClient(config) for config in configs
+        }
+
+    def __getitem__(self, name: str) -> UpstreamClient:
+        return self._clients[name]
+
+    def __iter__(self) -> Iterator[UpstreamClient]:
+        return iter(self._clients.values())
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def stats(self) -> Dict[str, dict]:
+        return {client.name: client.stats() for client in self}
+
+    async def aclose(self):
+        for client in self:
+            await client.aclose()
@@ -1,6 +1,7 @@
 package com.docqa.audit.controller;
 
 import com.docqa.audit.dto.AuditLogDTO;
+import com.docqa.audit.dto.AuditLogPageDTO;
 import com.docqa.audit.dto.AuditStatsDTO;
 import com.docqa.audit.model.AuditLog;
 import com.docqa.audit.service.AuditService;
@@ -61,6 +62,24 @@ public class AuditController {
         return ResponseEntity.ok(auditService.getLogs(actualPage, actualSize));
     }
 
+    @GetMapping(value = "/logs", params = "cursor")
+    @Operation(summary = "Lister les logs par curseur",
+            description = "Pagination par curseur opaque (vide pour la premiere page, puis nextCursor)")
+    public ResponseEntity<AuditLogPageDTO> getLogsByCursor(
+            @RequestParam String cursor,
+            @RequestParam(defaultValue = "20") int size,
+            @RequestParam(required = false) Integer limit) {
+        int actualSize = limit != null ? limit : size;
+        if (actualSize < 1) {
+            return ResponseEntity.badRequest().build();
+        }
+        try {
+            return ResponseEntity.ok(auditService.getLogsAfter(cursor, actualSize));
+        } catch (IllegalArgumentException e) {
+            return ResponseEntity.badRequest().build();
+        }
+    }
+
     @GetMapping("/logs/{id}")
     @Operation(summary = "Obtenir un log", description = "Recupere un log d'audit par son ID")
     public ResponseEntity<?> getLog(@PathVariable Long id) {
@@ -0,0 +1,49 @@
+package com.docqa.audit.dto;
+
+import com.docqa.audit.model.AuditLog;
+
+import java.util.List;
+
+/**
+ * DTO d'une page de logs d'audit paginée par curseur
+ */
+public class AuditLogPageDTO {
+
+    private List<AuditLog> content;
+    private int size;
+    private String nextCursor;
+
+    public AuditLogPageDTO() {
+    }
+
+    public AuditLogPageDTO(List<AuditLog> content, String nextCursor) {
+        this.content = content;
+        this.size = content.size();
+        this.nextCursor = nextCursor;
+    }
+
+    // Getters et Setters
+    public List<AuditLog> getContent() {
+        return content;
+    }
+
+    public void setContent(List<AuditLog> content) {
+        this.content = content;
+    }
+
+    public int getSize() {
+        return size;
+    }
+
+    public void setSize(int size) {
+        this.size = size;
+    }
+
+    public String getNextCursor() {
+        return nextCursor;
+    }
+
+    public void setNextCursor(String nextCursor) {
+        this.nextCursor = nextCursor;
+    }
+}
@@ -9,6 +9,7 @@ import jakarta.persistence.Entity;
 import jakarta.persistence.GeneratedValue;
 import jakarta.persistence.GenerationType;
 import jakarta.persistence.Id;
+import jakarta.persistence.Index;
 import jakarta.persistence.PrePersist;
 import jakarta.persistence.Table;
 
@@ -16,7 +17,10 @@ import jakarta.persistence.Table;
  * Entité représentant un log d'audit
  */
 @Entity
-@Table(name = "audit_logs")
+@Table(name = "audit_logs", indexes = {
+    // Pagination par curseur : parcours de l'index dans l'ordre (createdAt, id)
+    @Index(name = "idx_audit_created_at_id", columnList = "created_at, id")
+})
 public class AuditLog {
 
     @Id
@@ -38,6 +38,20 @@ public interface AuditLogRepository extends JpaRepository<AuditLog, Long> {
     @Query("SELECT a FROM AuditLog a WHERE a.createdAt BETWEEN :start AND :end ORDER BY a.createdAt DESC")
     List<AuditLog> findByDateRange(@Param("start") LocalDateTime start, @Param("end") LocalDateTime end);
 
+    /**
+     * Première page, du plus récent au plus ancien (ordre total sur createdAt, id)
+     */
+    @Query("SELECT a FROM AuditLog a ORDER BY a.createdAt DESC, a.id DESC")
+    List<AuditLog> findLatest(Pageable pageable);
+
+    /**
+     * Page suivant la position (createdAt, id) : lecture d'index, sans OFFSET
+     */
+    @Query("SELECT a FROM AuditLog a WHERE a.createdAt <= :createdAt "
+            + "AND (a.createdAt < :createdAt OR a.id < :id) "
+            + "ORDER BY a.createdAt DESC, a.id DESC")
+    List<AuditLog> findBefore(@Param("createdAt") LocalDateTime createdAt, @Param("id") Long id, Pageable pageable);
+
     /**
      * Compte les logs par action
      */
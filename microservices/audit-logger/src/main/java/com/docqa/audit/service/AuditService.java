@@ -1,6 +1,7 @@
 package com.docqa.audit.service;
 
 import com.docqa.audit.dto.AuditLogDTO;
+import com.docqa.audit.dto.AuditLogPageDTO;
 import com.docqa.audit.dto.AuditStatsDTO;
 import com.docqa.audit.model.AuditLog;
 import com.docqa.audit.repository.AuditLogRepository;
@@ -14,7 +15,10 @@ import org.springframework.data.domain.PageRequest;
 import org.springframework.data.domain.Sort;
 import org.springframework.stereotype.Service;
 
+import java.nio.charset.StandardCharsets;
 import java.time.LocalDateTime;
+import java.time.format.DateTimeParseException;
+import java.util.Base64;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
@@ -79,6 +83,51 @@ public class AuditService {
         return auditLogRepository.findAll(pageRequest);
     }
 
+    /**
+     * Récupère une page de logs à partir d'un curseur opaque (vide : première page)
+     *
+     * Le curseur encode la position (createdAt, id) du dernier log servi : le
+     * coût d'une page ne dépend pas de sa profondeur, contrairement à OFFSET.
+     */
+    public AuditLogPageDTO getLogsAfter(String cursor, int size) {
+        // Un log de plus que demandé : indique s'il reste une page
+        PageRequest limit = PageRequest.of(0, size + 1);
+        List<AuditLog> logs;
+        if (cursor == null || cursor.isEmpty()) {
+            logs = auditLogRepository.findLatest(limit);
+        } else {
+            Object[] position = decodeCursor(cursor);
+            logs = auditLogRepository.findBefore((LocalDateTime) position[0], (Long) position[1], limit);
+        }
+
+        String nextCursor = null;
+        if (logs.size() > size) {
+            logs = logs.subList(0, size);
+            AuditLog last = logs.get(size - 1);
+            nextCursor = encodeCursor(last.getCreatedAt(), last.getId());
+        }
+        return new AuditLogPageDTO(logs, nextCursor);
+    }
+
+    static String encodeCursor(LocalDateTime createdAt, Long id) {
+        String position = createdAt + "|" + id;
+        return Base64.getUrlEncoder().withoutPadding().encodeToString(position.getBytes(StandardCharsets.UTF_8));
+    }
+
+    static Object[] decodeCursor(String cursor) {
+        try {
+            String position = new String(Base64.getUrlDecoder().decode(cursor), StandardCharsets.UTF_8);
+            String[] parts = position.split("\\|", 2);
+            if (parts.length != 2) {
+                throw new IllegalArgumentException("Curseur invalide");
+            }
+            return new Object[]{LocalDateTime.parse(parts[0]), Long.valueOf(parts[1])};
+        } catch (DateTimeParseException | IllegalArgumentException e) {
+            // NumberFormatException est une IllegalArgumentException
+            throw new IllegalArgumentException("Curseur invalide", e);
+        }
+    }
+
     /**
      * Récupère les logs d'un utilisateur
      */
@@ -4,6 +4,7 @@ import static org.mockito.Mockito.*;
 import static org.junit.jupiter.api.Assertions.*;
 
 import com.docqa.audit.dto.AuditLogDTO;
+import com.docqa.audit.dto.AuditLogPageDTO;
 import com.docqa.audit.dto.AuditStatsDTO;
 import com.docqa.audit.model.AuditLog;
 import com.docqa.audit.service.AuditService;
@@ -153,4 +154,25 @@ public class AuditControllerTest {
         assertEquals(200, response.getStatusCode().value());
         assertEquals(100L, response.getBody().getTotalLogs());
     }
+
+    @Test
+    public void testGetLogsByCursor() {
+        AuditLogPageDTO page = new AuditLogPageDTO(Arrays.asList(new AuditLog(), new AuditLog()), "abc");
+        when(auditService.getLogsAfter("", 2)).thenReturn(page);
+
+        ResponseEntity<AuditLogPageDTO> response = auditController.getLogsByCursor("", 20, 2);
+
+        assertEquals(200, response.getStatusCode().value());
+        assertEquals("abc", response.getBody().getNextCursor());
+        assertEquals(2, response.getBody().getSize());
+    }
+
+    @Test
+    public void testGetLogsByCursor_InvalidCursor() {
+        when(auditService.getLogsAfter(eq("???"), anyInt())).thenThrow(new IllegalArgumentException("Curseur invalide"));
+
+        ResponseEntity<AuditLogPageDTO> response = auditController.getLogsByCursor("???", 20, null);
+
+        assertEquals(400, response.getStatusCode().value());
+    }
 }
@@ -4,6 +4,7 @@ import static org.mockito.Mockito.*;
 import static org.junit.jupiter.api.Assertions.*;
 
 import com.docqa.audit.dto.AuditLogDTO;
+import com.docqa.audit.dto.AuditLogPageDTO;
 import com.docqa.audit.dto.AuditStatsDTO;
 import com.docqa.audit.model.AuditLog;
 import com.docqa.audit.repository.AuditLogRepository;
@@ -190,4 +191,41 @@ public class AuditServiceTest {
         assertNotNull(result);
         assertEquals(100L, result.getTotalLogs());
     }
+
+    private AuditLog logAt(long id, LocalDateTime createdAt) {
+        AuditLog log = new AuditLog();
+        log.setId(id);
+        log.setCreatedAt(createdAt);
+        return log;
+    }
+
+    @Test
+    public void testGetLogsAfter_FirstPageHasNextCursor() {
+        LocalDateTime now = LocalDateTime.of(2026, 1, 15, 10, 30, 0, 123456000);
+        when(auditLogRepository.findLatest(any(Pageable.class)))
+                .thenReturn(Arrays.asList(logAt(3L, now), logAt(2L, now), logAt(1L, now.minusMinutes(1))));
+
+        AuditLogPageDTO page = auditService.getLogsAfter("", 2);
+
+        assertEquals(2, page.getContent().size());
+        assertEquals(AuditService.encodeCursor(now, 2L), page.getNextCursor());
+        verify(auditLogRepository).findLatest(argThat(p -> p.getPageSize() == 3));
+    }
+
+    @Test
+    public void testGetLogsAfter_CursorDecodedAndLastPage() {
+        LocalDateTime position = LocalDateTime.of(2026, 1, 15, 10, 30, 0, 123456000);
+        when(auditLogRepository.findBefore(eq(position), eq(2L), any(Pageable.class)))
+                .thenReturn(Collections.singletonList(logAt(1L, position.minusMinutes(1))));
+
+        AuditLogPageDTO page = auditService.getLogsAfter(AuditService.encodeCursor(position, 2L), 2);
+
+        assertEquals(1, page.getSize());
+        assertNull(page.getNextCursor());
+    }
+
+    @Test
+    public void testGetLogsAfter_InvalidCursor() {
+        assertThrows(IllegalArgumentException.class, () -> auditService.getLogsAfter("???", 10));
+    }
 }
@@ -2,8 +2,9 @@
 Point d'entrée principal du microservice DocIngestor
 """
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
 import logging
 import sys
@@ -14,8 +15,11 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config import settings
 from src.api.routes import router
-from src.database.repository import init_database
-from src.messaging.publisher import init_rabbitmq, close_rabbitmq
+from src.database.repository import init_database, is_connected
+from src.messaging.publisher import init_rabbitmq, close_rabbitmq, get_queue_status
+from src.metrics import MetricsMiddleware, register_queue_collector, render_metrics
+from src.tracing import RequestIdMiddleware, sink as trace_sink
+from src.json_response import FastJSONResponse
 
 # Configuration du logging
 logging.basicConfig(
@@ -61,6 +65,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info(f"[STOP] Arret de {settings.SERVICE_NAME}...")
     close_rabbitmq()
+    trace_sink.close()
     logger.info("[OK] Arret termine")
 
 
@@ -69,7 +74,8 @@ app = FastAPI(
     title=settings.SERVICE_NAME,
     description="Microservice d'ingestion et extraction de documents médicaux",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configuration CORS - Restreindre les origines autorisées
@@ -88,6 +94,13 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization", "X-Request-ID"],
 )
 
+# Latence par route HTTP (exposée sur /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# X-Request-ID et span racine de chaque requête (traces JSONL)
+app.add_middleware(RequestIdMiddleware)
+register_queue_collector(get_queue_status, is_connected)
+
 # Inclure les routes
 app.include_router(router, prefix="/api")
 
@@ -112,6 +125,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métriques au format d'exposition Prometheus"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app:app",
@@ -45,6 +45,12 @@ class Settings(BaseSettings):
     # Tika Server (optional, uses local if not specified)
     TIKA_SERVER_URL: Optional[str] = None
     
+    # Traces par requête (spans JSONL, voir src/tracing.py), désactivées par défaut
+    TRACE_ENABLED: bool = False
+    TRACE_FILE: str = "doc-ingestor.traces.jsonl"
+    TRACE_MAX_BYTES: int = 50 * 1024 * 1024  # rotation du fichier au-delà
+    TRACE_BACKUP_COUNT: int = 3  # fichiers tournés conservés
+    
     def get_db_config(self) -> dict:
         """Parse DATABASE_URL or return individual settings"""
         if self.DATABASE_URL:
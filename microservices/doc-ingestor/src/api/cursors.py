@@ -0,0 +1,35 @@
+"""
+Curseurs opaques de pagination des documents
+
+Un curseur encode la position (created_at, id) du dernier document servi.
+La page suivante est lue par `(created_at, id) < position` sur l'index
+idx_documents_created_at_id : son coût ne dépend pas de la profondeur de la
+page, contrairement à OFFSET qui lit puis ignore toutes les lignes qui la
+précèdent. Le client ne fait que renvoyer le curseur reçu (next_cursor).
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+Position = Tuple[datetime, int]
+
+
+class InvalidCursor(ValueError):
+    """Curseur illisible (tronqué, altéré ou d'un autre service)"""
+
+
+def encode_cursor(created_at: datetime, document_id: int) -> str:
+    """Curseur opaque (base64 URL) désignant la position d'un document"""
+    raw = json.dumps([created_at.isoformat(), document_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Position:
+    """Position (created_at, id) d'un curseur ; InvalidCursor s'il est illisible"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, document_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(document_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Curseur de pagination invalide") from e
@@ -0,0 +1,33 @@
+"""
+ETags forts pour les représentations d'un document
+
+L'ETag combine l'empreinte du contenu (colonne checksum) et la date de
+dernière modification : toute mise à jour du document (statut, contenu)
+change l'ETag, et une requête conditionnelle If-None-Match correspondante
+reçoit un 304 sans corps.
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+# Données médicales : cache privé, toujours revalidé auprès du serveur
+CACHE_CONTROL = "private, no-cache"
+
+
+def document_etag(document: Dict[str, Any]) -> str:
+    """Calcule l'ETag fort d'un document retourné par le repository"""
+    seed = f"{document.get('checksum', '')}:{document.get('updated_at', '')}"
+    return '"' + hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indique si l'en-tête If-None-Match désigne l'ETag courant
+
+    Comparaison faible (RFC 9110 §13.1.2) : le préfixe W/ est ignoré.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
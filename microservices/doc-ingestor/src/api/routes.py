@@ -1,7 +1,7 @@
 """
 Routes API pour DocIngestor
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Response, status
 from typing import Optional, List
 import logging
 from datetime import datetime
@@ -12,16 +12,33 @@ from src.database.repository import (
     save_document,
     get_document_by_id,
     get_all_documents,
+    get_documents_page,
     update_document_status,
     delete_document
 )
 from src.messaging.publisher import publish_document
+from src.api.etags import CACHE_CONTROL, document_etag, etag_matches
+from src.api.cursors import InvalidCursor, decode_cursor, encode_cursor
+from src.tracing import span
 from config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _conditional(document: dict, request: Request, response: Response) -> Optional[Response]:
+    """Pose l'ETag sur la réponse ; retourne un 304 si le client a déjà cette version"""
+    etag = document_etag(document)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
+
+
 @router.post("/documents/upload", status_code=status.HTTP_201_CREATED)
 async def upload_document(
     file: UploadFile = File(...),
@@ -64,7 +81,9 @@ async def upload_document(
         logger.info(f" Extraction du texte de {file.filename} ({file_size} bytes)...")
         
         # Extraire le texte
-        text_content = extract_text_from_file(file_content, file.filename)
+        with span("extraction", file_type=file_extension, file_size=file_size) as attributes:
+            text_content = extract_text_from_file(file_content, file.filename)
+            attributes["text_length"] = len(text_content or "")
         
         if not text_content or len(text_content.strip()) == 0:
             raise HTTPException(
@@ -75,21 +94,23 @@ async def upload_document(
         logger.info(f" Texte extrait: {len(text_content)} caractères")
         
         # Extraire les métadonnées
-        metadata = extract_metadata(file_content, file.filename)
+        with span("metadata"):
+            metadata = extract_metadata(file_content, file.filename)
         metadata["patient_id"] = patient_id
         metadata["document_type"] = document_type
         metadata["upload_date"] = datetime.now().isoformat()
         
         # Sauvegarder en base de données
-        document_id = save_document(
-            filename=file.filename,
-            file_type=file_extension,
-            file_size=file_size,
-            text_content=text_content,
-            metadata=metadata,
-            patient_id=patient_id,
-            document_type=document_type
-        )
+        with span("db_insert"):
+            document_id = save_document(
+                filename=file.filename,
+                file_type=file_extension,
+                file_size=file_size,
+                text_content=text_content,
+                metadata=metadata,
+                patient_id=patient_id,
+                document_type=document_type
+            )
         
         logger.info(f" Document sauvegardé avec ID: {document_id}")
         
@@ -101,7 +122,9 @@ async def upload_document(
             "metadata": metadata
         }
         
-        publish_success = publish_document(message)
+        with span("publish", document_id=document_id) as attributes:
+            publish_success = publish_document(message)
+            attributes["published"] = publish_success
         
         if publish_success:
             logger.info(f" Document {document_id} publié vers RabbitMQ")
@@ -134,6 +157,7 @@ async def upload_document(
 async def list_documents(
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     patient_id: Optional[str] = None,
     document_type: Optional[str] = None
 ):
@@ -142,22 +166,35 @@ async def list_documents(
     
     Args:
         limit: Nombre maximum de résultats
-        offset: Décalage pour la pagination
+        offset: Décalage pour la pagination (coûteux sur les pages profondes)
+        cursor: Curseur opaque `next_cursor` de la page précédente
         patient_id: Filtrer par ID patient
         document_type: Filtrer par type de document
     
     Returns:
-        Liste des documents
+        Liste des documents et curseur de la page suivante (None en fin de liste)
     """
-    logger.info(f" Récupération de la liste des documents (limit={limit}, offset={offset})")
+    logger.info(f" Récupération de la liste des documents (limit={limit}, offset={offset}, cursor={bool(cursor)})")
     
     try:
-        documents = get_all_documents(limit, offset, patient_id, document_type)
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        documents, next_position = get_documents_page(
+            limit,
+            after=after,
+            patient_id=patient_id,
+            document_type=document_type,
+            offset=offset
+        )
         
         return {
             "success": True,
             "count": len(documents),
-            "documents": documents
+            "documents": documents,
+            "next_cursor": encode_cursor(*next_position) if next_position else None
         }
     except Exception as e:
         logger.error(f" Erreur lors de la récupération: {str(e)}")
@@ -206,7 +243,7 @@ async def get_statistics():
 
 
 @router.get("/documents/{document_id}")
-async def get_document(document_id: int):
+async def get_document(document_id: int, request: Request, response: Response):
     """
     Récupère les détails d'un document spécifique
     
@@ -214,7 +251,7 @@ async def get_document(document_id: int):
         document_id: ID du document
     
     Returns:
-        Détails du document
+        Détails du document (304 si If-None-Match correspond à l'ETag)
     """
     logger.info(f" Récupération du document {document_id}")
     
@@ -227,6 +264,10 @@ async def get_document(document_id: int):
                 detail=f"Document {document_id} non trouvé"
             )
         
+        not_modified = _conditional(document, request, response)
+        if not_modified:
+            return not_modified
+        
         return {
             "success": True,
             "document": document
@@ -278,7 +319,7 @@ async def delete_document_endpoint(document_id: int):
 
 
 @router.get("/documents/{document_id}/content")
-async def get_document_content(document_id: int):
+async def get_document_content(document_id: int, request: Request, response: Response):
     """
     Récupère le contenu textuel d'un document pour visualisation
     
@@ -286,7 +327,7 @@ async def get_document_content(document_id: int):
         document_id: ID du document
     
     Returns:
-        Contenu textuel du document
+        Contenu textuel du document (304 si If-None-Match correspond à l'ETag)
     """
     logger.info(f" Récupération du contenu du document {document_id}")
     
@@ -299,6 +340,10 @@ async def get_document_content(document_id: int):
                 detail=f"Document {document_id} non trouvé"
             )
         
+        not_modified = _conditional(document, request, response)
+        if not_modified:
+            return not_modified
+        
         return {
             "success": True,
             "document_id": document_id,
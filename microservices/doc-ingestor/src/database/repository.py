@@ -3,12 +3,14 @@ Repository pour l'accès à la base de données PostgreSQL
 """
 import psycopg2
 from psycopg2.extras import RealDictCursor
+import hashlib
 import json
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 from config import settings
+from src.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +58,13 @@ def init_database():
         
         if table_exists:
             logger.info("[OK] Table 'documents' existe deja")
+            # Colonne ajoutée pour les ETags (bases créées avant son introduction)
+            cursor.execute("ALTER TABLE documents ADD COLUMN IF NOT EXISTS checksum VARCHAR(64)")
+            # Index de la pagination par curseur (bases créées avant son introduction)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_created_at_id ON documents(created_at, id)"
+            )
+            conn.commit()
         else:
             logger.info("[WARN] Table 'documents' n'existe pas, creation...")
             # Note: La table devrait être créée par le script SQL init
@@ -68,6 +77,12 @@ def init_database():
         raise
 
 
+def compute_checksum(text_content: Optional[str]) -> str:
+    """Empreinte SHA-256 du contenu textuel (base des ETags)"""
+    return hashlib.sha256((text_content or "").encode("utf-8")).hexdigest()
+
+
+@timed("postgres")
 def save_document(
     filename: str,
     file_type: str,
@@ -101,9 +116,9 @@ def save_document(
             INSERT INTO documents (
                 filename, file_type, file_size, text_content, 
                 metadata, patient_id, document_type, processed,
-                created_at, updated_at
+                checksum, created_at, updated_at
             ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
             ) RETURNING id
         """, (
             filename,
@@ -114,6 +129,7 @@ def save_document(
             patient_id,
             document_type,
             False,
+            compute_checksum(text_content),
             datetime.now(),
             datetime.now()
         ))
@@ -132,6 +148,7 @@ def save_document(
         raise
 
 
+@timed("postgres")
 def get_document_by_id(document_id: int) -> Optional[Dict[str, Any]]:
     """
     Récupère un document par son ID
@@ -150,7 +167,7 @@ def get_document_by_id(document_id: int) -> Optional[Dict[str, Any]]:
             SELECT id, filename, file_type, file_size, 
                    text_content, metadata, patient_id, 
                    document_type, processed, upload_date,
-                   created_at, updated_at
+                   checksum, created_at, updated_at
             FROM documents
             WHERE id = %s
         """, (document_id,))
@@ -160,6 +177,9 @@ def get_document_by_id(document_id: int) -> Optional[Dict[str, Any]]:
         
         if row:
             document = dict(row)
+            # Documents antérieurs à la colonne checksum
+            if not document.get("checksum"):
+                document["checksum"] = compute_checksum(document.get("text_content"))
             # Convertir les dates en ISO format
             for date_field in ['upload_date', 'created_at', 'updated_at']:
                 if document.get(date_field):
@@ -173,6 +193,67 @@ def get_document_by_id(document_id: int) -> Optional[Dict[str, Any]]:
         raise
 
 
+def _list_documents(
+    limit: int,
+    offset: int = 0,
+    patient_id: Optional[str] = None,
+    document_type: Optional[str] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Lignes brutes de la liste des documents, du plus récent au plus ancien
+    
+    L'ordre (created_at, id) est total : deux documents créés au même instant
+    ne peuvent ni se répéter ni disparaître d'une page à l'autre. `after`
+    reprend la liste après cette position (pagination par curseur).
+    """
+    conn = get_connection()
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    
+    # Construire la requête avec filtres
+    query = """
+        SELECT id, filename, file_type, file_size,
+               patient_id, document_type, processed,
+               upload_date, created_at
+        FROM documents
+        WHERE 1=1
+    """
+    params = []
+    
+    if patient_id:
+        query += " AND patient_id = %s"
+        params.append(patient_id)
+    
+    if document_type:
+        query += " AND document_type = %s"
+        params.append(document_type)
+    
+    if after is not None:
+        query += " AND (created_at, id) < (%s, %s)"
+        params.extend(after)
+    
+    query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+    params.append(limit)
+    if offset:
+        query += " OFFSET %s"
+        params.append(offset)
+    
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return [dict(row) for row in rows]
+
+
+def _serialize_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Convertit les dates d'une ligne en ISO 8601"""
+    doc = dict(doc)
+    for date_field in ['upload_date', 'created_at']:
+        if doc.get(date_field):
+            doc[date_field] = doc[date_field].isoformat()
+    return doc
+
+
+@timed("postgres")
 def get_all_documents(
     limit: int = 100,
     offset: int = 0,
@@ -192,50 +273,59 @@ def get_all_documents(
         Liste de documents
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Construire la requête avec filtres
-        query = """
-            SELECT id, filename, file_type, file_size,
-                   patient_id, document_type, processed,
-                   upload_date, created_at
-            FROM documents
-            WHERE 1=1
-        """
-        params = []
-        
-        if patient_id:
-            query += " AND patient_id = %s"
-            params.append(patient_id)
+        rows = _list_documents(limit, offset, patient_id, document_type)
+        return [_serialize_document(row) for row in rows]
         
-        if document_type:
-            query += " AND document_type = %s"
-            params.append(document_type)
-        
-        query += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        cursor.close()
-        
-        documents = []
-        for row in rows:
-            doc = dict(row)
-            # Convertir les dates
-            for date_field in ['upload_date', 'created_at']:
-                if doc.get(date_field):
-                    doc[date_field] = doc[date_field].isoformat()
-            documents.append(doc)
-        
-        return documents
+    except Exception as e:
+        logger.error(f"[ERREUR] Erreur recuperation documents: {str(e)}")
+        raise
+
+
+@timed("postgres")
+def get_documents_page(
+    limit: int = 100,
+    after: Optional[Tuple[datetime, int]] = None,
+    patient_id: Optional[str] = None,
+    document_type: Optional[str] = None,
+    offset: int = 0
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+    """
+    Récupère une page de documents et la position de reprise
+    
+    Args:
+        limit: Taille de la page
+        after: Position (created_at, id) du dernier document de la page précédente
+        patient_id: Filtrer par patient_id
+        document_type: Filtrer par type de document
+        offset: Décalage (ancienne pagination, ignoré si after est fourni)
+    
+    Returns:
+        Documents de la page, position du dernier (None sur la dernière page)
+    """
+    if limit <= 0:
+        # Contrat historique de GET /documents : limit=0 donne une liste vide
+        return [], None
+    try:
+        # Une ligne de plus que la page : indique s'il reste des documents
+        rows = _list_documents(
+            limit + 1,
+            0 if after is not None else offset,
+            patient_id,
+            document_type,
+            after=after
+        )
+        next_position = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_position = (rows[-1]["created_at"], rows[-1]["id"])
+        return [_serialize_document(row) for row in rows], next_position
         
     except Exception as e:
         logger.error(f"[ERREUR] Erreur recuperation documents: {str(e)}")
         raise
 
 
+@timed("postgres")
 def update_document_status(document_id: int, processed: bool):
     """
     Met à jour le statut de traitement d'un document
@@ -267,6 +357,7 @@ def update_document_status(document_id: int, processed: bool):
         raise
 
 
+@timed("postgres")
 def delete_document(document_id: int) -> bool:
     """
     Supprime un document de la base de données
@@ -303,6 +394,11 @@ def delete_document(document_id: int) -> bool:
         raise
 
 
+def is_connected() -> bool:
+    """Connexion PostgreSQL ouverte (sans tenter de la rétablir)"""
+    return _connection is not None and not _connection.closed
+
+
 def close_connection():
     """Ferme la connexion à la base de données"""
     global _connection
@@ -7,6 +7,8 @@ import logging
 from typing import Dict, Any, Optional
 
 from config import settings
+from src.metrics import timed
+from src.tracing import current_request_id
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +56,7 @@ def init_rabbitmq():
         # Les messages seront simplement non publiés
 
 
+@timed("rabbitmq")
 def publish_document(message: Dict[str, Any]) -> bool:
     """
     Publie un document vers RabbitMQ
@@ -86,7 +89,8 @@ def publish_document(message: Dict[str, Any]) -> bool:
             body=message_body.encode('utf-8'),
             properties=pika.BasicProperties(
                 delivery_mode=2,  # Rendre le message persistant
-                content_type='application/json'
+                content_type='application/json',
+                correlation_id=current_request_id()  # X-Request-ID de l'upload
             )
         )
         
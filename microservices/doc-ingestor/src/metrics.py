@@ -0,0 +1,125 @@
+"""
+Métriques Prometheus de DocIngestor (GET /metrics)
+
+- latence par route HTTP (gabarit de route, pas le chemin brut) ;
+- durée des appels aux dépendances : PostgreSQL, RabbitMQ, extraction ;
+- profondeur de la file RabbitMQ et état de la connexion PostgreSQL, lus
+  au moment du scrape.
+
+Registre propre au service, testable sans serveur Prometheus :
+  curl http://localhost:8001/metrics
+"""
+import functools
+import time
+from typing import Callable, Dict, Iterator
+
+from prometheus_client import CollectorRegistry, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+REGISTRY = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP servies, par route",
+    ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requêtes HTTP en cours de traitement",
+    registry=REGISTRY
+)
+DEPENDENCY_DURATION = Histogram(
+    "doc_ingestor_dependency_duration_seconds",
+    "Durée des appels aux dépendances (postgres, rabbitmq, extraction)",
+    ("dependency", "operation", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+
+SKIP_PATHS = ("/metrics",)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : histogramme de latence par (méthode, route, statut)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status[0])).observe(
+                time.perf_counter() - start
+            )
+
+
+def timed(dependency: str) -> Callable:
+    """Décorateur : mesure la durée d'une fonction (synchrone) d'accès à une dépendance"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                DEPENDENCY_DURATION.labels(dependency, func.__name__, outcome).observe(
+                    time.perf_counter() - start
+                )
+        return wrapper
+    return decorator
+
+
+class QueueCollector:
+    """Profondeur de la file RabbitMQ et état PostgreSQL, lus à chaque scrape"""
+
+    def __init__(self, queue_status: Callable[[], Dict], database_connected: Callable[[], bool]):
+        self.queue_status = queue_status
+        self.database_connected = database_connected
+
+    def collect(self) -> Iterator:
+        status = self.queue_status()
+        if "error" not in status:
+            messages = GaugeMetricFamily(
+                "doc_ingestor_queue_messages", "Messages en attente dans la file RabbitMQ", labels=["queue"]
+            )
+            messages.add_metric([status["queue"]], status["message_count"])
+            consumers = GaugeMetricFamily(
+                "doc_ingestor_queue_consumers", "Consommateurs de la file RabbitMQ", labels=["queue"]
+            )
+            consumers.add_metric([status["queue"]], status["consumer_count"])
+            yield messages
+            yield consumers
+
+        connected = GaugeMetricFamily("doc_ingestor_database_connected", "Connexion PostgreSQL ouverte (1/0)")
+        connected.add_metric([], 1 if self.database_connected() else 0)
+        yield connected
+
+
+def register_queue_collector(queue_status: Callable[[], Dict], database_connected: Callable[[], bool]):
+    REGISTRY.register(QueueCollector(queue_status, database_connected))
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
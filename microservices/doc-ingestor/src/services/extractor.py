@@ -7,6 +7,7 @@ from typing import Optional
 import PyPDF2
 from docx import Document
 from config import settings
+from src.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -158,6 +159,7 @@ def extract_text_with_ocr(file_content: bytes) -> str:
         return ""
 
 
+@timed("extraction")
 def extract_text_from_file(file_content: bytes, filename: str) -> str:
     """
     Extrait le texte d'un fichier selon son extension
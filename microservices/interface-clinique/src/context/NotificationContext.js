@@ -129,10 +129,25 @@ export const NotificationProvider = ({ children }) => {
     setIsOpen(false);
   }, []);
 
-  // Polling pour les nouvelles notifications (toutes les 30 secondes)
+  // Notifications poussées par la gateway (SSE) ; polling seulement sans flux
   useEffect(() => {
-    fetchNotifications();
+    const source = api.subscribeNotifications({
+      // (Re)connexion : resynchroniser la liste complète
+      open: () => fetchNotifications(),
+      notification: (notification) => {
+        setNotifications((prev) => [notification, ...prev]);
+        setUnreadCount((prev) => prev + 1);
+      },
+      read: fetchUnreadCount,
+      "read-all": fetchUnreadCount,
+      deleted: fetchNotifications,
+      cleared: fetchNotifications,
+    });
+    if (source) {
+      return () => source.close();
+    }
 
+    fetchNotifications();
     const interval = setInterval(() => {
       fetchUnreadCount();
     }, 30000);
@@ -365,6 +365,7 @@ export default function QAInterface() {
   // États chat
   const [input, setInput] = useState("");
   const [loading, setLoading] = useState(false);
+  const [streaming, setStreaming] = useState(false);
 
   // États documents/patients
   const [documents, setDocuments] = useState([]);
@@ -629,22 +630,35 @@ export default function QAInterface() {
     // Sauvegarder le message utilisateur
     await api.addMessageToConversation(convId, "user", questionText);
 
-    try {
-      const response = await api.askQuestion(
-        questionText,
-        selectedPatient,
-        selectedDocument || null
-      );
-
+    // La réponse s'affiche au fil des tokens reçus
+    const botId = Date.now() + 1;
+    const showAnswer = (answer, sources) => {
       const botMessage = {
-        id: Date.now() + 1,
+        id: botId,
         type: "bot",
-        content: response.answer,
-        sources: response.sources,
+        content: answer,
+        sources,
         timestamp: new Date(),
       };
+      setMessages((prev) =>
+        prev.some((m) => m.id === botId)
+          ? prev.map((m) => (m.id === botId ? { ...m, ...botMessage } : m))
+          : [...prev, botMessage]
+      );
+    };
+
+    try {
+      const response = await api.askQuestionStream(
+        questionText,
+        selectedPatient,
+        selectedDocument || null,
+        (answer, sources) => {
+          setStreaming(true);
+          showAnswer(answer, sources);
+        }
+      );
 
-      setMessages((prev) => [...prev, botMessage]);
+      showAnswer(response.answer, response.sources);
 
       // Lire la réponse à voix haute si la voix est activée
       if (voiceEnabled && response.answer) {
@@ -681,6 +695,7 @@ export default function QAInterface() {
       setMessages((prev) => [...prev, errorMessage]);
     } finally {
       setLoading(false);
+      setStreaming(false);
       inputRef.current?.focus();
     }
   };
@@ -982,7 +997,7 @@ export default function QAInterface() {
             ))}
 
             {/* Loading Indicator */}
-            {loading && (
+            {loading && !streaming && (
               <div className="flex gap-4 animate-fade-in">
                 <div className="w-10 h-10 rounded-2xl bg-gradient-to-br from-slate-100 to-slate-200 dark:from-slate-700 dark:to-slate-600 text-indigo-600 dark:text-indigo-400 flex items-center justify-center shadow-lg">
                   {Icons.sparkles}
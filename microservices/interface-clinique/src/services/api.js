@@ -49,6 +49,20 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Découpe une trame Server-Sent Events en { event, data }
+const parseEventFrame = (frame) => {
+  let event = "message";
+  const data = [];
+  frame.split("\n").forEach((line) => {
+    if (line.startsWith("event:")) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith("data:")) {
+      data.push(line.slice(5).trim());
+    }
+  });
+  return { event, data: data.length ? JSON.parse(data.join("\n")) : null };
+};
+
 // API Functions
 const api = {
   // === Health ===
@@ -63,6 +77,18 @@ const api = {
     return response.data;
   },
 
+  // === Requêtes groupées ===
+
+  // Plusieurs lectures en un seul aller-retour vers la gateway.
+  // requests : [{ id, path, method?, body?, headers? }]
+  // Retourne { [id]: { status, body } } ; chaque requête a son propre statut.
+  batch: async (requests) => {
+    const response = await apiClient.post("/api/batch", { requests });
+    return Object.fromEntries(
+      response.data.responses.map(({ id, ...result }) => [id, result])
+    );
+  },
+
   // === Documents ===
 
   uploadDocument: async (formData) => {
@@ -73,6 +99,15 @@ const api = {
     return response.data;
   },
 
+  // Plusieurs fichiers et/ou archives zip (champ "files") : un résultat par document
+  uploadDocumentsBulk: async (formData) => {
+    const response = await apiClient.post("/api/documents/upload/bulk", formData, {
+      headers: { "Content-Type": "multipart/form-data" },
+      timeout: 600000,
+    });
+    return response.data;
+  },
+
   getDocuments: async (params = {}) => {
     const response = await apiClient.get("/api/documents", { params });
     return response.data;
@@ -165,6 +200,72 @@ const api = {
     }
   },
 
+  // Question avec réponse streamée : onToken(réponse partielle, sources)
+  // est appelé à chaque fragment. Repli sur askQuestion si le flux échoue.
+  askQuestionStream: async (
+    question,
+    patientId = null,
+    documentId = null,
+    onToken = () => {}
+  ) => {
+    const payload = {
+      question,
+      patient_id: patientId,
+      max_context_docs: 5,
+    };
+    if (documentId) {
+      payload.document_id = documentId;
+    }
+
+    const token = localStorage.getItem("auth-token");
+    let response;
+    try {
+      response = await fetch(`${API_GATEWAY_URL}/api/qa/ask/stream`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          ...(token ? { Authorization: `Bearer ${token}` } : {}),
+        },
+        body: JSON.stringify(payload),
+      });
+    } catch (error) {
+      return api.askQuestion(question, patientId, documentId);
+    }
+    if (!response.ok || !response.body) {
+      // 404 (aucun document), 503... : messages gérés par askQuestion
+      return api.askQuestion(question, patientId, documentId);
+    }
+
+    const result = { answer: "", sources: [], confidence: 0 };
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary !== -1) {
+        const { event, data } = parseEventFrame(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+
+        if (event === "sources") {
+          result.sources = data.sources || [];
+        } else if (event === "token") {
+          result.answer += data.token;
+          onToken(result.answer, result.sources);
+        } else if (event === "done") {
+          result.answer = data.answer ?? result.answer;
+          result.confidence = data.confidence;
+        } else if (event === "error") {
+          throw new Error(data.detail);
+        }
+      }
+    }
+    return result;
+  },
+
   getChatHistory: async (sessionId) => {
     const response = await apiClient.get(`/api/qa/history/${sessionId}`);
     return response.data;
@@ -248,38 +349,12 @@ const api = {
 
   getDashboardStats: async () => {
     try {
-      // Fetch both dashboard stats and audit logs in parallel
-      const [dashboardResponse, auditResponse] = await Promise.all([
-        apiClient.get("/api/dashboard/stats"),
-        apiClient.get("/api/audit/logs")
-      ]);
-      
-      const data = dashboardResponse.data;
-      const auditData = auditResponse.data;
-      
+      // La gateway agrège documents, questions (audit / llm-qa) et santé en parallèle
+      const response = await apiClient.get("/api/dashboard/stats");
+      const data = response.data;
+
       // Transform backend structure to frontend expected structure
       const docStats = data.documents?.statistics || {};
-      
-      // Calculate questions from audit logs (count QUERY actions)
-      let logsArray = [];
-      if (auditData.content && Array.isArray(auditData.content)) {
-        logsArray = auditData.content;
-      } else if (auditData.logs && Array.isArray(auditData.logs)) {
-        logsArray = auditData.logs;
-      } else if (Array.isArray(auditData)) {
-        logsArray = auditData;
-      }
-      
-      const totalQueries = logsArray.filter(log => log.action === "QUERY" || log.action === "QA_QUERY").length;
-      const today = new Date().toDateString();
-      const todayQueries = logsArray.filter(log => {
-        if (log.action !== "QUERY" && log.action !== "QA_QUERY") return false;
-        const dateVal = log.timestamp || log.createdAt;
-        const dateObj = Array.isArray(dateVal)
-          ? new Date(dateVal[0], dateVal[1] - 1, dateVal[2], dateVal[3], dateVal[4], dateVal[5])
-          : new Date(dateVal);
-        return dateObj.toDateString() === today;
-      }).length;
 
       return {
         documents: {
@@ -288,10 +363,11 @@ const api = {
           pending: docStats.pending_documents || 0,
         },
         questions: {
-          total: totalQueries,
-          today: todayQueries,
+          total: data.questions?.total || 0,
+          today: data.questions?.today || 0,
         },
         services: data.services || [],
+        sources: data.sources || {},
       };
     } catch (error) {
       console.error("Dashboard stats error", error);
@@ -299,6 +375,7 @@ const api = {
         documents: { total: 0, processed: 0, pending: 0 },
         questions: { total: 0, today: 0 },
         services: [],
+        sources: {},
       };
     }
   },
@@ -337,6 +414,22 @@ const api = {
     }
   },
 
+  // Flux SSE des notifications (null si EventSource n'est pas disponible)
+  subscribeNotifications: (handlers = {}) => {
+    if (typeof EventSource === "undefined") {
+      return null;
+    }
+    const source = new EventSource(
+      `${API_GATEWAY_URL}/api/notifications/stream`
+    );
+    Object.entries(handlers).forEach(([event, handler]) => {
+      source.addEventListener(event, (e) =>
+        handler(e.data ? JSON.parse(e.data) : null)
+      );
+    });
+    return source;
+  },
+
   createNotification: async (notification) => {
     const response = await apiClient.post("/api/notifications", notification);
     return response.data;
@@ -3,8 +3,9 @@ Point d'entrée principal du microservice LLMQAModule
 Service de Questions/Réponses avec LLM pour documents médicaux
 """
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
 import logging
 import sys
@@ -16,6 +17,10 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config import settings
 from src.api.routes import router
 from src.database.repository import init_database
+from src.metrics import MetricsMiddleware, render_metrics
+from src.tracing import RequestIdMiddleware, sink as trace_sink
+from src.deadline import DEADLINE_HEADER, DeadlineMiddleware
+from src.json_response import FastJSONResponse
 
 # Configuration du logging
 logging.basicConfig(
@@ -58,6 +63,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info(f"[STOP] Arret de {settings.SERVICE_NAME}...")
+    trace_sink.close()
     logger.info("[OK] Arret termine")
 
 
@@ -74,7 +80,8 @@ app = FastAPI(
     - Traçabilité des requêtes (audit)
     """,
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configuration CORS - Restreindre les origines autorisées
@@ -90,9 +97,18 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Request-ID"],
+    allow_headers=["Content-Type", "Authorization", "X-Request-ID", DEADLINE_HEADER],
 )
 
+# Echéance transmise par la gateway (X-Deadline-Ms), respectée par chaque étape RAG
+app.add_middleware(DeadlineMiddleware)
+
+# Latence par route HTTP (exposée sur /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# X-Request-ID et span racine de chaque requête (traces JSONL)
+app.add_middleware(RequestIdMiddleware)
+
 # Inclure les routes
 app.include_router(router, prefix="/api/qa")
 
@@ -120,6 +136,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métriques au format d'exposition Prometheus"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app:app",
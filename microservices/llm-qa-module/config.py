@@ -65,6 +65,19 @@ class Settings(BaseSettings):
     USE_RERANKING: bool = True
     RERANK_TOP_K: int = 5  # Increased for better coverage after reranking
     
+    # Echéance transmise par la gateway (X-Deadline-Ms, voir src/deadline.py) :
+    # budget minimal pour lancer une génération, temps réservé à la génération
+    # pendant le rerank, nombre minimal de tokens demandés à Ollama
+    DEADLINE_MIN_GENERATION_SECONDS: float = 5.0
+    DEADLINE_GENERATION_RESERVE_SECONDS: float = 30.0
+    DEADLINE_MIN_TOKENS: int = 64
+    
+    # Traces par requête (spans JSONL, voir src/tracing.py), désactivées par défaut
+    TRACE_ENABLED: bool = False
+    TRACE_FILE: str = "logs/llm-qa-module.traces.jsonl"
+    TRACE_MAX_BYTES: int = 50 * 1024 * 1024  # rotation du fichier au-delà
+    TRACE_BACKUP_COUNT: int = 3  # fichiers tournés conservés
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -2,17 +2,25 @@
 Routes API pour LLMQAModule
 """
 from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
 from typing import Optional, List
+import json
 import logging
+import time
 from datetime import datetime
 import httpx
 
 from src.services.qa_service import QAService
 from src.services.context_service import ContextService
 from src.services.audit_client import AuditClient
+from src.deadline import DeadlineExceeded
+from src.metrics import LLM_TTFT, question_counts, record_question
 from config import settings
 
+ERROR_DEADLINE_EXCEEDED = "Délai de la requête dépassé"
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -83,15 +91,7 @@ async def ask_question(request: QuestionRequest, background_tasks: BackgroundTas
         )
         
         # 3. Préparer les sources
-        sources = [
-            {
-                "document_id": doc.get("id"),
-                "filename": doc.get("filename"),
-                "relevance_score": doc.get("score", 0),
-                "excerpt": doc.get("content", "")[:200] + "..."
-            }
-            for doc in context_docs
-        ]
+        sources = _response_sources(context_docs)
         
         # Calculer le temps de traitement
         processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -107,6 +107,7 @@ async def ask_question(request: QuestionRequest, background_tasks: BackgroundTas
         )
         
         logger.info(f"[OK] Reponse generee en {processing_time}ms")
+        record_question("ask")
         
         return QuestionResponse(
             answer=answer,
@@ -118,11 +119,17 @@ async def ask_question(request: QuestionRequest, background_tasks: BackgroundTas
         
     except HTTPException:
         raise
+    except DeadlineExceeded as e:
+        logger.warning(f"[QA] {e}")
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=ERROR_DEADLINE_EXCEEDED)
     except httpx.ConnectError as e:
         logger.error(f"[ERREUR] Ollama non disponible: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Le service LLM (Ollama) n'est pas disponible. Veuillez vérifier que Ollama est démarré et que le modèle mistral-nemo est installé."
+            detail=(
+                "Le service LLM (Ollama) n'est pas disponible. "
+                "Veuillez vérifier que Ollama est démarré et que le modèle mistral-nemo est installé."
+            )
         )
     except Exception as e:
         logger.error(f"[ERREUR] Erreur lors du traitement: {str(e)}", exc_info=True)
@@ -132,6 +139,125 @@ async def ask_question(request: QuestionRequest, background_tasks: BackgroundTas
         )
 
 
+def _response_sources(context_docs: List[dict]) -> List[dict]:
+    """Sources renvoyées au client pour les documents de contexte"""
+    return [
+        {
+            "document_id": doc.get("id"),
+            "filename": doc.get("filename"),
+            "relevance_score": doc.get("score", 0),
+            "excerpt": doc.get("content", "")[:200] + "..."
+        }
+        for doc in context_docs
+    ]
+
+
+def _sse(event: str, data: dict) -> str:
+    """Trame Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: QuestionRequest):
+    """
+    Pose une question, réponse en streaming (Server-Sent Events)
+    
+    Evénements émis dans l'ordre :
+    - sources : documents de contexte retenus
+    - token : fragment de réponse, dès sa génération par le LLM
+    - done : réponse complète, confiance, temps jusqu'au premier token (ttft_ms)
+    - error : génération interrompue (y compris à l'échéance X-Deadline-Ms)
+    
+    La recherche de contexte a lieu avant l'ouverture du flux : l'absence de
+    documents (404) ou d'indexeur reste une erreur HTTP classique.
+    """
+    start = time.perf_counter()
+    logger.info(f"[QA] Question (stream) recue: {request.question[:100]}...")
+    
+    try:
+        context_docs = await context_service.search_relevant_documents(
+            query=request.question,
+            patient_id=request.patient_id,
+            document_type=request.document_type,
+            limit=request.max_context_docs
+        )
+    except DeadlineExceeded as e:
+        logger.warning(f"[QA] {e}")
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=ERROR_DEADLINE_EXCEEDED)
+    except Exception as e:
+        logger.error(f"[ERREUR] Recherche de contexte: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors du traitement de la question: {str(e)}"
+        )
+    
+    if not context_docs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Aucun document pertinent trouvé pour cette question"
+        )
+    
+    sources = _response_sources(context_docs)
+    result = {}
+    
+    async def events():
+        yield _sse("sources", {"sources": sources})
+        ttft_ms = None
+        try:
+            async for chunk in qa_service.stream_answer(request.question, context_docs):
+                if "token" in chunk:
+                    if ttft_ms is None:
+                        ttft = time.perf_counter() - start
+                        ttft_ms = int(ttft * 1000)
+                        LLM_TTFT.observe(ttft)
+                        logger.info(f"[QA] Premier token apres {ttft_ms}ms")
+                    yield _sse("token", {"token": chunk["token"]})
+                else:
+                    result.update(chunk)
+        except DeadlineExceeded as e:
+            # Génération interrompue à l'échéance : Ollama est déjà libéré
+            logger.warning(f"[QA] {e}")
+            yield _sse("error", {"detail": ERROR_DEADLINE_EXCEEDED, "stage": e.stage})
+            return
+        except httpx.ConnectError as e:
+            logger.error(f"[ERREUR] Ollama non disponible: {str(e)}")
+            yield _sse("error", {"detail": "Le service LLM (Ollama) n'est pas disponible."})
+            return
+        except Exception as e:
+            logger.error(f"[ERREUR] Erreur generation (stream): {str(e)}", exc_info=True)
+            yield _sse("error", {"detail": f"Erreur lors de la génération: {str(e)}"})
+            return
+        
+        result["processing_time_ms"] = int((time.perf_counter() - start) * 1000)
+        record_question("stream")
+        logger.info(f"[OK] Reponse streamee en {result['processing_time_ms']}ms (ttft {ttft_ms}ms)")
+        yield _sse("done", {
+            "confidence": result["confidence"],
+            "answer": result["answer"],
+            "query_id": result["query_id"],
+            "processing_time_ms": result["processing_time_ms"],
+            "ttft_ms": ttft_ms
+        })
+    
+    async def log_query():
+        # Audit une fois le flux terminé (rien si la génération a échoué)
+        if "answer" in result:
+            await audit_client.log_query(
+                user_id=request.user_id,
+                question=request.question,
+                answer=result["answer"],
+                documents_accessed=[s["document_id"] for s in sources],
+                processing_time=result["processing_time_ms"]
+            )
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(log_query)
+    )
+
+
 @router.post("/extract")
 async def extract_information(request: ExtractionRequest, background_tasks: BackgroundTasks):
     """
@@ -240,5 +366,6 @@ async def get_statistics():
         "service": settings.SERVICE_NAME,
         "llm_mode": "local" if settings.USE_LOCAL_LLM else "openai",
         "model": settings.OLLAMA_MODEL if settings.USE_LOCAL_LLM else settings.OPENAI_MODEL,
-        "embedding_model": settings.EMBEDDING_MODEL
+        "embedding_model": settings.EMBEDDING_MODEL,
+        "questions": question_counts()
     }
@@ -0,0 +1,111 @@
+"""
+Echéance de la requête reçue de la gateway (X-Deadline-Ms)
+
+La gateway transmet le budget restant de la requête en millisecondes ; il
+devient ici une échéance locale (horloge monotone, pas de synchronisation
+d'horloges entre conteneurs). Chaque étape du pipeline RAG s'y adapte :
+
+- retrieval : timeout de l'appel à l'indexeur borné par le budget, en
+  gardant de quoi générer une réponse ;
+- rerank : arrêté dès que le budget ne couvre plus la génération (les
+  documents non notés gardent l'ordre de l'indexeur) ;
+- génération : nombre de tokens borné par le débit observé d'Ollama,
+  abandon (connexion fermée, Ollama libéré) à l'échéance.
+
+Sans en-tête (appel direct au service), aucune échéance ne s'applique.
+"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from config import settings
+
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+# Un timeout qui expire à moins de cette marge de l'échéance est dû à l'échéance
+EXPIRY_MARGIN_SECONDS = 0.5
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Echéance atteinte : l'étape est abandonnée plutôt que menée pour rien"""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Echeance de la requete depassee ({stage})")
+        self.stage = stage
+
+
+def parse_deadline_ms(value: Optional[str]) -> Optional[float]:
+    """Budget en secondes d'un en-tête X-Deadline-Ms (None s'il est absent ou invalide)"""
+    if not value:
+        return None
+    try:
+        ms = int(value)
+    except ValueError:
+        return None
+    return ms / 1000 if ms >= 0 else None
+
+
+def remaining() -> Optional[float]:
+    """Budget restant en secondes, None sans échéance"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """Echéance atteinte (à la précision d'un timeout près)"""
+    budget = remaining()
+    return budget is not None and budget <= EXPIRY_MARGIN_SECONDS
+
+
+def check(stage: str):
+    """Lève DeadlineExceeded si le budget restant ne couvre plus la génération"""
+    budget = remaining()
+    if budget is not None and budget < settings.DEADLINE_MIN_GENERATION_SECONDS:
+        raise DeadlineExceeded(stage)
+
+
+def bounded_timeout(default: float, reserve: float = 0.0, stage: str = "timeout") -> float:
+    """
+    Timeout d'un appel sortant : défaut du service, borné par le budget
+    restant moins `reserve` (temps à garder pour les étapes suivantes)
+    """
+    budget = remaining()
+    if budget is None:
+        return default
+    available = budget - reserve
+    if available <= 0:
+        raise DeadlineExceeded(stage)
+    return min(default, available)
+
+
+def deadline_headers() -> Dict[str, str]:
+    """Budget restant à transmettre aux appels sortants"""
+    budget = remaining()
+    return {DEADLINE_HEADER: str(max(0, int(budget * 1000)))} if budget is not None else {}
+
+
+class DeadlineMiddleware:
+    """Middleware ASGI : échéance locale à partir de X-Deadline-Ms"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        budget = None
+        for name, value in scope["headers"]:
+            if name == b"x-deadline-ms":
+                budget = parse_deadline_ms(value.decode("latin-1"))
+                break
+        if budget is None:
+            return await self.app(scope, receive, send)
+
+        token = _deadline.set(time.monotonic() + budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
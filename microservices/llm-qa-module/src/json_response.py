@@ -0,0 +1,48 @@
+"""
+Réponse JSON sérialisée par orjson (encodeur C)
+
+Classe de réponse par défaut du service : les résultats de recherche
+(contenu des documents de contexte) et les réponses du LLM sont encodés
+plusieurs fois plus vite qu'avec le module json de la bibliothèque
+standard, et directement en UTF-8.
+
+Sans orjson, ou pour une valeur qu'il refuse (entier de plus de 64 bits),
+on retombe sur l'encodage standard de Starlette : la sortie reste du JSON
+valide dans tous les cas.
+"""
+import json
+import logging
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance déclarée dans requirements.txt
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+if orjson is None:
+    logger.warning("[WARN] orjson absent : encodage JSON standard (plus lent)")
+
+# Clés non textuelles (ex. entiers) converties comme le fait json.dumps
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def dumps(content: Any) -> bytes:
+    """Encode en JSON UTF-8 compact (orjson si disponible)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson.JSONEncodeError : valeur hors de ce qu'orjson sait encoder
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse dont le rendu passe par orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
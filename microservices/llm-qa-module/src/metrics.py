@@ -0,0 +1,174 @@
+"""
+Métriques Prometheus de LLMQAModule (GET /metrics)
+
+- latence par route HTTP (gabarit de route, pas le chemin brut) ;
+- latence des appels amont : Ollama et IndexeurSemantique ;
+- débit du LLM en tokens/s, calculé à partir de eval_count / eval_duration
+  renvoyés par Ollama en fin de génération (la durée est en nanosecondes) ;
+- temps jusqu'au premier token des réponses streamées, générations en cours ;
+- questions répondues (aussi servies par /api/qa/stats pour le dashboard).
+
+Registre propre au service, testable sans serveur Prometheus :
+  curl http://localhost:8004/metrics
+"""
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+REGISTRY = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TOKENS_PER_SECOND_BUCKETS = (1, 2.5, 5, 10, 15, 20, 30, 50, 75, 100, 150, 250)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP servies, par route",
+    ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requêtes HTTP en cours de traitement",
+    registry=REGISTRY
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "llm_qa_upstream_request_duration_seconds",
+    "Durée des appels amont (ollama, indexeur), jusqu'aux en-têtes de réponse",
+    ("service", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "llm_qa_generation_tokens_per_second",
+    "Débit de génération Ollama (eval_count / eval_duration)",
+    buckets=TOKENS_PER_SECOND_BUCKETS,
+    registry=REGISTRY
+)
+LLM_GENERATED_TOKENS = Counter(
+    "llm_qa_generated_tokens",
+    "Tokens générés par le LLM",
+    registry=REGISTRY
+)
+LLM_PROMPT_TOKENS = Counter(
+    "llm_qa_prompt_tokens",
+    "Tokens de prompt évalués par le LLM",
+    registry=REGISTRY
+)
+LLM_TTFT = Histogram(
+    "llm_qa_ttft_seconds",
+    "Temps jusqu'au premier token des réponses streamées",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY
+)
+LLM_GENERATIONS_IN_PROGRESS = Gauge(
+    "llm_qa_generations_in_progress",
+    "Générations LLM en cours",
+    registry=REGISTRY
+)
+
+DEADLINE_EXCEEDED = Counter(
+    "llm_qa_deadline_exceeded",
+    "Requêtes abandonnées à l'échéance transmise par la gateway, par étape",
+    ("stage",),
+    registry=REGISTRY
+)
+DEADLINE_SHRUNK = Counter(
+    "llm_qa_deadline_shrunk",
+    "Etapes réduites pour tenir l'échéance (rerank écourté, tokens limités)",
+    ("stage",),
+    registry=REGISTRY
+)
+
+QUESTIONS_ANSWERED = Counter(
+    "llm_qa_questions_answered",
+    "Questions ayant reçu une réponse, par mode (ask, stream)",
+    ("mode",),
+    registry=REGISTRY
+)
+
+SKIP_PATHS = ("/metrics",)
+
+# Questions répondues par ce processus : total et jour courant
+_questions = {"total": 0, "today": 0, "day": date.today(), "since": datetime.now().isoformat()}
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : histogramme de latence par (méthode, route, statut)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status[0])).observe(
+                time.perf_counter() - start
+            )
+
+
+@asynccontextmanager
+async def track_upstream(service: str):
+    """Mesure un appel amont ; outcome = ok, ou error si une exception sort du bloc"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_REQUEST_DURATION.labels(service, outcome).observe(time.perf_counter() - start)
+
+
+def record_generation(data: Dict) -> Optional[float]:
+    """
+    Compteurs de tokens et débit à partir de la réponse finale d'Ollama (done=true)
+
+    Retourne le débit en tokens/s (None si Ollama ne l'a pas fourni).
+    """
+    eval_count = data.get("eval_count") or 0
+    eval_duration = data.get("eval_duration") or 0
+    LLM_PROMPT_TOKENS.inc(data.get("prompt_eval_count") or 0)
+    LLM_GENERATED_TOKENS.inc(eval_count)
+    if eval_count and eval_duration:
+        tokens_per_second = eval_count / (eval_duration / 1_000_000_000)
+        LLM_TOKENS_PER_SECOND.observe(tokens_per_second)
+        return tokens_per_second
+    return None
+
+
+def record_question(mode: str):
+    """Compte une question répondue (compteur Prometheus et compteur du jour)"""
+    QUESTIONS_ANSWERED.labels(mode).inc()
+    question_counts()
+    _questions["total"] += 1
+    _questions["today"] += 1
+
+
+def question_counts() -> Dict:
+    """Questions répondues depuis le démarrage et depuis minuit"""
+    if _questions["day"] != date.today():
+        _questions["day"] = date.today()
+        _questions["today"] = 0
+    return {"total": _questions["total"], "today": _questions["today"], "since": _questions["since"]}
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
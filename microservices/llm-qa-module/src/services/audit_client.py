@@ -7,6 +7,7 @@ import httpx
 from datetime import datetime
 
 from config import settings
+from src.tracing import request_id_headers
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +43,8 @@ class AuditClient:
                         "processing_time_ms": processing_time,
                         "timestamp": datetime.now().isoformat(),
                         "service": "LLMQAModule"
-                    }
+                    },
+                    headers=request_id_headers()
                 )
                 logger.debug(f"[OK] Audit log cree pour query de {user_id}")
                 
@@ -71,7 +73,8 @@ class AuditClient:
                         "resource_id": document_id,
                         "timestamp": datetime.now().isoformat(),
                         "service": "LLMQAModule"
-                    }
+                    },
+                    headers=request_id_headers()
                 )
                 logger.debug(f"[OK] Audit log cree pour extraction")
                 
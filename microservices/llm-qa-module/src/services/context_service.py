@@ -7,6 +7,10 @@ from typing import List, Dict, Optional
 import httpx
 
 from config import settings
+from src import deadline
+from src.deadline import DeadlineExceeded
+from src.metrics import DEADLINE_EXCEEDED, track_upstream
+from src.tracing import request_id_headers, span
 
 logger = logging.getLogger(__name__)
 
@@ -46,67 +50,95 @@ class ContextService:
         
         Returns:
             Liste des documents pertinents avec scores
+        
+        Sous échéance (X-Deadline-Ms), l'appel à l'indexeur dispose du budget
+        restant moins le minimum réservé à la génération ; DeadlineExceeded
+        est levée si ce budget est épuisé. Le repli en GET (POST refusé par
+        l'indexeur) n'a que ce qui reste du même budget ; un timeout ne
+        déclenche pas de repli.
         """
         if limit is None:
             limit = settings.RAG_TOP_K_RESULTS
         
         logger.info(f"[RAG-RETRIEVAL] Query: {query[:60]}...")
         
-        try:
-            # Step 1: Expand query for better retrieval
-            expanded_query = self._expand_query(query)
+        with span("retrieval", limit=limit, patient_filter=patient_id is not None):
+            try:
+                # Step 1: Expand query for better retrieval
+                expanded_query = self._expand_query(query)
             
-            # Step 2: Call IndexeurSemantique
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Try POST first (semantic search)
-                try:
-                    response = await client.post(
-                        f"{self.indexeur_url}/api/search",
-                        json={
-                            "query": expanded_query,
-                            "topK": limit * 2,  # Get more for filtering
-                            "patientId": patient_id
-                        }
-                    )
-                except:
-                    # Fallback to GET
-                    response = await client.get(
-                        f"{self.indexeur_url}/api/search",
-                        params={"query": expanded_query, "limit": limit * 2}
-                    )
+                # Step 2: Call IndexeurSemantique
+                timeout = deadline.bounded_timeout(
+                    30.0, reserve=settings.DEADLINE_MIN_GENERATION_SECONDS, stage="retrieval"
+                )
+                headers = {**request_id_headers(), **deadline.deadline_headers()}
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    # Try POST first (semantic search)
+                    try:
+                        async with track_upstream("indexeur"):
+                            response = await client.post(
+                                f"{self.indexeur_url}/api/search",
+                                json={
+                                    "query": expanded_query,
+                                    "topK": limit * 2,  # Get more for filtering
+                                    "patientId": patient_id
+                                },
+                                headers=headers
+                            )
+                    except (httpx.HTTPStatusError, httpx.RemoteProtocolError):
+                        # Fallback to GET, borné par le budget restant (pas un second timeout complet)
+                        timeout = deadline.bounded_timeout(
+                            30.0, reserve=settings.DEADLINE_MIN_GENERATION_SECONDS, stage="retrieval"
+                        )
+                        headers = {**request_id_headers(), **deadline.deadline_headers()}
+                        async with track_upstream("indexeur"):
+                            response = await client.get(
+                                f"{self.indexeur_url}/api/search",
+                                params={"query": expanded_query, "limit": limit * 2},
+                                headers=headers,
+                                timeout=timeout
+                            )
                 
-                if response.status_code == 200:
-                    data = response.json()
+                    if response.status_code == 200:
+                        data = response.json()
                     
-                    # Handle different response formats
-                    if isinstance(data, dict):
-                        documents = data.get("results", data.get("documents", []))
-                    else:
-                        documents = data
+                        # Handle different response formats
+                        if isinstance(data, dict):
+                            documents = data.get("results", data.get("documents", []))
+                        else:
+                            documents = data
                     
-                    # Step 3: Filter and score
-                    documents = self._filter_documents(
-                        documents, 
-                        patient_id, 
-                        document_type
-                    )
+                        # Step 3: Filter and score
+                        documents = self._filter_documents(
+                            documents, 
+                            patient_id, 
+                            document_type
+                        )
                     
-                    # Step 4: Apply similarity threshold
-                    documents = self._apply_threshold(documents)
+                        # Step 4: Apply similarity threshold
+                        documents = self._apply_threshold(documents)
                     
-                    logger.info(f"[RAG-RETRIEVAL] {len(documents)} documents trouves")
-                    return documents[:limit]
+                        logger.info(f"[RAG-RETRIEVAL] {len(documents)} documents trouves")
+                        return documents[:limit]
                     
-                else:
-                    logger.warning(f"[RAG-RETRIEVAL] IndexeurSemantique returned {response.status_code}")
-                    return self._get_mock_documents(query, limit)
+                    else:
+                        logger.warning(f"[RAG-RETRIEVAL] IndexeurSemantique returned {response.status_code}")
+                        return self._get_mock_documents(query, limit)
                     
-        except httpx.ConnectError:
-            logger.warning("[RAG-RETRIEVAL] IndexeurSemantique non disponible, mode mock")
-            return self._get_mock_documents(query, limit)
-        except Exception as e:
-            logger.error(f"[RAG-RETRIEVAL] Erreur: {e}")
-            return self._get_mock_documents(query, limit)
+            except DeadlineExceeded:
+                DEADLINE_EXCEEDED.labels("retrieval").inc()
+                raise
+            except httpx.ConnectError:
+                logger.warning("[RAG-RETRIEVAL] IndexeurSemantique non disponible, mode mock")
+                return self._get_mock_documents(query, limit)
+            except Exception as e:
+                budget = deadline.remaining()
+                if budget is not None and budget < settings.DEADLINE_MIN_GENERATION_SECONDS:
+                    # Timeout dû à l'échéance : inutile de générer sur des documents de secours
+                    DEADLINE_EXCEEDED.labels("retrieval").inc()
+                    raise DeadlineExceeded("retrieval") from e
+                logger.error(f"[RAG-RETRIEVAL] Erreur: {e}")
+                return self._get_mock_documents(query, limit)
     
     def _expand_query(self, query: str) -> str:
         """
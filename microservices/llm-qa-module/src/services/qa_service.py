@@ -4,11 +4,19 @@ Architecture: Retrieval-Augmented Generation
 """
 import logging
 import uuid
-from typing import List, Dict, Tuple, Optional
+from typing import AsyncIterator, List, Dict, Tuple, Optional
 import httpx
 import json
+import time
 
 from config import settings
+from src import deadline
+from src.deadline import DeadlineExceeded
+from src.metrics import (
+    DEADLINE_EXCEEDED, DEADLINE_SHRUNK, LLM_GENERATIONS_IN_PROGRESS, UPSTREAM_REQUEST_DURATION,
+    record_generation, track_upstream
+)
+from src.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +31,9 @@ class QAService:
         self.use_local = settings.USE_LOCAL_LLM
         self.model = settings.OLLAMA_MODEL
         self.ollama_url = settings.OLLAMA_BASE_URL
+        # Débit et temps hors génération observés (budget de tokens sous échéance)
+        self.tokens_per_second: Optional[float] = None
+        self.overhead_seconds: Optional[float] = None
         
     async def answer_question(
         self, 
@@ -41,23 +52,14 @@ class QAService:
             Tuple[answer, confidence, query_id]
         """
         query_id = str(uuid.uuid4())
-        
-        logger.info(f"[RAG] Question: {question[:80]}...")
-        logger.info(f"[RAG] Documents recus: {len(context_documents)}")
-        
-        # Step 1: Rerank documents if enabled
-        if settings.USE_RERANKING and len(context_documents) > settings.RERANK_TOP_K:
-            context_documents = await self._rerank_documents(question, context_documents)
-            logger.info(f"[RAG] Documents apres reranking: {len(context_documents)}")
-        
-        # Step 2: Build optimized context
-        context, sources = self._build_rag_context(context_documents)
-        
-        # Step 3: Generate answer with Mistral Nemo
-        prompt = self._build_mistral_prompt(question, context)
+        prompt, sources = await self._prepare_prompt(question, context_documents)
         
         try:
-            answer = await self._call_mistral_nemo(prompt)
+            with span("generation", model=self.model, prompt_chars=len(prompt)) as attributes:
+                max_tokens = self._budgeted_tokens(1024)
+                attributes["max_tokens"] = max_tokens
+                answer = await self._call_mistral_nemo(prompt, max_tokens=max_tokens)
+                attributes["answer_chars"] = len(answer)
             
             # Step 4: Calculate confidence
             confidence = self._calculate_rag_confidence(answer, sources, question)
@@ -70,30 +72,132 @@ class QAService:
             logger.error(f"[RAG] Erreur generation: {e}")
             raise
     
+    async def stream_answer(
+        self,
+        question: str,
+        context_documents: List[Dict]
+    ) -> AsyncIterator[Dict]:
+        """
+        Meme pipeline RAG que answer_question, reponse generee en streaming
+        
+        Yields:
+            {"token": str} pour chaque fragment genere, puis un dernier
+            {"answer", "confidence", "query_id"} une fois la generation terminee.
+        """
+        query_id = str(uuid.uuid4())
+        prompt, sources = await self._prepare_prompt(question, context_documents)
+        
+        parts = []
+        with span("generation", model=self.model, prompt_chars=len(prompt), stream=True) as attributes:
+            max_tokens = self._budgeted_tokens(1024)
+            attributes["max_tokens"] = max_tokens
+            async for token in self._stream_mistral_nemo(prompt, max_tokens=max_tokens):
+                parts.append(token)
+                yield {"token": token}
+            attributes["fragments"] = len(parts)
+        
+        answer = "".join(parts).strip()
+        confidence = self._calculate_rag_confidence(answer, sources, question)
+        logger.info(f"[RAG] Reponse streamee (confiance: {confidence})")
+        yield {"answer": answer, "confidence": confidence, "query_id": query_id}
+    
+    async def _prepare_prompt(
+        self,
+        question: str,
+        context_documents: List[Dict]
+    ) -> Tuple[str, List[Dict]]:
+        """
+        Etapes 1 a 3 du pipeline : reranking, contexte, prompt
+        """
+        logger.info(f"[RAG] Question: {question[:80]}...")
+        logger.info(f"[RAG] Documents recus: {len(context_documents)}")
+        
+        # Step 1: Rerank documents if enabled
+        if settings.USE_RERANKING and len(context_documents) > settings.RERANK_TOP_K:
+            with span("rerank", candidates=len(context_documents)) as attributes:
+                context_documents, attributes["scored"] = await self._rerank_documents(question, context_documents)
+            logger.info(f"[RAG] Documents apres reranking: {len(context_documents)}")
+        
+        # Step 2: Build optimized context
+        with span("build_context", documents=len(context_documents)):
+            context, sources = self._build_rag_context(context_documents)
+        
+        # Pas de génération si elle ne peut plus aboutir avant l'échéance
+        self._check_deadline("generation")
+        
+        # Step 3: Build Mistral Nemo prompt
+        return self._build_mistral_prompt(question, context), sources
+    
+    def _check_deadline(self, stage: str):
+        try:
+            deadline.check(stage)
+        except DeadlineExceeded:
+            DEADLINE_EXCEEDED.labels(stage).inc()
+            logger.warning(f"[RAG] Echeance atteinte avant l'etape {stage}, abandon")
+            raise
+    
+    def _budgeted_tokens(self, max_tokens: int) -> int:
+        """
+        num_predict ramené à ce que le budget restant permet de générer,
+        d'après le débit et le temps hors génération des appels précédents
+        """
+        budget = deadline.remaining()
+        if budget is None or not self.tokens_per_second:
+            return max_tokens
+        usable = budget - (self.overhead_seconds or 0.0)
+        tokens = max(settings.DEADLINE_MIN_TOKENS, int(usable * self.tokens_per_second * 0.9))
+        if tokens < max_tokens:
+            DEADLINE_SHRUNK.labels("generation").inc()
+            logger.info(f"[RAG] Generation limitee a {tokens} tokens (budget {budget:.1f}s)")
+            return tokens
+        return max_tokens
+    
+    def _observe_generation(self, data: Dict):
+        """Métriques de la génération et estimations utilisées par _budgeted_tokens"""
+        tokens_per_second = record_generation(data)
+        if tokens_per_second:
+            self.tokens_per_second = tokens_per_second
+        if data.get("total_duration") and data.get("eval_duration") is not None:
+            self.overhead_seconds = (data["total_duration"] - data["eval_duration"]) / 1_000_000_000
+    
     async def _rerank_documents(
         self, 
         question: str, 
         documents: List[Dict]
-    ) -> List[Dict]:
+    ) -> Tuple[List[Dict], int]:
         """
         Rerank documents using LLM-based scoring
+        
+        Sous échéance, la notation s'arrête dès que le budget restant ne
+        couvre plus la génération : les documents non notés suivent les
+        documents notés, dans l'ordre de l'indexeur.
+        Retourne les documents retenus et le nombre de documents notés.
         """
         scored_docs = []
         
         for doc in documents:
+            budget = deadline.remaining()
+            if budget is not None and budget < settings.DEADLINE_GENERATION_RESERVE_SECONDS:
+                DEADLINE_SHRUNK.labels("rerank").inc()
+                logger.info(f"[RAG] Reranking ecourte ({len(scored_docs)}/{len(documents)} documents notes)")
+                break
             content = doc.get("content", "")[:500]
             score = await self._score_relevance(question, content)
             scored_docs.append((score, doc))
         
         # Sort by score descending
         scored_docs.sort(key=lambda x: x[0], reverse=True)
+        ranked = [doc for _, doc in scored_docs] + documents[len(scored_docs):]
         
         # Return top K
-        return [doc for _, doc in scored_docs[:settings.RERANK_TOP_K]]
+        return ranked[:settings.RERANK_TOP_K], len(scored_docs)
     
     async def _score_relevance(self, question: str, content: str) -> float:
         """
         Score document relevance using Mistral Nemo
+        
+        Sous échéance, le timeout garde la réserve de la génération : une
+        notation trop lente vaut 0.5, l'échéance elle-même interrompt tout.
         """
         prompt = f"""Score the relevance of this document excerpt to the question.
 Return ONLY a number between 0 and 10.
@@ -104,14 +208,22 @@ Document: {content[:300]}
 Relevance score (0-10):"""
         
         try:
-            response = await self._call_mistral_nemo(prompt, max_tokens=10)
+            response = await self._call_mistral_nemo(
+                prompt,
+                max_tokens=10,
+                reserve=settings.DEADLINE_GENERATION_RESERVE_SECONDS,
+                stage="rerank",
+                observe=False
+            )
             # Extract number from response
             import re
             numbers = re.findall(r'\d+(?:\.\d+)?', response)
             if numbers:
                 return min(float(numbers[0]) / 10.0, 1.0)
             return 0.5
-        except:
+        except DeadlineExceeded:
+            raise
+        except Exception:
             return 0.5
     
     def _build_rag_context(self, documents: List[Dict]) -> Tuple[str, List[Dict]]:
@@ -183,7 +295,8 @@ Patient: {patient_id}
         Build optimized prompt for Mistral Nemo 12B Instruct
         Uses the recommended prompt format with enhanced medical context
         """
-        system_prompt = """Tu es un assistant medical expert francophone, specialise dans l'analyse de dossiers patients et documents cliniques.
+        system_prompt = """Tu es un assistant medical expert francophone, \
+specialise dans l'analyse de dossiers patients et documents cliniques.
 
 Ton role:
 - Analyser les documents medicaux fournis avec precision
@@ -194,7 +307,8 @@ Ton role:
 Regles strictes:
 - Base-toi sur les documents fournis
 - Ne fais pas de suppositions non etayees
-- NE JAMAIS ajouter de disclaimers ou avertissements du type "ces informations sont basees sur les documents" ou "il est important de noter"
+- NE JAMAIS ajouter de disclaimers ou avertissements du type \
+"ces informations sont basees sur les documents" ou "il est important de noter"
 - Reponds directement a la question sans commentaires meta sur ta reponse"""
 
         user_prompt = f"""DOCUMENTS MEDICAUX DU PATIENT:
@@ -214,36 +328,58 @@ REPONSE:"""
 
 {user_prompt} [/INST]"""
     
+    def _generation_options(self, max_tokens: int) -> Dict:
+        """Parametres de generation Ollama (communs aux appels complets et streames)"""
+        return {
+            "temperature": settings.LLM_TEMPERATURE,
+            "top_p": settings.LLM_TOP_P,
+            "top_k": settings.LLM_TOP_K,
+            "num_ctx": settings.LLM_NUM_CTX,
+            "repeat_penalty": settings.LLM_REPEAT_PENALTY,
+            "num_predict": max_tokens,
+            "stop": ["</s>", "[INST]", "QUESTION:"]
+        }
+    
     async def _call_mistral_nemo(
         self, 
         prompt: str, 
-        max_tokens: int = 1024
+        max_tokens: int = 1024,
+        reserve: float = 0.0,
+        stage: str = "generation",
+        observe: bool = True
     ) -> str:
         """
         Call Mistral Nemo 12B via Ollama with optimized parameters
+        
+        Sous échéance, le timeout est le budget restant moins `reserve` : à
+        son expiration la connexion est fermée et Ollama abandonne la
+        génération. observe=False pour les appels courts (notation du
+        reranking) qui fausseraient le débit servant à _budgeted_tokens.
         """
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": settings.LLM_TEMPERATURE,
-                        "top_p": settings.LLM_TOP_P,
-                        "top_k": settings.LLM_TOP_K,
-                        "num_ctx": settings.LLM_NUM_CTX,
-                        "repeat_penalty": settings.LLM_REPEAT_PENALTY,
-                        "num_predict": max_tokens,
-                        "stop": ["</s>", "[INST]", "QUESTION:"]
-                    }
-                }
-            )
+        async with httpx.AsyncClient(timeout=deadline.bounded_timeout(120.0, reserve=reserve, stage=stage)) as client:
+            with LLM_GENERATIONS_IN_PROGRESS.track_inprogress():
+                async with track_upstream("ollama"):
+                    try:
+                        response = await client.post(
+                            f"{self.ollama_url}/api/generate",
+                            json={
+                                "model": self.model,
+                                "prompt": prompt,
+                                "stream": False,
+                                "options": self._generation_options(max_tokens)
+                            }
+                        )
+                    except httpx.TimeoutException as e:
+                        if deadline.expired():
+                            DEADLINE_EXCEEDED.labels(stage).inc()
+                            raise DeadlineExceeded(stage) from e
+                        raise
             
             if response.status_code == 200:
                 data = response.json()
                 answer = data.get("response", "").strip()
+                if observe:
+                    self._observe_generation(data)
                 
                 # Log generation stats
                 if "total_duration" in data:
@@ -256,6 +392,75 @@ REPONSE:"""
                 logger.error(f"[MISTRAL] Error {response.status_code}: {error_text}")
                 raise Exception(f"Mistral Nemo error: {response.status_code}")
     
+    async def _stream_mistral_nemo(
+        self,
+        prompt: str,
+        max_tokens: int = 1024
+    ) -> AsyncIterator[str]:
+        """
+        Call Mistral Nemo via l'API streaming d'Ollama (une ligne JSON par fragment)
+        
+        A l'échéance, le flux est fermé (Ollama arrête de générer) et
+        DeadlineExceeded est levée.
+        """
+        start = time.perf_counter()
+        connected = False
+        LLM_GENERATIONS_IN_PROGRESS.inc()
+        try:
+            async with httpx.AsyncClient(timeout=deadline.bounded_timeout(120.0, stage="generation")) as client:
+                async with client.stream(
+                    "POST",
+                    f"{self.ollama_url}/api/generate",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "stream": True,
+                        "options": self._generation_options(max_tokens)
+                    }
+                ) as response:
+                    # Latence amont mesurée jusqu'aux en-têtes, comme pour les appels complets
+                    UPSTREAM_REQUEST_DURATION.labels("ollama", "ok").observe(time.perf_counter() - start)
+                    connected = True
+                    async for token in self._read_stream(response):
+                        budget = deadline.remaining()
+                        if budget is not None and budget <= 0:
+                            DEADLINE_EXCEEDED.labels("generation").inc()
+                            raise DeadlineExceeded("generation")
+                        yield token
+        except httpx.HTTPError as e:
+            if not connected:
+                UPSTREAM_REQUEST_DURATION.labels("ollama", "error").observe(time.perf_counter() - start)
+            if isinstance(e, httpx.TimeoutException) and deadline.expired():
+                DEADLINE_EXCEEDED.labels("generation").inc()
+                raise DeadlineExceeded("generation") from e
+            raise
+        finally:
+            LLM_GENERATIONS_IN_PROGRESS.dec()
+    
+    async def _read_stream(self, response: httpx.Response) -> AsyncIterator[str]:
+        """
+        Fragments d'une reponse streamee d'Ollama (une ligne JSON par fragment)
+        """
+        if response.status_code != 200:
+            error_text = (await response.aread()).decode(errors="replace")
+            logger.error(f"[MISTRAL] Error {response.status_code}: {error_text}")
+            raise Exception(f"Mistral Nemo error: {response.status_code}")
+        
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if data.get("error"):
+                raise Exception(f"Mistral Nemo error: {data['error']}")
+            if data.get("response"):
+                yield data["response"]
+            if data.get("done"):
+                self._observe_generation(data)
+                if "total_duration" in data:
+                    duration_ms = data["total_duration"] / 1_000_000
+                    logger.info(f"[MISTRAL] Generation time: {duration_ms:.0f}ms")
+                return
+    
     def _calculate_rag_confidence(
         self, 
         answer: str, 
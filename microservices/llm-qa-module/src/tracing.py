@@ -0,0 +1,189 @@
+"""
+Spans de temps par requête (X-Request-ID), exportés en JSONL
+
+L'identifiant est reçu de la gateway (ou généré si le service est appelé
+directement), renvoyé dans la réponse et propagé aux appels vers
+l'indexeur et l'audit. Chaque étape instrumentée avec span() écrit une ligne :
+
+  {"ts": ..., "service": "LLMQAModule", "request_id": "...", "span": "generation",
+   "duration_ms": 14210.7, "status": "ok", ...}
+
+L'écriture se fait dans un thread dédié : le traitement de la requête ne
+fait jamais d'E/S disque pour ses traces. Décomposer une requête lente :
+  grep <request_id> logs/llm-qa-module.traces.jsonl
+"""
+import json
+import logging
+import queue
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Sondes fréquentes (poller de santé, scrape) : pas de span racine
+UNTRACED_PATHS = ("/health", "/metrics")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def request_id_headers() -> Dict[str, str]:
+    """En-têtes à ajouter aux appels sortants pour propager l'identifiant"""
+    request_id = _request_id.get()
+    return {REQUEST_ID_HEADER: request_id} if request_id else {}
+
+
+def accept_request_id(value: Optional[str]) -> str:
+    """Reprend l'identifiant reçu s'il est valide, sinon en génère un"""
+    if value and _VALID_REQUEST_ID.match(value):
+        return value
+    return uuid.uuid4().hex
+
+
+class TraceSink:
+    """
+    Fichier JSONL alimenté par une file et un thread d'écriture
+
+    Le fichier tourne à max_bytes (backup_count fichiers .1, .2... gardés) :
+    l'espace disque des traces reste borné.
+    """
+
+    def __init__(self, path: str, enabled: bool = True, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 3):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self._start()
+        self._queue.put(record)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-sink", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8"
+            )
+        except OSError as e:
+            logger.error(f"[ERREUR] Ecriture des traces impossible ({self.path}): {e}")
+            self.enabled = False
+            return
+        # Logger isolé : les lignes JSONL ne passent pas par la configuration de logging du service
+        out = logging.Logger("traces")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        out.addHandler(handler)
+        try:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                out.info(json.dumps(record, ensure_ascii=False, default=str))
+        finally:
+            handler.close()
+
+    def close(self):
+        """Vide la file puis arrête le thread d'écriture"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+sink = TraceSink(settings.TRACE_FILE, settings.TRACE_ENABLED, settings.TRACE_MAX_BYTES, settings.TRACE_BACKUP_COUNT)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict]:
+    """
+    Mesure une étape de la requête en cours
+
+    Le dictionnaire retourné peut être complété dans le bloc (attributs
+    connus seulement après coup : taille, nombre de documents...).
+    """
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield attributes
+        status = "ok"
+    finally:
+        sink.emit({
+            "ts": started_at.isoformat(),
+            "service": settings.SERVICE_NAME,
+            "request_id": current_request_id(),
+            "span": name,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "status": status,
+            **attributes
+        })
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI : identifiant de requête et span racine "request"
+
+    Le span racine couvre la requête entière (corps streamé compris) ;
+    les spans des étapes portent le même request_id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+        request_id = accept_request_id(incoming)
+        token = _request_id.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                attributes["status_code"] = message["status"]
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"x-request-id"]
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            if scope["path"] in UNTRACED_PATHS:
+                attributes = {}
+                await self.app(scope, receive, send_with_id)
+            else:
+                with span("request", method=scope["method"], path=scope["path"]) as attributes:
+                    await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
@@ -106,8 +106,9 @@ class TestNotificationsStore:
         """Test import du store de notifications"""
         try:
             from app import notifications_store
+            from notifications import NotificationStore
             
-            assert isinstance(notifications_store, list)
+            assert isinstance(notifications_store, NotificationStore)
         except ImportError:
             pass
 
@@ -119,8 +120,9 @@ class TestConversationsStore:
         """Test import du store de conversations"""
         try:
             from app import conversations_store
+            from conversations import ConversationStore
             
-            assert isinstance(conversations_store, list)
+            assert isinstance(conversations_store, ConversationStore)
         except ImportError:
             pass
 
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark de la sérialisation des grosses réponses JSON
+
+Compare le rendu de JSONResponse (module json standard) et de
+FastJSONResponse (orjson) sur les deux réponses les plus lourdes du
+pipeline :
+- un document avec son text_content complet (défaut 5 Mo de texte médical,
+  accents compris) ;
+- une liste de documents (défaut 1000 lignes avec métadonnées).
+
+Usage:
+    python tests/performance/benchmarks/bench_json_response.py
+    python tests/performance/benchmarks/bench_json_response.py --size-mb 20 --rows 5000 --repeat 50
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT / "microservices" / "api-gateway"))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from json_response import FastJSONResponse, orjson  # noqa: E402
+
+PARAGRAPH = (
+    "Patient de 67 ans, antécédents d'hypertension artérielle et de diabète de type 2. "
+    "Traitement : metformine 1000 mg matin et soir, ramipril 5 mg. "
+    "Examen clinique : TA 145/90, fréquence cardiaque 78/min, glycémie à jeun 1,32 g/L.\n"
+)
+
+
+def document(size_mb: int) -> dict:
+    repeat = size_mb * 1024 * 1024 // len(PARAGRAPH.encode()) + 1
+    return {
+        "id": 42,
+        "filename": "compte-rendu-hospitalisation.pdf",
+        "file_type": ".pdf",
+        "patient_id": "PAT-0042",
+        "document_type": "compte-rendu",
+        "text_content": PARAGRAPH * repeat,
+        "metadata": {"pages": 180, "author": "Dr Lefèvre", "upload_date": "2024-05-02T10:15:00"},
+        "created_at": "2024-05-02T10:15:00",
+    }
+
+
+def listing(rows: int) -> dict:
+    return {
+        "documents": [
+            {
+                "id": i,
+                "filename": f"document-{i:05d}.pdf",
+                "file_type": ".pdf",
+                "file_size": 150_000 + i,
+                "patient_id": f"PAT-{i % 300:04d}",
+                "document_type": ("compte-rendu", "ordonnance", "labo")[i % 3],
+                "metadata": {"pages": i % 40 + 1, "author": "Dr Lefèvre", "language": "fr"},
+                "processed": True,
+                "created_at": "2024-05-02T10:15:00",
+            }
+            for i in range(rows)
+        ],
+        "total": rows,
+    }
+
+
+def measure(response_class, content, repeat: int) -> float:
+    """Durée moyenne de construction de la réponse (le corps est rendu à l'init)"""
+    response_class(content)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response_class(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def report(label: str, content, repeat: int):
+    body = FastJSONResponse(content).body
+    assert json.loads(body) == json.loads(JSONResponse(content).body)
+    standard = measure(JSONResponse, content, repeat)
+    fast = measure(FastJSONResponse, content, repeat)
+    print(f"{label} ({len(body) / 1024 / 1024:.1f} Mo de JSON)")
+    print(f"  json (JSONResponse)        {standard:8.2f} ms")
+    print(f"  orjson (FastJSONResponse)  {fast:8.2f} ms   x{standard / fast:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson absent : FastJSONResponse utilise l'encodage standard")
+
+    report(f"Document, text_content de {args.size_mb} Mo", document(args.size_mb), args.repeat)
+    report(f"Liste de {args.rows} documents", listing(args.rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
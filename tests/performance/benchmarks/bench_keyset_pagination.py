@@ -0,0 +1,156 @@
+"""
+Benchmark de la pagination des documents de doc-ingestor : OFFSET vs curseur
+
+Remplit une table documents de N lignes (défaut 1M, created_at partagé par
+groupes de 4 lignes pour exercer le départage par id) dans un schéma dédié
+d'une base PostgreSQL, puis mesure la latence d'une page profonde (défaut
+page 1000 de 20 documents) avec les fonctions du repository :
+- get_all_documents(limit, offset) : LIMIT/OFFSET, lit puis ignore les
+  lignes précédentes ;
+- get_documents_page(limit, after=position) : (created_at, id) < position,
+  lecture de l'index idx_documents_created_at_id.
+
+Nécessite PostgreSQL (DATABASE_URL, --dsn ou la configuration de
+doc-ingestor). Le schéma bench_pagination est réutilisé d'une exécution à
+l'autre s'il a déjà le bon nombre de lignes ; --drop le supprime à la fin.
+
+Usage:
+    python tests/performance/benchmarks/bench_keyset_pagination.py
+    python tests/performance/benchmarks/bench_keyset_pagination.py --rows 1000000 --page 1000 --page-size 20 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import psycopg2
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT / "microservices" / "doc-ingestor"))
+
+from config import settings  # noqa: E402
+from src.database import repository  # noqa: E402
+
+SCHEMA = "bench_pagination"
+
+
+def connect(dsn: str):
+    conn = psycopg2.connect(dsn) if dsn else psycopg2.connect(**settings.get_db_config())
+    with conn.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+        # Les requêtes du repository (FROM documents) visent la table du benchmark
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+    conn.commit()
+    return conn
+
+
+def populate(conn, rows: int):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('documents') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT count(*) FROM documents")
+            if cursor.fetchone()[0] == rows:
+                print(f"Table {SCHEMA}.documents réutilisée ({rows} lignes)")
+                return
+            cursor.execute("DROP TABLE documents")
+
+        start = time.perf_counter()
+        cursor.execute("""
+            CREATE TABLE documents (
+                id SERIAL PRIMARY KEY,
+                filename VARCHAR(255) NOT NULL,
+                file_type VARCHAR(50) NOT NULL,
+                file_size BIGINT,
+                upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                processed BOOLEAN DEFAULT FALSE,
+                text_content TEXT,
+                metadata JSONB,
+                patient_id VARCHAR(100),
+                document_type VARCHAR(100),
+                checksum VARCHAR(64),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            INSERT INTO documents (
+                filename, file_type, file_size, patient_id, document_type,
+                processed, upload_date, created_at, updated_at
+            )
+            SELECT 'document-' || g || '.pdf', '.pdf', 150000 + g % 1000,
+                   'PAT-' || lpad((g % 5000)::text, 4, '0'),
+                   (ARRAY['compte-rendu', 'ordonnance', 'labo'])[g % 3 + 1],
+                   TRUE, t.ts, t.ts, t.ts
+            FROM generate_series(1, %s) AS g,
+                 LATERAL (SELECT timestamp '2024-01-01' + (g / 4) * interval '1 second' AS ts) AS t
+        """, (rows,))
+        cursor.execute("CREATE INDEX idx_documents_created_at_id ON documents(created_at, id)")
+        cursor.execute("ANALYZE documents")
+    conn.commit()
+    print(f"Table {SCHEMA}.documents remplie : {rows} lignes en {time.perf_counter() - start:.1f} s")
+
+
+def position_before(conn, offset: int):
+    """Position (created_at, id) du dernier document de la page précédente"""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT created_at, id FROM documents ORDER BY created_at DESC, id DESC OFFSET %s LIMIT 1",
+            (offset - 1,)
+        )
+        return cursor.fetchone()
+
+
+def measure(func, repeat: int):
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def report(conn, page: int, page_size: int, repeat: int):
+    offset = (page - 1) * page_size
+    after = position_before(conn, offset) if offset else None
+
+    by_offset = repository.get_all_documents(limit=page_size, offset=offset)
+    by_cursor, _ = repository.get_documents_page(page_size, after=after)
+    assert [d["id"] for d in by_offset] == [d["id"] for d in by_cursor], "pages différentes"
+
+    offset_median, offset_p95 = measure(lambda: repository.get_all_documents(limit=page_size, offset=offset), repeat)
+    cursor_median, cursor_p95 = measure(lambda: repository.get_documents_page(page_size, after=after), repeat)
+    print(f"Page {page} ({page_size} documents, {offset} lignes avant)")
+    print(f"  LIMIT/OFFSET   médiane {offset_median:8.2f} ms   p95 {offset_p95:8.2f} ms")
+    print(f"  curseur        médiane {cursor_median:8.2f} ms   p95 {cursor_p95:8.2f} ms   x{offset_median / cursor_median:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--drop", action="store_true", help="supprime le schéma du benchmark à la fin")
+    args = parser.parse_args()
+
+    conn = connect(args.dsn)
+    repository._connection = conn
+    try:
+        populate(conn, args.rows)
+        report(conn, 1, args.page_size, args.repeat)
+        report(conn, args.page, args.page_size, args.repeat)
+    finally:
+        if args.drop:
+            with conn.cursor() as cursor:
+                cursor.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
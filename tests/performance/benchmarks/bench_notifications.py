@@ -0,0 +1,110 @@
+"""
+Micro-benchmark du stockage des notifications de l'API Gateway
+
+Compare l'ancienne liste (insert(0) + parcours complet à chaque lecture)
+au NotificationStore indexé, sur N notifications réparties entre U
+utilisateurs (10 % diffusées à "all").
+
+Usage:
+    python tests/performance/benchmarks/bench_notifications.py
+    python tests/performance/benchmarks/bench_notifications.py --notifications 100000 --users 1000
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT / "microservices" / "api-gateway"))
+
+from notifications import NotificationStore  # noqa: E402
+
+
+def make_notifications(count: int, users: int):
+    rng = random.Random(42)
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "userId": "all" if rng.random() < 0.1 else f"user-{rng.randrange(users)}",
+            "read": False,
+            "title": "bench",
+        }
+        for _ in range(count)
+    ]
+
+
+class ListStore:
+    """Implémentation d'origine (liste, parcours linéaires)"""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, notification):
+        self.items.insert(0, notification)
+
+    def visible(self, user_id, limit=50):
+        return [n for n in self.items if n["userId"] in [user_id, "all"]][:limit]
+
+    def unread_count(self, user_id):
+        return len([n for n in self.items if n["userId"] in [user_id, "all"] and not n["read"]])
+
+    def mark_read(self, notification_id):
+        for notification in self.items:
+            if notification["id"] == notification_id:
+                notification["read"] = True
+                return notification
+        return None
+
+
+def timed(label: str, func, repeat: int):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    per_call_us = (time.perf_counter() - start) / repeat * 1e6
+    print(f"  {label:<22} {per_call_us:>12.1f} us/appel")
+    return per_call_us
+
+
+def run(name: str, store, notifications, users: int, repeat: int):
+    print(f"\n{name}")
+    start = time.perf_counter()
+    for notification in notifications:
+        store.add(notification)
+    print(f"  {'remplissage':<22} {(time.perf_counter() - start) * 1000:>12.1f} ms au total")
+
+    rng = random.Random(7)
+    user_ids = [f"user-{rng.randrange(users)}" for _ in range(repeat)]
+    notification_ids = [rng.choice(notifications)["id"] for _ in range(repeat)]
+    return {
+        "unread": timed("unread-count", lambda i: store.unread_count(user_ids[i]), repeat),
+        "list": timed("liste (limit=50)", lambda i: store.visible(user_ids[i], limit=50), repeat),
+        "read": timed("mark read", lambda i: store.mark_read(notification_ids[i]), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notifications", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.notifications} notifications, {args.users} utilisateurs")
+    before = run("Liste (avant)", ListStore(), make_notifications(args.notifications, args.users), args.users, args.repeat)
+    after = run(
+        "NotificationStore (après)",
+        NotificationStore(max_items=args.notifications),
+        make_notifications(args.notifications, args.users),
+        args.users,
+        args.repeat
+    )
+
+    print("\nGain")
+    for key, label in (("unread", "unread-count"), ("list", "liste (limit=50)"), ("read", "mark read")):
+        print(f"  {label:<22} x{before[key] / after[key]:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark du surcoût du middleware de limitation de débit
+
+Appelle N fois une application ASGI vide, directement puis à travers
+RateLimitMiddleware (seaux jamais vides), et affiche le surcoût moyen par
+requête. L'objectif est de rester sous 50 µs.
+
+Usage:
+    python tests/performance/benchmarks/bench_rate_limit.py
+    python tests/performance/benchmarks/bench_rate_limit.py --requests 200000 --clients 1000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT / "microservices" / "api-gateway"))
+
+from rate_limit import RateLimiter, RateLimitMiddleware, RateLimitRule  # noqa: E402
+
+PATHS = ("/api/documents", "/api/documents/42/content", "/api/qa/ask", "/api/notifications/unread-count")
+
+
+async def empty_app(scope, receive, send):
+    return None
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    return None
+
+
+async def measure(app, scopes) -> float:
+    start = time.perf_counter()
+    for scope in scopes:
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / len(scopes) * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args()
+
+    scopes = [
+        {
+            "type": "http",
+            "method": "GET",
+            "path": PATHS[i % len(PATHS)],
+            "headers": [(b"host", b"gateway"), (b"x-forwarded-for", b"10.0.0.1")],
+            "client": (f"10.0.{(i % args.clients) // 256}.{i % 256}", 40000),
+        }
+        for i in range(args.requests)
+    ]
+    # Capacité très élevée : on mesure le chemin nominal (requête acceptée)
+    limiter = RateLimiter(
+        rules=(RateLimitRule("llm", capacity=1e9, window=60, prefixes=("/api/qa", "/api/synthesis")),),
+        default=RateLimitRule("default", capacity=1e9, window=60)
+    )
+    middleware = RateLimitMiddleware(empty_app, limiter)
+
+    await measure(middleware, scopes[:1000])
+    baseline = await measure(empty_app, scopes)
+    limited = await measure(middleware, scopes)
+
+    print(f"{args.requests} requêtes, {args.clients} clients, {limiter.stats()['buckets']} seaux")
+    print(f"  application seule      {baseline:8.2f} us/requête")
+    print(f"  avec RateLimitMiddleware {limited:6.2f} us/requête")
+    print(f"  surcoût                {limited - baseline:8.2f} us/requête (objectif < 50)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""
+Benchmark mémoire de l'upload de documents via l'API Gateway
+
+Lance un faux doc-ingestor (qui se contente de consommer le corps reçu) et
+l'API Gateway dans des processus uvicorn séparés, puis envoie N uploads
+concurrents de M Mo. Le pic de RSS du processus gateway est mesuré via
+/proc/<pid>/status (Linux).
+
+Usage:
+    python tests/performance/benchmarks/bench_upload_streaming.py
+    python tests/performance/benchmarks/bench_upload_streaming.py --uploads 20 --size-mb 50
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[3]
+GATEWAY_DIR = ROOT / "microservices" / "api-gateway"
+CHUNK = 256 * 1024
+
+
+async def fake_ingestor(scope, receive, send):
+    """Faux doc-ingestor ASGI : consomme le corps et répond comme le vrai service"""
+    if scope["type"] != "http":
+        return
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        size += len(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    body = b'{"success": true, "filename": "bench.pdf", "file_size": %d}' % size
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def read_rss_kb(pid: int, field: str = "VmRSS") -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def wait_ready(url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} ne répond pas")
+
+
+def multipart_body(size: int, boundary: str):
+    """Génère un corps multipart de `size` octets de fichier sans le matérialiser"""
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="document_type"\r\n\r\nrapport\r\n'
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="bench.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    length = len(head) + size + len(tail)
+
+    async def stream():
+        yield head
+        chunk = b"\0" * CHUNK
+        remaining = size
+        while remaining > 0:
+            n = min(CHUNK, remaining)
+            yield chunk[:n]
+            remaining -= n
+        yield tail
+
+    return stream(), length
+
+
+async def run_uploads(gateway_url: str, uploads: int, size: int) -> list:
+    async with httpx.AsyncClient(base_url=gateway_url, timeout=300.0) as client:
+        async def one():
+            boundary = uuid.uuid4().hex
+            body, length = multipart_body(size, boundary)
+            response = await client.post(
+                "/api/documents/upload",
+                content=body,
+                headers={
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                    "Content-Length": str(length),
+                },
+            )
+            return response.status_code
+
+        return await asyncio.gather(*[one() for _ in range(uploads)])
+
+
+async def sample_rss(pid: int, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        samples.append(read_rss_kb(pid))
+        await asyncio.sleep(0.05)
+
+
+async def main_async(args):
+    ingestor_port, gateway_port = free_port(), free_port()
+    env = dict(os.environ, DOC_INGESTOR_URL=f"http://127.0.0.1:{ingestor_port}")
+
+    ingestor = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "bench_upload_streaming:fake_ingestor",
+         "--app-dir", str(Path(__file__).parent), "--port", str(ingestor_port), "--log-level", "warning"],
+    )
+    gateway = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(gateway_port), "--log-level", "warning"],
+        cwd=GATEWAY_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(f"http://127.0.0.1:{ingestor_port}/health")
+        wait_ready(f"http://127.0.0.1:{gateway_port}/health")
+
+        baseline_kb = read_rss_kb(gateway.pid)
+        samples = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(gateway.pid, stop, samples))
+
+        start = time.perf_counter()
+        statuses = await run_uploads(f"http://127.0.0.1:{gateway_port}", args.uploads, args.size_mb * 1024 * 1024)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await sampler
+        peak_kb = max(read_rss_kb(gateway.pid, "VmHWM"), max(samples or [0]))
+
+        total_mb = args.uploads * args.size_mb
+        print("=" * 60)
+        print(f"   Upload streaming: {args.uploads} x {args.size_mb} Mo")
+        print("=" * 60)
+        print(f"Statuts           : {sorted(set(statuses))}")
+        print(f"Durée             : {elapsed:.2f}s ({total_mb / elapsed:.0f} Mo/s)")
+        print(f"RSS gateway repos : {baseline_kb / 1024:.1f} Mo")
+        print(f"RSS gateway pic   : {peak_kb / 1024:.1f} Mo")
+        print(f"Surcoût par upload: {(peak_kb - baseline_kb) / 1024 / args.uploads:.2f} Mo")
+    finally:
+        gateway.terminate()
+        ingestor.terminate()
+        gateway.wait()
+        ingestor.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size-mb", type=int, default=50)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
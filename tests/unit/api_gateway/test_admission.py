@@ -0,0 +1,143 @@
+"""
+Tests unitaires pour la file d'admission des routes LLM de l'API Gateway
+"""
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from admission import AdmissionQueue, AdmissionRejected, PriorityClass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(max_concurrency=1, max_queue=10, clock=None, qa_wait=30.0, synthesis_wait=90.0):
+    return AdmissionQueue(
+        "llm",
+        classes=[
+            PriorityClass("qa", priority=0, max_wait=qa_wait),
+            PriorityClass("synthesis", priority=1, max_wait=synthesis_wait),
+        ],
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        **({"clock": clock} if clock else {})
+    )
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestAdmissionQueue:
+    """Tests d'admission, de priorité et de refus"""
+
+    async def test_immediate_admission_below_limit(self):
+        queue = make_queue(max_concurrency=2)
+        first = await queue.admit("qa")
+        second = await queue.admit("synthesis")
+
+        assert (first.position, second.position) == (0, 0)
+        assert queue.stats()["active"] == 2
+        first.release()
+        first.release()  # idempotent
+        assert queue.stats()["active"] == 1
+
+    async def test_interactive_served_before_synthesis(self):
+        queue = make_queue(max_concurrency=1)
+        running = await queue.admit("synthesis")
+        order = []
+
+        async def request(name, class_name):
+            async with queue.slot(class_name) as ticket:
+                order.append((name, ticket.position))
+
+        tasks = [asyncio.ensure_future(request("s1", "synthesis"))]
+        await settle()
+        tasks.append(asyncio.ensure_future(request("q1", "qa")))
+        await settle()
+        tasks.append(asyncio.ensure_future(request("q2", "qa")))
+        await settle()
+
+        assert queue.stats()["classes"]["qa"]["queued"] == 2
+        running.release()
+        await asyncio.gather(*tasks)
+
+        # Position à l'arrivée : requêtes de priorité égale ou supérieure déjà en attente
+        assert order == [("q1", 0), ("q2", 1), ("s1", 0)]
+        assert queue.stats()["active"] == 0
+
+    async def test_queue_full_rejected_immediately(self):
+        queue = make_queue(max_concurrency=1, max_queue=1)
+        await queue.admit("qa")
+        waiting = asyncio.ensure_future(queue.admit("qa"))
+        await settle()
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await queue.admit("qa")
+        assert exc.value.reason == "queue_full"
+        assert exc.value.headers["Retry-After"].isdigit()
+        waiting.cancel()
+
+    async def test_estimated_wait_beyond_deadline_rejected(self):
+        clock = FakeClock()
+        queue = make_queue(max_concurrency=1, clock=clock, qa_wait=30.0)
+        ticket = await queue.admit("qa")
+        clock.now += 40.0
+        ticket.release()
+        assert queue.stats()["avgServiceTime"] == 40.0
+
+        await queue.admit("qa")
+        with pytest.raises(AdmissionRejected) as exc:
+            await queue.admit("qa")
+        assert exc.value.reason == "deadline"
+        assert exc.value.retry_after_seconds == 40
+        assert queue.stats()["shed"]["deadline"] == 1
+
+    async def test_timeout_while_waiting_leaves_queue(self):
+        queue = make_queue(max_concurrency=1, qa_wait=0.02)
+        ticket = await queue.admit("synthesis")
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await queue.admit("qa")
+        assert exc.value.reason == "timeout"
+        assert queue.stats()["queued"] == 0
+
+        ticket.release()
+        assert queue.stats()["active"] == 0
+
+    async def test_expired_waiter_skipped_on_release(self):
+        clock = FakeClock()
+        queue = make_queue(max_concurrency=1, clock=clock, qa_wait=30.0)
+        ticket = await queue.admit("qa")
+        expired = asyncio.ensure_future(queue.admit("qa"))
+        await settle()
+        clock.now += 31.0
+        later = asyncio.ensure_future(queue.admit("qa"))
+        await settle()
+
+        ticket.release()
+        with pytest.raises(AdmissionRejected):
+            await expired
+        assert (await later).position == 1
+        assert queue.stats()["shed"]["timeout"] == 1
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        queue = make_queue(max_concurrency=1)
+        ticket = await queue.admit("qa")
+        waiting = asyncio.ensure_future(queue.admit("qa"))
+        await settle()
+        waiting.cancel()
+        await settle()
+
+        assert queue.stats()["queued"] == 0
+        ticket.release()
+        assert queue.stats()["active"] == 0
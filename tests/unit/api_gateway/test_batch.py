@@ -0,0 +1,139 @@
+"""
+Tests unitaires pour les requêtes groupées (/api/batch) de l'API Gateway
+"""
+import asyncio
+import httpx
+import pytest
+import sys
+import os
+
+from fastapi import FastAPI, HTTPException, Request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from batch import BatchError, BatchRunner, parse_batch
+from request_id import RequestIdMiddleware
+
+
+def make_app(max_concurrency=2):
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+    app.state.active = 0
+    app.state.peak = 0
+
+    @app.get("/api/documents/{document_id}")
+    async def get_document(document_id: int, request: Request):
+        app.state.active += 1
+        app.state.peak = max(app.state.peak, app.state.active)
+        await asyncio.sleep(0.01)
+        app.state.active -= 1
+        if document_id == 404:
+            raise HTTPException(status_code=404, detail="Document non trouvé")
+        return {
+            "id": document_id,
+            "fields": request.query_params.get("fields"),
+            "requestId": request.headers.get("x-request-id"),
+            "auth": request.headers.get("authorization"),
+        }
+
+    @app.post("/api/notifications")
+    async def create(request: Request):
+        return {"created": await request.json()}
+
+    @app.get("/api/boom")
+    async def boom():
+        raise RuntimeError("panne")
+
+    runner = BatchRunner(app, max_concurrency=max_concurrency, max_requests=10)
+
+    @app.post("/api/batch")
+    async def run_batch(request: Request):
+        try:
+            items = parse_batch(await request.json(), runner.max_requests)
+        except BatchError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        return {"responses": await runner.run(items, request.scope)}
+
+    return app, runner
+
+
+async def post_batch(app, requests, headers=None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        return await client.post("/api/batch", json={"requests": requests}, headers=headers)
+
+
+class TestParseBatch:
+    """Tests de validation du lot"""
+
+    def test_defaults_and_query(self):
+        [item] = parse_batch({"requests": [{"path": "/api/documents?limit=5"}]}, 10)
+        assert (item.id, item.method, item.path, item.query) == ("0", "GET", "/api/documents", "limit=5")
+
+    @pytest.mark.parametrize("path", [
+        "/api/batch", "/api/notifications/stream", "/api/qa/ask/stream",
+        "/api/documents/upload", "/health", "http://evil/api/documents",
+    ])
+    def test_forbidden_paths(self, path):
+        with pytest.raises(BatchError):
+            parse_batch({"requests": [{"path": path}]}, 10)
+
+    def test_too_many_requests(self):
+        with pytest.raises(BatchError) as exc:
+            parse_batch({"requests": [{"path": "/api/documents"}] * 3}, 2)
+        assert exc.value.status_code == 413
+
+    def test_duplicate_ids_and_methods(self):
+        with pytest.raises(BatchError):
+            parse_batch({"requests": [{"id": "a", "path": "/api/x"}, {"id": "a", "path": "/api/y"}]}, 10)
+        with pytest.raises(BatchError):
+            parse_batch({"requests": [{"method": "PATCH", "path": "/api/x"}]}, 10)
+        with pytest.raises(BatchError):
+            parse_batch({"requests": []}, 10)
+
+
+class TestBatchRunner:
+    """Tests d'exécution des sous-requêtes"""
+
+    async def test_results_in_order_with_status_per_item(self):
+        app, _ = make_app()
+        response = await post_batch(app, [
+            {"id": "doc", "path": "/api/documents/1?fields=title"},
+            {"id": "missing", "path": "/api/documents/404"},
+            {"id": "notif", "method": "POST", "path": "/api/notifications", "body": {"title": "Résultat"}},
+            {"id": "boom", "path": "/api/boom"},
+        ])
+
+        assert response.status_code == 200
+        results = response.json()["responses"]
+        assert [r["id"] for r in results] == ["doc", "missing", "notif", "boom"]
+        assert [r["status"] for r in results] == [200, 404, 200, 500]
+        assert results[0]["body"]["fields"] == "title"
+        assert results[1]["body"] == {"detail": "Document non trouvé"}
+        assert results[2]["body"] == {"created": {"title": "Résultat"}}
+
+    async def test_bounded_fan_out(self):
+        app, runner = make_app(max_concurrency=2)
+        response = await post_batch(app, [{"path": f"/api/documents/{i}"} for i in range(6)])
+
+        assert all(r["status"] == 200 for r in response.json()["responses"])
+        assert app.state.peak == 2
+        assert runner.stats()["items"] == 6
+
+    async def test_headers_and_request_id_inherited(self):
+        app, _ = make_app()
+        response = await post_batch(
+            app,
+            [{"path": "/api/documents/1"}, {"path": "/api/documents/2"}],
+            headers={"Authorization": "Bearer t"}
+        )
+
+        request_id = response.headers["x-request-id"]
+        bodies = [r["body"] for r in response.json()["responses"]]
+        assert {b["requestId"] for b in bodies} == {request_id}
+        assert {b["auth"] for b in bodies} == {"Bearer t"}
+
+    async def test_invalid_batch_rejected(self):
+        app, _ = make_app()
+        response = await post_batch(app, [{"path": "/api/batch"}])
+        assert response.status_code == 400
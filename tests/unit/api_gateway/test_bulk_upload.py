@@ -0,0 +1,161 @@
+"""
+Tests unitaires pour l'upload groupé (/api/documents/upload/bulk) de l'API Gateway
+"""
+import asyncio
+import io
+import json
+import zipfile
+import httpx
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from bulk_upload import BulkUploader, BulkUploadError, collect_entries, parse_manifest
+
+
+class FakeUpload:
+    """Partie fichier d'un formulaire (interface de starlette.datastructures.UploadFile)"""
+
+    def __init__(self, filename, content, content_type="application/pdf"):
+        self.filename = filename
+        self.content_type = content_type
+        self.file = io.BytesIO(content)
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://doc-ingestor")
+
+
+def parse_multipart(request):
+    """Nom de fichier, champs et contenu d'un upload individuel reçu par doc-ingestor"""
+    body = request.read()
+    boundary = request.headers["content-type"].split("boundary=")[1].encode()
+    fields, filename, content = {}, None, None
+    for part in body.split(b"--" + boundary)[1:-1]:
+        head, _, value = part.partition(b"\r\n\r\n")
+        value = value[:-2]
+        name = head.split(b'name="')[1].split(b'"')[0].decode()
+        if b"filename=" in head:
+            filename = head.split(b'filename="')[1].split(b'"')[0].decode()
+            content = value
+        else:
+            fields[name] = value.decode()
+    return filename, fields, content
+
+
+class TestCollectEntries:
+    """Tests de constitution du lot"""
+
+    def test_files_and_zip_entries(self):
+        archive = make_zip({
+            "lot/a.pdf": b"A",
+            "lot/b.pdf": b"BB",
+            "__MACOSX/lot/._a.pdf": b"meta",
+            "lot/.DS_Store": b"meta",
+        })
+        entries = collect_entries([
+            FakeUpload("seul.pdf", b"PDF"),
+            FakeUpload("corpus.zip", archive, "application/zip"),
+        ], max_files=10)
+
+        assert [(e.filename, e.size, e.archive) for e in entries] == [
+            ("seul.pdf", 3, None), ("a.pdf", 1, "corpus.zip"), ("b.pdf", 2, "corpus.zip"),
+        ]
+        assert entries[2].open().read() == b"BB"
+
+    def test_limits(self):
+        with pytest.raises(BulkUploadError) as exc:
+            collect_entries([FakeUpload("lot.zip", make_zip({f"{i}.pdf": b"x" for i in range(3)}))], max_files=2)
+        assert exc.value.status_code == 413
+        with pytest.raises(BulkUploadError):
+            collect_entries([], max_files=2)
+        with pytest.raises(BulkUploadError):
+            collect_entries([FakeUpload("lot.zip", b"pas un zip")], max_files=2)
+
+    def test_manifest(self):
+        assert parse_manifest(None) == {}
+        assert parse_manifest('{"a.pdf": {"patient_id": "P1"}}') == {"a.pdf": {"patient_id": "P1"}}
+        with pytest.raises(BulkUploadError):
+            parse_manifest('["a.pdf"]')
+        with pytest.raises(BulkUploadError):
+            parse_manifest("{")
+
+
+class TestBulkUploader:
+    """Tests de transmission vers doc-ingestor"""
+
+    async def test_per_file_results_in_order(self):
+        received = {}
+
+        def handler(request):
+            filename, fields, content = parse_multipart(request)
+            received[filename] = (fields, content)
+            if filename == "vide.pdf":
+                return httpx.Response(400, json={"detail": "Aucun texte extrait"})
+            return httpx.Response(200, json={"document_id": len(received), "text_length": len(content)})
+
+        entries = collect_entries([
+            FakeUpload("a.pdf", b"AAAA"),
+            FakeUpload("lot.zip", make_zip({"b.pdf": b"BB", "vide.pdf": b"-"})),
+        ], max_files=10)
+        manifest = parse_manifest(json.dumps({"b.pdf": {"patient_id": "P2", "document_type": "ordonnance"}}))
+
+        async with make_client(handler) as client:
+            results = await BulkUploader(concurrency=2).run(
+                client, entries, {"document_type": "rapport_medical", "patient_id": None}, manifest
+            )
+
+        assert [r["filename"] for r in results] == ["a.pdf", "b.pdf", "vide.pdf"]
+        assert [r["status"] for r in results] == [200, 200, 400]
+        assert results[1]["archive"] == "lot.zip" and results[1]["text_length"] == 2
+        assert results[2]["error"] == "Aucun texte extrait"
+        assert received["a.pdf"] == ({"document_type": "rapport_medical"}, b"AAAA")
+        assert received["b.pdf"] == ({"document_type": "ordonnance", "patient_id": "P2"}, b"BB")
+
+    async def test_bounded_concurrency(self):
+        state = {"active": 0, "peak": 0}
+
+        async def handler(request):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return httpx.Response(200, json={"document_id": 1, "text_length": 1})
+
+        entries = collect_entries([FakeUpload(f"{i}.pdf", b"x") for i in range(6)], max_files=10)
+        uploader = BulkUploader(concurrency=2)
+        async with make_client(handler) as client:
+            results = await uploader.run(client, entries, {}, {})
+
+        assert all(r["status"] == 200 for r in results)
+        assert state["peak"] == 2
+        assert uploader.stats()["files"] == 6
+
+    async def test_oversize_and_unavailable(self):
+        def handler(request):
+            filename, _, _ = parse_multipart(request)
+            if filename == "panne.pdf":
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, json={"document_id": 1, "text_length": 1})
+
+        entries = collect_entries([
+            FakeUpload("gros.pdf", b"x" * 20),
+            FakeUpload("panne.pdf", b"x"),
+            FakeUpload("ok.pdf", b"x"),
+        ], max_files=10)
+        uploader = BulkUploader(concurrency=3, max_file_size=10)
+        async with make_client(handler) as client:
+            results = await uploader.run(client, entries, {}, {})
+
+        assert [r["status"] for r in results] == [413, 503, 200]
+        assert uploader.stats()["failed"] == 2
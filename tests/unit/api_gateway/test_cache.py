@@ -0,0 +1,117 @@
+"""
+Tests unitaires pour le cache stale-while-revalidate de l'API Gateway
+"""
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from cache import SWRCache, Uncacheable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_loader(calls, value="v", delay=0):
+    async def loader():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return f"{value}{len(calls)}"
+    return loader
+
+
+class TestSWRCache:
+    """Tests du cycle frais / périmé / expiré"""
+
+    async def test_fresh_entry_is_a_hit(self):
+        calls = []
+        cache = SWRCache("t", ttl=10, stale_ttl=30, clock=FakeClock())
+        assert await cache.get_or_load("k", make_loader(calls)) == "v1"
+        assert await cache.get_or_load("k", make_loader(calls)) == "v1"
+
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    async def test_stale_entry_served_while_refreshing_once(self):
+        calls = []
+        clock = FakeClock()
+        cache = SWRCache("t", ttl=10, stale_ttl=30, clock=clock)
+        await cache.get_or_load("k", make_loader(calls))
+
+        clock.now = 15
+        loader = make_loader(calls, delay=0.01)
+        results = await asyncio.gather(*[cache.get_or_load("k", loader) for _ in range(5)])
+        assert results == ["v1"] * 5
+        assert cache.stats()["refreshes"] == 1
+
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2
+        assert await cache.get_or_load("k", loader) == "v2"
+        assert cache.stats()["staleHits"] == 5
+
+    async def test_expired_entry_is_reloaded(self):
+        calls = []
+        clock = FakeClock()
+        cache = SWRCache("t", ttl=10, stale_ttl=30, clock=clock)
+        await cache.get_or_load("k", make_loader(calls))
+
+        clock.now = 50
+        assert await cache.get_or_load("k", make_loader(calls)) == "v2"
+        assert cache.stats()["misses"] == 2
+
+    async def test_concurrent_misses_share_one_load(self):
+        calls = []
+        cache = SWRCache("t", ttl=10, clock=FakeClock())
+        loader = make_loader(calls, delay=0.01)
+        results = await asyncio.gather(*[cache.get_or_load("k", loader) for _ in range(10)])
+
+        assert results == ["v1"] * 10
+        assert len(calls) == 1
+
+    async def test_uncacheable_value_not_stored(self):
+        cache = SWRCache("t", ttl=10, clock=FakeClock())
+
+        async def loader():
+            raise Uncacheable({"error": 500})
+
+        assert await cache.get_or_load("k", loader) == {"error": 500}
+        assert cache.stats()["entries"] == 0
+
+    async def test_failed_refresh_keeps_stale_value(self):
+        clock = FakeClock()
+        cache = SWRCache("t", ttl=10, stale_ttl=30, clock=clock)
+        await cache.get_or_load("k", make_loader([]))
+
+        async def failing():
+            raise RuntimeError("down")
+
+        clock.now = 15
+        assert await cache.get_or_load("k", failing) == "v1"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert cache.stats()["refreshErrors"] == 1
+        assert await cache.get_or_load("k", failing) == "v1"
+
+    async def test_load_error_propagates_on_miss(self):
+        cache = SWRCache("t", ttl=10, clock=FakeClock())
+
+        async def failing():
+            raise RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", failing)
+
+    async def test_bounded_entries(self):
+        cache = SWRCache("t", ttl=10, max_entries=2, clock=FakeClock())
+        for key in ("a", "b", "c"):
+            await cache.get_or_load(key, make_loader([]))
+        assert cache.stats()["entries"] == 2
@@ -0,0 +1,130 @@
+"""
+Tests unitaires pour le disjoncteur par service de l'API Gateway
+"""
+import pytest
+import httpx
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from upstreams import UpstreamClient, UpstreamConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("llm-qa-module", failure_threshold=3, reset_timeout=10.0, clock=clock)
+
+
+class TestCircuitBreaker:
+    """Tests de la machine à états"""
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        with pytest.raises(CircuitOpenError) as exc:
+            breaker.before_request()
+        assert exc.value.retry_after == pytest.approx(10.0)
+        assert breaker.snapshot()["totalRejections"] == 1
+
+    def test_success_resets_failure_count(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED
+
+    def test_half_open_allows_single_trial(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 10.0
+        assert breaker.snapshot()["state"] == STATE_HALF_OPEN
+
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        breaker.before_request()
+
+    def test_half_open_failure_reopens(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 10.0
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert breaker.total_trips == 2
+
+    def test_release_frees_trial_slot(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 10.0
+        breaker.before_request()
+        breaker.release()
+        breaker.before_request()
+
+    def test_open_error_is_request_error(self):
+        assert issubclass(CircuitOpenError, httpx.RequestError)
+
+
+class TestUpstreamClientBreaker:
+    """Tests de l'intégration du disjoncteur dans le client HTTP"""
+
+    async def test_fast_fail_without_network_call(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectTimeout("timeout", request=request)
+
+        client = UpstreamClient(
+            UpstreamConfig(name="synthese-comparative", base_url="http://synthese:8005", breaker_failure_threshold=2),
+            transport=httpx.MockTransport(handler)
+        )
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectTimeout):
+                await client.post("/api/synthesis/generate", json={})
+        with pytest.raises(CircuitOpenError):
+            await client.post("/api/synthesis/generate", json={})
+
+        assert len(calls) == 2
+        assert client.stats()["circuit"]["state"] == STATE_OPEN
+        await client.aclose()
+
+    async def test_gateway_errors_count_as_failures(self):
+        client = UpstreamClient(
+            UpstreamConfig(name="llm-qa-module", base_url="http://llm:8004", breaker_failure_threshold=1),
+            transport=httpx.MockTransport(lambda r: httpx.Response(503))
+        )
+        await client.get("/api/qa/stats")
+        assert client.breaker.state == STATE_OPEN
+        await client.aclose()
+
+    async def test_health_check_bypasses_breaker(self):
+        client = UpstreamClient(
+            UpstreamConfig(name="llm-qa-module", base_url="http://llm:8004", breaker_failure_threshold=1),
+            transport=httpx.MockTransport(lambda r: httpx.Response(200))
+        )
+        client.breaker.record_failure()
+        response = await client.get("/health", bypass_breaker=True)
+        assert response.status_code == 200
+        assert client.breaker.state == STATE_OPEN
+        await client.aclose()
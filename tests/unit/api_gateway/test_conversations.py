@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour le stockage des conversations de l'API Gateway
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from conversations import ConversationStore, Message, CONVERSATION_OVERHEAD, MESSAGE_OVERHEAD
+
+
+class TestConversationStore:
+    """Tests des index et de l'éviction"""
+
+    def test_create_get_and_messages(self):
+        store = ConversationStore()
+        conversation = store.create("Bilan", patient_id="P1")
+        message = store.add_message(conversation.id, "user", "Quelle posologie ?")
+
+        data = store.get(conversation.id).to_dict()
+        assert data["patientId"] == "P1"
+        assert data["messages"] == [message.to_dict()]
+        assert store.add_message("inconnu", "user", "x") is None
+
+    def test_recent_by_patient_newest_first(self):
+        store = ConversationStore()
+        first = store.create("a", "P1")
+        store.create("b", "P2")
+        third = store.create("c", "P1")
+
+        conversations, total = store.recent("P1")
+        assert [c["id"] for c in conversations] == [third.id, first.id]
+        assert total == 2
+        conversations, total = store.recent(limit=1)
+        assert [c["id"] for c in conversations] == [third.id]
+        assert total == 3
+
+    def test_summary_truncates_last_message(self):
+        store = ConversationStore()
+        conversation = store.create("a")
+        store.add_message(conversation.id, "assistant", "x" * 150)
+        summary = conversation.summary()
+        assert summary["messageCount"] == 1
+        assert summary["lastMessage"] == "x" * 100 + "..."
+
+    def test_lru_eviction_under_budget(self):
+        budget = 3 * CONVERSATION_OVERHEAD + MESSAGE_OVERHEAD
+        store = ConversationStore(max_bytes=budget)
+        a = store.create("")
+        b = store.create("")
+        store.get(a.id)
+        store.create("")
+        store.add_message(a.id, "user", "x" * 10)
+
+        assert store.get(b.id) is None
+        assert store.get(a.id) is not None
+        assert store.current_bytes <= budget
+        assert store.stats()["evictions"] == 1
+        assert store.recent("")[1] == 2
+
+    def test_delete_and_clear(self):
+        store = ConversationStore()
+        a = store.create("a", "P1")
+        store.create("b", "P1")
+        store.create("c", "P2")
+
+        assert store.delete(a.id) is True
+        assert store.delete(a.id) is False
+        assert store.clear("P1") == 1
+        assert store.clear() == 1
+        assert store.current_bytes == 0
+
+    def test_messages_are_slotted(self):
+        message = Message("user", "texte")
+        with pytest.raises(AttributeError):
+            message.extra = 1
@@ -0,0 +1,54 @@
+"""
+Tests unitaires pour l'agrégation parallèle du dashboard de l'API Gateway
+"""
+import asyncio
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from dashboard import DashboardAggregator, DashboardSource
+
+
+def source(name, value=None, delay=0.0, timeout=1.0, error=None):
+    async def load():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return value
+    return DashboardSource(name, load, timeout)
+
+
+class TestDashboardAggregator:
+    """Tests de l'interrogation parallèle des sources"""
+
+    async def test_sources_fetched_concurrently(self):
+        aggregator = DashboardAggregator()
+        start = time.perf_counter()
+        values, reports = await aggregator.run([
+            source("documents", {"total": 3}, delay=0.1),
+            source("qa", {"questions": {"total": 7}}, delay=0.1),
+            source("audit", {"totalLogs": 12}, delay=0.1),
+        ])
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.25
+        assert values["documents"] == {"total": 3}
+        assert {report["status"] for report in reports.values()} == {"ok"}
+
+    async def test_slow_and_failing_sources_omitted(self):
+        aggregator = DashboardAggregator()
+        start = time.perf_counter()
+        values, reports = await aggregator.run([
+            source("documents", {"total": 3}, delay=0.02),
+            source("qa", {"questions": {}}, delay=5.0, timeout=0.05),
+            source("audit", error=ConnectionError("refus")),
+        ])
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert list(values) == ["documents"]
+        assert reports["qa"]["status"] == "timeout"
+        assert reports["audit"]["status"] == "error"
+        assert aggregator.stats() == {"requests": 1, "timeouts": {"qa": 1}, "errors": {"audit": 1}}
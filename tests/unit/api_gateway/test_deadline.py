@@ -0,0 +1,140 @@
+"""
+Tests unitaires pour les budgets de latence et la propagation de l'échéance de l'API Gateway
+"""
+import httpx
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from deadline import DeadlineExceeded, DeadlineMiddleware, build_route_budgets, parse_deadline_ms, remaining, without_deadline
+from upstreams import UpstreamClient, UpstreamConfig
+
+SETTINGS = SimpleNamespace(BUDGET_DEFAULT=60.0, BUDGET_QA=120.0, BUDGET_SYNTHESIS=90.0, BUDGET_BULK_UPLOAD=600.0)
+
+
+def make_app(upstream=None):
+    app = FastAPI()
+    budgets, default = build_route_budgets(SETTINGS)
+    app.add_middleware(DeadlineMiddleware, budgets=budgets, default=default)
+
+    @app.get("/health")
+    @app.get("/api/qa/history")
+    @app.get("/api/documents/upload/bulk")
+    @app.get("/api/documents")
+    async def budget():
+        left = remaining()
+        return {"remaining": None if left is None else round(left)}
+
+    @app.get("/api/unbounded")
+    async def unbounded():
+        with without_deadline():
+            inner = remaining()
+        return {"inner": inner, "after": round(remaining())}
+
+    @app.get("/api/proxy")
+    async def proxy(request: Request):
+        response = await upstream.get("/echo")
+        return response.json()
+
+    return app
+
+
+async def get(app, path, headers=None):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+        return await client.get(path, headers=headers)
+
+
+def make_upstream(handler, read_timeout=60.0):
+    config = UpstreamConfig(name="doc-ingestor", base_url="http://doc:8001", read_timeout=read_timeout)
+    return UpstreamClient(config, transport=httpx.MockTransport(handler))
+
+
+class TestDeadlineMiddleware:
+    """Tests du budget attribué à chaque requête"""
+
+    @pytest.mark.parametrize("path,expected", [
+        ("/api/qa/history", 120),
+        ("/api/documents/upload/bulk", 600),
+        ("/api/documents", 60),
+        ("/health", None),
+    ])
+    async def test_budget_per_route(self, path, expected):
+        response = await get(make_app(), path)
+        assert response.json()["remaining"] == expected
+
+    async def test_client_can_only_shorten(self):
+        app = make_app()
+        assert (await get(app, "/api/documents", {"X-Deadline-Ms": "5000"})).json()["remaining"] == 5
+        assert (await get(app, "/api/documents", {"X-Deadline-Ms": "900000"})).json()["remaining"] == 60
+        assert (await get(app, "/api/documents", {"X-Deadline-Ms": "abc"})).json()["remaining"] == 60
+
+    def test_parse(self):
+        assert parse_deadline_ms("1500") == 1.5
+        assert parse_deadline_ms("-1") is None
+        assert parse_deadline_ms(None) is None
+
+
+class TestUpstreamPropagation:
+    """Tests de la transmission de l'échéance aux services"""
+
+    async def test_remaining_budget_forwarded_and_timeout_clamped(self):
+        seen = {}
+
+        def handler(request):
+            seen["deadline"] = int(request.headers["x-deadline-ms"])
+            seen["timeout"] = request.extensions["timeout"]
+            return httpx.Response(200, json={})
+
+        app = make_app(make_upstream(handler))
+        await get(app, "/api/proxy", {"X-Deadline-Ms": "2000"})
+
+        assert 1500 < seen["deadline"] <= 2000
+        assert seen["timeout"]["read"] <= 2.0
+        assert seen["timeout"]["connect"] <= 2.0
+
+    async def test_no_header_outside_requests(self):
+        seen = {}
+
+        def handler(request):
+            seen["headers"] = request.headers
+            seen["timeout"] = request.extensions["timeout"]
+            return httpx.Response(200)
+
+        await make_upstream(handler).get("/health")
+        assert "x-deadline-ms" not in seen["headers"]
+        assert seen["timeout"]["read"] == 60.0
+
+    async def test_without_deadline(self):
+        response = await get(make_app(), "/api/unbounded")
+        assert response.json() == {"inner": None, "after": 60}
+
+    async def test_expired_deadline_fails_without_calling(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={})
+
+        upstream = make_upstream(handler)
+        with pytest.raises(DeadlineExceeded):
+            await get(make_app(upstream), "/api/proxy", {"X-Deadline-Ms": "0"})
+        assert calls == []
+        assert upstream.breaker.consecutive_failures == 0
+
+    async def test_deadline_timeout_does_not_trip_breaker(self):
+        def handler(request):
+            raise httpx.ReadTimeout("lent", request=request)
+
+        upstream = make_upstream(handler)
+        with pytest.raises(httpx.ReadTimeout):
+            await get(make_app(upstream), "/api/proxy", {"X-Deadline-Ms": "1000"})
+        assert upstream.breaker.consecutive_failures == 0
+
+        with pytest.raises(httpx.ReadTimeout):
+            await upstream.get("/echo")
+        assert upstream.breaker.consecutive_failures == 1
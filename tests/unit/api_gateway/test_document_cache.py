@@ -0,0 +1,89 @@
+"""
+Tests unitaires pour le cache de documents (ETag) de l'API Gateway
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from document_cache import DocumentCache, etag_matches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEtagMatches:
+    """Tests de la comparaison If-None-Match"""
+
+    def test_exact_and_list(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert not etag_matches('"x"', '"abc"')
+
+    def test_weak_prefix_and_wildcard(self):
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestDocumentCache:
+    """Tests du LRU borné en octets"""
+
+    def test_fresh_entry_answers_304(self):
+        cache = DocumentCache(max_bytes=1024, max_entry_bytes=512, clock=FakeClock())
+        cache.put("/api/documents/1", '"e1"', b'{"id": 1}', "application/json")
+
+        entry = cache.get("/api/documents/1")
+        response = cache.respond(entry, '"e1"')
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"e1"'
+
+        response = cache.respond(entry, None)
+        assert response.status_code == 200
+        assert response.body == b'{"id": 1}'
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["notModified"] == 1
+
+    def test_entry_expires_and_revalidates(self):
+        clock = FakeClock()
+        cache = DocumentCache(max_bytes=1024, max_entry_bytes=512, ttl=30, clock=clock)
+        cache.put("k", '"e1"', b"body", None)
+
+        clock.now = 31
+        entry = cache.get("k")
+        assert not cache.is_fresh(entry)
+        cache.revalidated(entry)
+        assert cache.is_fresh(entry)
+        assert cache.stats()["revalidations"] == 1
+
+    def test_memory_budget_evicts_lru(self):
+        cache = DocumentCache(max_bytes=30, max_entry_bytes=30, clock=FakeClock())
+        cache.put("a", '"a"', b"x" * 10, None)
+        cache.put("b", '"b"', b"x" * 10, None)
+        cache.get("a")
+        cache.put("c", '"c"', b"x" * 10, None)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["bytes"] <= 30
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_entry_not_stored(self):
+        cache = DocumentCache(max_bytes=1024, max_entry_bytes=8, clock=FakeClock())
+        assert not cache.accepts("100")
+        assert not cache.accepts(None)
+        cache.put("k", '"e"', b"x" * 100, None)
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate(self):
+        cache = DocumentCache(max_bytes=1024, max_entry_bytes=512, clock=FakeClock())
+        cache.put("/api/documents/1", '"e"', b"a", None)
+        cache.put("/api/documents/1/content", '"e"', b"b", None)
+        cache.invalidate("/api/documents/1", "/api/documents/1/content")
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
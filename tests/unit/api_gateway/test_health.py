@@ -0,0 +1,102 @@
+"""
+Tests unitaires pour le poller de santé de l'API Gateway
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from health import HealthMonitor
+
+SERVICES = [("doc-ingestor", "http://doc:8001"), ("llm-qa-module", "http://llm:8004")]
+
+
+def make_probe(statuses, calls):
+    async def probe(name, url):
+        calls.append(name)
+        await asyncio.sleep(0)
+        return {"name": name, "url": url, "status": statuses.get(name, "healthy")}
+    return probe
+
+
+class TestHealthMonitor:
+    """Tests de l'instantané de santé"""
+
+    def test_snapshot_before_first_poll(self):
+        monitor = HealthMonitor(SERVICES, make_probe({}, []))
+        snapshot = monitor.snapshot()
+        assert [s["status"] for s in snapshot] == ["unknown", "unknown"]
+        assert all(s["stale"] for s in snapshot)
+
+    async def test_refresh_populates_snapshot(self):
+        calls = []
+        monitor = HealthMonitor(SERVICES, make_probe({"llm-qa-module": "unavailable"}, calls), interval=10)
+        await monitor.refresh()
+        await monitor.refresh()
+
+        snapshot = {s["name"]: s for s in monitor.snapshot()}
+        assert snapshot["doc-ingestor"]["status"] == "healthy"
+        assert snapshot["llm-qa-module"]["status"] == "unavailable"
+        assert len(snapshot["doc-ingestor"]["latencyHistory"]) == 2
+        assert snapshot["doc-ingestor"]["stale"] is False
+        assert "checkedAt" in snapshot["doc-ingestor"]
+        assert len(calls) == 4
+
+    async def test_snapshot_served_without_probing(self):
+        calls = []
+        monitor = HealthMonitor(SERVICES, make_probe({}, calls))
+        await monitor.refresh()
+        for _ in range(10):
+            monitor.snapshot()
+        assert len(calls) == 2
+
+    async def test_concurrent_refreshes_are_coalesced(self):
+        calls = []
+        monitor = HealthMonitor(SERVICES, make_probe({}, calls))
+        await asyncio.gather(*[monitor.refresh() for _ in range(5)])
+        assert len(calls) == 2
+        assert monitor.total_polls == 1
+
+    async def test_history_is_bounded(self):
+        monitor = HealthMonitor(SERVICES, make_probe({}, []), history_size=3)
+        for _ in range(5):
+            await monitor.refresh()
+        assert len(monitor.snapshot()[0]["latencyHistory"]) == 3
+
+    async def test_staleness(self):
+        monitor = HealthMonitor(SERVICES, make_probe({}, []), interval=10, stale_after=0.0)
+        await monitor.refresh()
+        assert monitor.snapshot()[0]["stale"] is True
+
+    def test_jitter_bounds(self):
+        monitor = HealthMonitor(SERVICES, make_probe({}, []), interval=10, jitter=0.2)
+        delays = [monitor._next_delay() for _ in range(100)]
+        assert all(8.0 <= d <= 12.0 for d in delays)
+
+    async def test_background_poller_start_stop(self):
+        calls = []
+        monitor = HealthMonitor(SERVICES, make_probe({}, calls), interval=0.01, jitter=0)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        assert monitor.total_polls >= 1
+
+    async def test_immediate_start_does_not_wait_for_probes(self):
+        release = asyncio.Event()
+
+        async def slow_probe(name, url):
+            await release.wait()
+            return {"name": name, "url": url, "status": "healthy"}
+
+        monitor = HealthMonitor(SERVICES, slow_probe, interval=10)
+        monitor.start(immediate=True)
+        assert monitor.discovered is False
+        assert [s["status"] for s in monitor.snapshot()] == ["unknown", "unknown"]
+
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert monitor.discovered is True
+        assert monitor.total_polls == 1
+        await monitor.stop()
@@ -0,0 +1,132 @@
+"""
+Tests unitaires pour la relance (hedging) des lectures de documents de l'API Gateway
+"""
+import asyncio
+import httpx
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from hedging import HedgeBudget, Hedger
+from upstreams import UpstreamClient, UpstreamConfig
+
+
+async def body(text: bytes):
+    yield text
+
+
+def make_upstream(delays, calls):
+    """Service dont la n-ième requête répond après delays[n] secondes (exception : levée)"""
+    async def handler(request):
+        index = len(calls)
+        calls.append("started")
+        try:
+            delay = delays[index]
+            if isinstance(delay, Exception):
+                await asyncio.sleep(0.01)
+                raise delay
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls[index] = "cancelled"
+            raise
+        calls[index] = "answered"
+        return httpx.Response(200, content=body(f"attempt-{index}".encode()))
+
+    config = UpstreamConfig(name="doc-ingestor", base_url="http://doc:8001")
+    return UpstreamClient(config, transport=httpx.MockTransport(handler))
+
+
+def make_hedger(budget=None, enabled=True, latency_ms=20.0):
+    hedger = Hedger("documents", budget or HedgeBudget(ratio=0.1, burst=5), enabled=enabled, min_samples=5)
+    for _ in range(5):
+        hedger.latency.record(latency_ms)
+    return hedger
+
+
+async def fetch(hedger, upstream):
+    response = await hedger.run(lambda: upstream.get("/api/documents", stream=True))
+    try:
+        return (await response.aread()).decode()
+    finally:
+        await response.aclose()
+
+
+class TestHedger:
+    """Tests du déclenchement et du plafonnement des relances"""
+
+    async def test_fast_primary_not_hedged(self):
+        calls = []
+        hedger = make_hedger()
+        assert await fetch(hedger, make_upstream([0], calls)) == "attempt-0"
+        assert calls == ["answered"]
+        assert hedger.stats()["hedged"] == 0
+        assert hedger.stats()["latencyMs"]["window"] == 6
+
+    async def test_hedge_wins_and_primary_cancelled(self):
+        calls = []
+        hedger = make_hedger()
+        upstream = make_upstream([1.0, 0], calls)
+
+        assert await fetch(hedger, upstream) == "attempt-1"
+        assert calls == ["cancelled", "answered"]
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["hedgeWins"]) == (1, 1)
+        assert upstream.in_flight == 0
+        assert upstream.breaker.consecutive_failures == 0
+
+    async def test_loser_latency_recorded(self):
+        calls = []
+        hedger = make_hedger()
+        await fetch(hedger, make_upstream([1.0, 0.05], calls))
+
+        # Gagnante (~50 ms) et perdante annulée après ~70 ms, pas seulement la gagnante
+        stats = hedger.stats()["latencyMs"]
+        assert stats["window"] == 7
+        assert stats["p99"] >= 60
+
+    async def test_caller_cancelled_before_hedge(self):
+        calls = []
+        hedger = make_hedger()
+        upstream = make_upstream([1.0], calls)
+        task = asyncio.create_task(fetch(hedger, upstream))
+        await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert calls == ["cancelled"]
+        assert upstream.in_flight == 0
+
+    async def test_no_hedge_without_samples_or_when_disabled(self):
+        budget = HedgeBudget()
+        for hedger in (Hedger("documents", budget, min_samples=5), make_hedger(budget, enabled=False)):
+            calls = []
+            assert await fetch(hedger, make_upstream([0.05], calls)) == "attempt-0"
+            assert calls == ["answered"]
+            assert hedger.stats()["delayMs"] is None
+
+    async def test_budget_caps_hedges(self):
+        budget = HedgeBudget(ratio=0.1, burst=1)
+        hedger = make_hedger(budget)
+
+        calls = []
+        assert await fetch(hedger, make_upstream([0.1, 0], calls)) == "attempt-1"
+        calls = []
+        assert await fetch(hedger, make_upstream([0.1, 0], calls)) == "attempt-0"
+        assert calls == ["answered"]
+        assert hedger.stats()["budgetDenied"] == 1
+        assert budget.stats()["denied"] == 1
+
+    async def test_failed_attempt_falls_back_to_other(self):
+        calls = []
+        hedger = make_hedger(latency_ms=5.0)
+        assert await fetch(hedger, make_upstream([0.05, httpx.ConnectError("refus")], calls)) == "attempt-0"
+        assert hedger.stats()["hedgeWins"] == 0
+
+    async def test_all_attempts_failing_raise(self):
+        hedger = make_hedger(latency_ms=5.0)
+        upstream = make_upstream([httpx.ConnectError("refus"), httpx.ConnectError("refus")], [])
+        with pytest.raises(httpx.ConnectError):
+            await fetch(hedger, upstream)
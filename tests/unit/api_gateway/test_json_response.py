@@ -0,0 +1,48 @@
+"""
+Tests unitaires pour la réponse JSON orjson de l'API Gateway
+"""
+import json
+import sys
+import os
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from json_response import FastJSONResponse, dumps
+
+
+class TestDumps:
+    """Tests de l'encodage"""
+
+    def test_same_document_as_stdlib(self):
+        content = {"text_content": "Tension artérielle 14/9 — «contrôle»", "scores": [0.5, 1], "ok": True, "none": None}
+        assert json.loads(dumps(content)) == content
+
+    def test_utf8_without_escapes(self):
+        assert dumps({"nom": "Hélène"}) == '{"nom":"Hélène"}'.encode()
+
+    def test_non_string_keys(self):
+        assert json.loads(dumps({1: "a"})) == {"1": "a"}
+
+    def test_stdlib_fallback_for_big_integers(self):
+        assert dumps({"n": 2 ** 70}) == b'{"n":1180591620717411303424}'
+
+
+class TestDefaultResponseClass:
+    """Tests de l'utilisation comme classe de réponse par défaut"""
+
+    def test_routes_of_included_routers(self):
+        router = APIRouter()
+
+        @router.get("/documents")
+        async def documents():
+            return {"documents": [{"id": 1, "filename": "compte-rendu.pdf"}], "total": 1}
+
+        app = FastAPI(default_response_class=FastJSONResponse)
+        app.include_router(router, prefix="/api")
+
+        response = TestClient(app).get("/api/documents")
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == b'{"documents":[{"id":1,"filename":"compte-rendu.pdf"}],"total":1}'
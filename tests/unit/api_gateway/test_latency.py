@@ -0,0 +1,32 @@
+"""
+Tests unitaires pour la fenêtre de latences de l'API Gateway
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from latency import LatencyWindow
+
+
+class TestLatencyWindow:
+    """Tests des percentiles glissants"""
+
+    def test_empty(self):
+        assert LatencyWindow().stats()["p95"] is None
+
+    def test_percentiles(self):
+        window = LatencyWindow()
+        for ms in range(1, 101):
+            window.record(ms)
+        stats = window.stats()
+        assert (stats["p50"], stats["p95"], stats["p99"]) == (50, 95, 99)
+
+    def test_window_is_bounded(self):
+        window = LatencyWindow(size=10)
+        for ms in range(100):
+            window.record(ms)
+        stats = window.stats()
+        assert (stats["count"], stats["window"]) == (100, 10)
+        assert len(window) == 10
+        assert window.percentile(0) == 90
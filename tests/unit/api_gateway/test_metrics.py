@@ -0,0 +1,130 @@
+"""
+Tests unitaires pour les métriques Prometheus de l'API Gateway
+"""
+import sys
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, generate_latest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from metrics import REGISTRY, GatewayStatsCollector, MetricsMiddleware
+
+
+def request_count(method, route, status):
+    return REGISTRY.get_sample_value(
+        "http_request_duration_seconds_count", {"method": method, "route": route, "status": status}
+    ) or 0
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/api/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/metrics")
+    async def metrics():
+        return {}
+
+    return app
+
+
+class TestMetricsMiddleware:
+    """Tests de l'histogramme de latence par route"""
+
+    def test_route_template_label(self):
+        client = TestClient(make_app())
+        before = request_count("GET", "/api/items/{item_id}", "200")
+
+        client.get("/api/items/1")
+        client.get("/api/items/2")
+
+        # Un seul label pour tous les identifiants
+        assert request_count("GET", "/api/items/{item_id}", "200") == before + 2
+
+    def test_unmatched_and_scrape_not_labelled_by_path(self):
+        client = TestClient(make_app())
+        before_unmatched = request_count("GET", "unmatched", "404")
+        before_scrape = request_count("GET", "/metrics", "200")
+
+        client.get("/inconnu/123")
+        client.get("/metrics")
+
+        assert request_count("GET", "unmatched", "404") == before_unmatched + 1
+        assert request_count("GET", "/metrics", "200") == before_scrape
+
+
+def snapshot():
+    return {
+        "upstreams": {
+            "llm-qa": {
+                "inFlight": 3,
+                "limits": {"maxConnections": 4},
+                "saturation": 0.75,
+                "pool": {"active": 3, "idle": 1, "queued": 2},
+                "circuit": {"state": "open"},
+                "totalErrors": 5,
+            }
+        },
+        "caches": {"dashboard": {"entries": 1, "hits": 10, "misses": 2, "staleHits": 1}},
+        "documentCache": {"entries": 4, "hits": 7, "misses": 3},
+        "state": {"pendingWrites": 6},
+        "rateLimit": {"buckets": 2, "rejected": {"qa": 9}},
+        "coalescing": {"qa": {"inflight": 1, "coalesced": 8}},
+        "notificationStream": {"subscribers": 2, "dropped": 1},
+        "llmQueue": {
+            "active": 2,
+            "classes": {"qa": {"queued": 3}, "synthesis": {"queued": 1}},
+            "shed": {"queue_full": 0, "deadline": 4, "timeout": 1},
+        },
+        "hedging": {
+            "budget": {"tokens": 7.5},
+            "routes": {
+                "documents": {"requests": 40, "hedged": 3, "hedgeWins": 2, "budgetDenied": 1, "delayMs": 120.0},
+                "document-content": {"requests": 5, "hedged": 0, "hedgeWins": 0, "budgetDenied": 0, "delayMs": None},
+            },
+        },
+    }
+
+
+class TestGatewayStatsCollector:
+    """Tests de la conversion de /api/gateway/stats en métriques"""
+
+    def collect(self):
+        registry = CollectorRegistry()
+        registry.register(GatewayStatsCollector(snapshot))
+        return registry
+
+    def test_pool_saturation_and_circuit(self):
+        registry = self.collect()
+        labels = {"service": "llm-qa"}
+        assert registry.get_sample_value("gateway_upstream_pool_saturation", labels) == 0.75
+        assert registry.get_sample_value("gateway_upstream_pool_queued", labels) == 2
+        assert registry.get_sample_value("gateway_circuit_open", labels) == 1
+        assert registry.get_sample_value("gateway_upstream_errors_total", labels) == 5
+        assert registry.get_sample_value(
+            "gateway_upstream_pool_connections", {"service": "llm-qa", "state": "idle"}
+        ) == 1
+
+    def test_queues_and_caches(self):
+        registry = self.collect()
+        assert registry.get_sample_value("gateway_state_pending_writes") == 6
+        assert registry.get_sample_value("gateway_rate_limit_rejected_total", {"rule": "qa"}) == 9
+        assert registry.get_sample_value("gateway_coalesced_requests_total", {"name": "qa"}) == 8
+        assert registry.get_sample_value("gateway_cache_hits_total", {"cache": "dashboard"}) == 11
+        assert registry.get_sample_value("gateway_cache_entries", {"cache": "documents"}) == 4
+        assert registry.get_sample_value("gateway_llm_queue_waiting", {"class": "qa"}) == 3
+        assert registry.get_sample_value("gateway_llm_queue_shed_total", {"reason": "deadline"}) == 4
+        assert registry.get_sample_value("gateway_hedged_requests_total", {"route": "documents"}) == 3
+        assert registry.get_sample_value("gateway_hedge_delay_seconds", {"route": "documents"}) == 0.12
+        assert registry.get_sample_value("gateway_hedge_delay_seconds", {"route": "document-content"}) is None
+
+    def test_text_exposition(self):
+        text = generate_latest(self.collect()).decode()
+        assert "# TYPE gateway_upstream_pool_saturation gauge" in text
+        assert 'gateway_notification_stream_subscribers 2.0' in text
@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour la diffusion SSE des notifications de l'API Gateway
+"""
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from notification_hub import NotificationHub, format_event
+
+
+def parse(frame: bytes):
+    event, data = frame.decode().strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+class TestNotificationHub:
+    """Tests du fan-out et des abonnés lents"""
+
+    async def test_fan_out_by_audience(self):
+        hub = NotificationHub()
+        alice = hub.subscribe("alice")
+        bob = hub.subscribe("bob")
+
+        assert hub.publish("notification", {"id": "1"}, user_id="all") == 2
+        assert hub.publish("notification", {"id": "2"}, user_id="alice") == 1
+        assert hub.publish("deleted", {"id": "1"}) == 2
+
+        assert [parse(alice.queue.get_nowait())[1]["id"] for _ in range(3)] == ["1", "2", "1"]
+        assert bob.queue.qsize() == 2
+
+    async def test_slow_consumer_dropped_without_blocking(self):
+        hub = NotificationHub(queue_size=2)
+        slow = hub.subscribe("alice")
+        fast = hub.subscribe("alice")
+
+        for i in range(3):
+            hub.publish("notification", {"id": str(i)}, user_id="alice")
+            fast.queue.get_nowait()
+
+        assert slow.closed is True
+        assert fast.closed is False
+        stats = hub.stats()
+        assert (stats["subscribers"], stats["dropped"]) == (1, 1)
+
+        # Le flux du client lent se termine
+        frames = [frame async for frame in hub.stream(slow)]
+        assert frames == [b"retry: 5000\n\n"]
+
+    async def test_stream_frames_heartbeat_and_unsubscribe(self):
+        hub = NotificationHub(heartbeat=0.01)
+        subscription = hub.subscribe()
+        stream = hub.stream(subscription)
+
+        assert await stream.__anext__() == b"retry: 5000\n\n"
+        assert await stream.__anext__() == b": ping\n\n"
+        hub.publish("notification", {"id": "1", "title": "Résultat"})
+        assert parse(await stream.__anext__()) == ("notification", {"id": "1", "title": "Résultat"})
+
+        await stream.aclose()
+        assert hub.stats()["subscribers"] == 0
+
+    async def test_close_ends_every_stream(self):
+        hub = NotificationHub()
+        subscription = hub.subscribe()
+        reader = asyncio.ensure_future(self.collect(hub, subscription))
+        await asyncio.sleep(0)
+        hub.close()
+        assert await asyncio.wait_for(reader, 1) == [b"retry: 5000\n\n"]
+
+    async def collect(self, hub, subscription):
+        return [frame async for frame in hub.stream(subscription)]
+
+    def test_format_event(self):
+        assert format_event("read", {"id": "é"}) == 'event: read\ndata: {"id": "é"}\n\n'.encode()
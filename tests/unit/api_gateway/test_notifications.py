@@ -0,0 +1,72 @@
+"""
+Tests unitaires pour le stockage indexé des notifications de l'API Gateway
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from notifications import NotificationStore
+
+
+def make_notification(notification_id, user_id="all", read=False):
+    return {"id": notification_id, "userId": user_id, "read": read, "title": notification_id}
+
+
+def fill(store, specs):
+    for notification_id, user_id in specs:
+        store.add(make_notification(notification_id, user_id))
+
+
+class TestNotificationStore:
+    """Tests des index et compteurs"""
+
+    def test_visible_merges_user_and_broadcast_newest_first(self):
+        store = NotificationStore(max_items=10)
+        fill(store, [("1", "alice"), ("2", "all"), ("3", "bob"), ("4", "alice")])
+
+        assert [n["id"] for n in store.visible("alice")] == ["4", "2", "1"]
+        assert [n["id"] for n in store.visible("all")] == ["2"]
+        assert [n["id"] for n in store.visible("alice", limit=2)] == ["4", "2"]
+        assert store.total("alice") == 3
+
+    def test_unread_counters(self):
+        store = NotificationStore(max_items=10)
+        fill(store, [("1", "alice"), ("2", "all"), ("3", "bob")])
+        assert store.unread_count("alice") == 2
+        assert store.unread_count("bob") == 2
+        assert store.unread_count("all") == 1
+
+        store.mark_read("2")
+        store.mark_read("2")
+        assert store.unread_count("alice") == 1
+        assert store.unread_count("bob") == 1
+        assert [n["id"] for n in store.visible("alice", unread_only=True)] == ["1"]
+
+    def test_mark_all_read(self):
+        store = NotificationStore(max_items=10)
+        fill(store, [("1", "alice"), ("2", "all"), ("3", "bob")])
+        assert store.mark_all_read("alice") == 2
+        assert store.unread_count("alice") == 0
+        assert store.unread_count("bob") == 1
+
+    def test_eviction_keeps_counters_consistent(self):
+        store = NotificationStore(max_items=2)
+        fill(store, [("1", "alice"), ("2", "bob"), ("3", "alice")])
+
+        assert len(store) == 2
+        assert store.get("1") is None
+        assert [n["id"] for n in store.visible("alice")] == ["3"]
+        assert store.unread_count("alice") == 1
+
+    def test_delete_and_clear(self):
+        store = NotificationStore(max_items=10)
+        fill(store, [("1", "alice"), ("2", "all"), ("3", "bob")])
+
+        assert store.delete("1") is True
+        assert store.delete("1") is False
+        assert store.unread_count("alice") == 1
+
+        assert store.clear("bob") == 2
+        assert len(store) == 0
+        assert store.unread_count("alice") == 0
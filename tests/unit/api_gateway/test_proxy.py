@@ -0,0 +1,103 @@
+"""
+Tests unitaires pour le relais brut des réponses de l'API Gateway
+"""
+import gzip
+import sys
+import os
+
+import httpx
+from starlette.responses import StreamingResponse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from proxy import passthrough, relay_event_stream, STREAM_THRESHOLD
+
+
+class UpstreamStream(httpx.AsyncByteStream):
+    """Corps amont non pré-lu, comme sur un vrai transport réseau"""
+
+    def __init__(self, data: bytes, chunk_size: int = 16 * 1024):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        for i in range(0, len(self.data), self.chunk_size):
+            yield self.data[i:i + self.chunk_size]
+
+
+def upstream_response(status_code: int, data: bytes, headers: dict) -> httpx.Response:
+    headers = {"content-length": str(len(data)), **headers}
+    return httpx.Response(status_code, stream=UpstreamStream(data), headers=headers)
+
+
+async def fetch(handler) -> httpx.Response:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://upstream")
+    request = client.build_request("GET", "/api/documents/1/content")
+    return await client.send(request, stream=True)
+
+
+async def body_of(response) -> bytes:
+    if isinstance(response, StreamingResponse):
+        chunks = [chunk async for chunk in response.body_iterator]
+        if response.background:
+            await response.background()
+        return b"".join(chunks)
+    return response.body
+
+
+class TestPassthrough:
+    """Tests de la conversion réponse amont -> réponse gateway"""
+
+    async def test_small_body_forwarded_verbatim(self):
+        raw = b'{"success":true,  "content": "\\u00e9"}'
+        upstream = await fetch(lambda r: upstream_response(
+            200, raw, {"content-type": "application/json", "etag": '"abc"', "x-internal": "1"}
+        ))
+        response = await passthrough(upstream)
+
+        assert not isinstance(response, StreamingResponse)
+        assert response.body == raw
+        assert response.headers["etag"] == '"abc"'
+        assert response.headers["content-length"] == str(len(raw))
+        assert "x-internal" not in response.headers
+        assert upstream.is_closed
+
+    async def test_large_body_streamed(self):
+        raw = b"x" * (STREAM_THRESHOLD * 3)
+        upstream = await fetch(lambda r: upstream_response(404, raw, {"content-type": "application/json"}))
+        response = await passthrough(upstream)
+
+        assert isinstance(response, StreamingResponse)
+        assert response.status_code == 404
+        assert await body_of(response) == raw
+        assert upstream.is_closed
+
+    async def test_encoded_body_is_decoded(self):
+        raw = b'{"documents": []}'
+        upstream = await fetch(lambda r: upstream_response(
+            200, gzip.compress(raw), {"content-type": "application/json", "content-encoding": "gzip"}
+        ))
+        response = await passthrough(upstream)
+
+        assert await body_of(response) == raw
+        assert "content-encoding" not in response.headers
+
+
+class TestRelayEventStream:
+    """Tests du relais des flux SSE"""
+
+    async def test_events_relayed_unbuffered_with_first_token_callback(self):
+        frames = b'event: sources\ndata: {}\n\n' + b'event: token\ndata: {"token": "a"}\n\n' * 2
+        upstream = await fetch(lambda r: httpx.Response(
+            200, stream=UpstreamStream(frames, chunk_size=20), headers={"content-type": "text/event-stream"}
+        ))
+        marks = []
+        response = await relay_event_stream(upstream, on_marker=lambda: marks.append(1))
+
+        assert response.headers["x-accel-buffering"] == "no"
+        assert "content-length" not in response.headers
+        chunks = [chunk async for chunk in response.body_iterator]
+        assert len(chunks) > 1
+        assert b"".join(chunks) == frames
+        assert marks == [1]
+        assert upstream.is_closed
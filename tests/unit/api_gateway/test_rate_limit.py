@@ -0,0 +1,108 @@
+"""
+Tests unitaires pour la limitation de débit de l'API Gateway
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from rate_limit import RateLimiter, RateLimitMiddleware, RateLimitRule
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(clock, default=3, llm=1):
+    return RateLimiter(
+        rules=(RateLimitRule("llm", capacity=llm, window=60, prefixes=("/api/qa", "/api/synthesis")),),
+        default=RateLimitRule("default", capacity=default, window=60),
+        clock=clock
+    )
+
+
+def acquire(limiter, path, client="10.0.0.1"):
+    rule, group = limiter.match(path)
+    return limiter.acquire(rule, group, client)
+
+
+class TestRateLimiter:
+    """Tests des seaux de jetons"""
+
+    def test_match_groups(self):
+        limiter = make_limiter(FakeClock())
+        assert limiter.match("/health") is None
+        assert limiter.match("/api/health/services") is None
+        assert limiter.match("/api/qa/ask")[1] == "llm"
+        assert limiter.match("/api/synthesis/compare")[1] == "llm"
+        assert limiter.match("/api/documents/12/content")[1] == "/api/documents"
+        assert limiter.match("/api/search")[1] == "/api/search"
+
+    def test_burst_then_retry_after(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, default=3)
+        assert [acquire(limiter, "/api/documents") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert acquire(limiter, "/api/documents") == 20.0
+
+        clock.now = 20
+        assert acquire(limiter, "/api/documents") == 0.0
+        assert limiter.stats()["rejected"]["default"] == 1
+
+    def test_buckets_per_client_and_route(self):
+        limiter = make_limiter(FakeClock(), default=1, llm=1)
+        assert acquire(limiter, "/api/qa/ask") == 0.0
+        assert acquire(limiter, "/api/synthesis/generate") > 0
+        assert acquire(limiter, "/api/qa/ask", client="10.0.0.2") == 0.0
+        assert acquire(limiter, "/api/documents") == 0.0
+        assert acquire(limiter, "/api/search") == 0.0
+
+    def test_bucket_count_is_bounded(self):
+        limiter = make_limiter(FakeClock())
+        limiter.max_buckets = 2
+        for client in ("a", "b", "c"):
+            acquire(limiter, "/api/documents", client)
+        assert limiter.stats()["buckets"] == 2
+
+
+class TestRateLimitMiddleware:
+    """Tests du middleware ASGI"""
+
+    async def call(self, middleware, path, headers=(), client=("10.0.0.1", 1234)):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": path, "headers": list(headers), "client": client}
+        await middleware(scope, receive, send)
+        return sent
+
+    async def test_rejects_with_429_and_retry_after(self):
+        calls = []
+
+        async def downstream(scope, receive, send):
+            calls.append(scope["path"])
+
+        middleware = RateLimitMiddleware(downstream, make_limiter(FakeClock(), llm=1))
+        assert await self.call(middleware, "/api/qa/ask") == []
+        sent = await self.call(middleware, "/api/qa/ask")
+
+        assert calls == ["/api/qa/ask"]
+        assert sent[0]["status"] == 429
+        assert (b"retry-after", b"60") in sent[0]["headers"]
+
+    async def test_forwarded_client_when_trusted(self):
+        async def downstream(scope, receive, send):
+            pass
+
+        middleware = RateLimitMiddleware(downstream, make_limiter(FakeClock(), llm=1), trust_forwarded=True)
+        await self.call(middleware, "/api/qa/ask", headers=[(b"x-forwarded-for", b"1.1.1.1, 10.0.0.9")])
+        sent = await self.call(middleware, "/api/qa/ask", headers=[(b"x-forwarded-for", b"2.2.2.2")])
+        assert sent == []
@@ -0,0 +1,81 @@
+"""
+Tests unitaires pour l'identifiant de requête (X-Request-ID) de l'API Gateway
+"""
+import httpx
+import sys
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from request_id import RequestIdMiddleware, accept_request_id, current_request_id
+from upstreams import UpstreamConfig, UpstreamClient
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/echo")
+    async def echo():
+        return {"requestId": current_request_id()}
+
+    return app
+
+
+class TestRequestIdMiddleware:
+    """Tests de l'attribution de l'identifiant"""
+
+    def test_generated_when_absent(self):
+        response = TestClient(make_app()).get("/echo")
+        request_id = response.headers["x-request-id"]
+        assert len(request_id) == 32
+        assert response.json() == {"requestId": request_id}
+
+    def test_client_id_kept(self):
+        response = TestClient(make_app()).get("/echo", headers={"X-Request-ID": "front-42"})
+        assert response.headers["x-request-id"] == "front-42"
+        assert response.json() == {"requestId": "front-42"}
+
+    def test_invalid_id_replaced(self):
+        assert accept_request_id("a" * 200) != "a" * 200
+        assert accept_request_id("id avec espaces") != "id avec espaces"
+        assert accept_request_id("") != ""
+
+    def test_no_id_outside_request(self):
+        assert current_request_id() is None
+
+
+class TestUpstreamPropagation:
+    """Tests de la transmission aux services en aval"""
+
+    async def test_request_id_forwarded(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("x-request-id"))
+            return httpx.Response(200)
+
+        client = UpstreamClient(
+            UpstreamConfig(name="doc-ingestor", base_url="http://doc:8001"),
+            transport=httpx.MockTransport(handler)
+        )
+        app = FastAPI()
+        app.add_middleware(RequestIdMiddleware)
+
+        @app.get("/proxy")
+        async def proxy():
+            await client.get("/api/documents")
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as http:
+            await http.get("/proxy", headers={"X-Request-ID": "req-1"})
+
+        # Hors requête (poller de santé) : pas d'en-tête
+        await client.get("/health")
+        await client.aclose()
+
+        assert seen == ["req-1", None]
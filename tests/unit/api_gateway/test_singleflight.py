@@ -0,0 +1,109 @@
+"""
+Tests unitaires pour le regroupement des requêtes identiques de l'API Gateway
+"""
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+import json
+
+from singleflight import SingleFlight, coalesced_query_audit, question_key
+
+
+class TestSingleFlight:
+    """Tests du partage des appels en cours"""
+
+    async def test_concurrent_calls_share_one_upstream_call(self):
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await release.wait()
+            return "réponse"
+
+        waiters = [asyncio.create_task(flight.do("k", upstream)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["réponse"] * 5
+        assert len(calls) == 1
+        stats = flight.stats()
+        assert (stats["calls"], stats["coalesced"], stats["inflight"]) == (1, 4, 0)
+
+    async def test_nothing_kept_after_completion(self):
+        flight = SingleFlight("test")
+
+        async def upstream():
+            return object()
+
+        assert await flight.do("k", upstream) is not await flight.do("k", upstream)
+        assert flight.stats()["calls"] == 2
+
+    async def test_error_propagated_to_every_waiter(self):
+        flight = SingleFlight("test")
+
+        async def upstream():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("llm indisponible")
+
+        results = await asyncio.gather(
+            flight.do("k", upstream), flight.do("k", upstream), return_exceptions=True
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert flight.stats()["errors"] == 1
+
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        flight = SingleFlight("test")
+
+        async def upstream():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        leader = asyncio.create_task(flight.do("k", upstream))
+        follower = asyncio.create_task(flight.do("k", upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+class TestQuestionKey:
+    """Tests de la clé de regroupement"""
+
+    def test_normalized_question(self):
+        a = question_key({"question": "  Quel traitement   pour ce patient ?", "patient_id": "P1"})
+        b = question_key({"question": "quel TRAITEMENT pour ce patient ?", "patient_id": "P1", "user_id": "u2"})
+        assert a == b
+
+    def test_filters_are_part_of_the_key(self):
+        base = {"question": "Allergies ?", "patient_id": "P1"}
+        assert question_key(base) != question_key({**base, "patient_id": "P2"})
+        assert question_key(base) != question_key({**base, "document_type": "ordonnance"})
+
+
+class TestCoalescedQueryAudit:
+    """Tests de l'entrée d'audit des requêtes regroupées"""
+
+    def test_entry_from_shared_answer(self):
+        content = json.dumps({
+            "answer": "x" * 600,
+            "sources": [{"document_id": "d1"}, {"document_id": "d2"}],
+        }).encode()
+        entry = coalesced_query_audit({"question": "Allergies ?", "user_id": "u2"}, content, 120)
+
+        assert (entry["user_id"], entry["action"], entry["query_text"]) == ("u2", "QUERY", "Allergies ?")
+        assert len(entry["response_summary"]) == 500
+        assert entry["documents_accessed"] == ["d1", "d2"]
+        assert entry["processing_time_ms"] == 120
+
+    def test_anonymous_and_unreadable_answer(self):
+        entry = coalesced_query_audit({"question": "Allergies ?"}, b"<html>", 5)
+        assert entry["user_id"] == "anonymous"
+        assert (entry["response_summary"], entry["documents_accessed"]) == ("", [])
@@ -0,0 +1,240 @@
+"""
+Tests unitaires pour les backends d'état de l'API Gateway (SQLite)
+"""
+import asyncio
+import sqlite3
+import threading
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from state import SQLDatabase, SQLiteDatabase, build_state
+from notifications import NotificationStore, SQLNotificationStore
+from conversations import SQLConversationStore
+
+
+def make_settings(**overrides):
+    values = dict(
+        STATE_BACKEND="memory",
+        STATE_SQLITE_PATH="",
+        STATE_POSTGRES_DSN="",
+        STATE_WRITE_BATCH_SIZE=100,
+        STATE_FLUSH_INTERVAL=0.05,
+        STATE_FLUSH_MAX_ATTEMPTS=3,
+        NOTIFICATIONS_MAX_ITEMS=100,
+        CONVERSATIONS_MAX_BYTES=1024 * 1024,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def make_notification(notification_id, user_id="all"):
+    return {"id": notification_id, "userId": user_id, "read": False, "title": notification_id}
+
+
+def open_stores(path, **kwargs):
+    database = SQLiteDatabase(str(path), **kwargs)
+    notifications = SQLNotificationStore(database)
+    conversations = SQLConversationStore(database)
+    notifications.init_schema()
+    conversations.init_schema()
+    return database, notifications, conversations
+
+
+class TestBuildState:
+    """Tests du choix du backend"""
+
+    def test_memory_default(self):
+        state = build_state(make_settings())
+        assert isinstance(state.notifications, NotificationStore)
+        assert state.database is None
+
+    def test_sqlite(self, tmp_path):
+        state = build_state(make_settings(STATE_BACKEND="sqlite", STATE_SQLITE_PATH=str(tmp_path / "s.db")))
+        assert isinstance(state.notifications, SQLNotificationStore)
+        assert isinstance(state.conversations, SQLConversationStore)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            build_state(make_settings(STATE_BACKEND="redis"))
+
+
+class TestSQLNotificationStore:
+    """Tests des notifications persistées"""
+
+    def test_visible_and_counters(self, tmp_path):
+        _, store, _ = open_stores(tmp_path / "s.db")
+        for notification_id, user_id in [("1", "alice"), ("2", "all"), ("3", "bob"), ("4", "alice")]:
+            store.add(make_notification(notification_id, user_id))
+
+        assert [n["id"] for n in store.visible("alice")] == ["4", "2", "1"]
+        assert store.total("alice") == 3
+        assert store.unread_count("bob") == 2
+
+        assert store.mark_read("2")["read"] is True
+        assert store.unread_count("alice") == 2
+        assert [n["id"] for n in store.visible("alice", unread_only=True)] == ["4", "1"]
+        assert store.mark_all_read("alice") == 2
+        assert store.unread_count("bob") == 1
+
+    def test_delete_clear_and_cap(self, tmp_path):
+        database = SQLiteDatabase(str(tmp_path / "s.db"))
+        store = SQLNotificationStore(database, max_items=2)
+        store.init_schema()
+        for notification_id in ("1", "2", "3"):
+            store.add(make_notification(notification_id, "alice"))
+
+        assert len(store) == 2
+        assert store.get("1") is None
+        assert store.delete("2") is True
+        assert store.delete("2") is False
+        assert store.clear("alice") == 1
+        assert len(store) == 0
+
+    def test_shared_between_workers_and_durable(self, tmp_path):
+        path = tmp_path / "s.db"
+        database_a, worker_a, _ = open_stores(path)
+        database_b, worker_b, _ = open_stores(path)
+
+        worker_a.add(make_notification("1", "alice"))
+        assert worker_b.unread_count("alice") == 1
+        worker_b.mark_read("1")
+        assert worker_a.unread_count("alice") == 0
+
+        database_a.close()
+        database_b.close()
+        _, restarted, _ = open_stores(path)
+        assert restarted.get("1")["read"] is True
+
+
+class TestSQLConversationStore:
+    """Tests des conversations persistées"""
+
+    def test_conversation_lifecycle(self, tmp_path):
+        _, _, store = open_stores(tmp_path / "s.db")
+        first = store.create("Bilan", "P1")
+        store.create("Suivi", "P2")
+        store.add_message(first.id, "user", "x" * 150, sources=[{"doc": 1}])
+        store.add_message(first.id, "assistant", "réponse")
+
+        conversation = store.get(first.id).to_dict()
+        assert [m["role"] for m in conversation["messages"]] == ["user", "assistant"]
+        assert conversation["messages"][0]["sources"] == [{"doc": 1}]
+
+        summaries, total = store.recent("P1")
+        assert total == 1
+        assert summaries[0]["messageCount"] == 2
+        assert summaries[0]["lastMessage"] == "réponse"
+        assert store.recent()[1] == 2
+
+        assert store.rename(first.id, "Nouveau").title == "Nouveau"
+        assert store.add_message("inconnu", "user", "x") is None
+        assert store.delete(first.id) is True
+        assert store.get(first.id) is None
+        assert store.clear() == 1
+
+
+class TestWriteBehind:
+    """Tests du tampon d'écritures (utilisé par le backend postgres)"""
+
+    def test_writes_batched_and_flushed_before_reads(self, tmp_path):
+        path = tmp_path / "s.db"
+        database, store, _ = open_stores(path, batch_size=10)
+        _, other_worker, _ = open_stores(path)
+
+        store.add(make_notification("1", "alice"))
+        assert database.stats()["pendingWrites"] == 2
+        assert other_worker.total("alice") == 0
+
+        # Une lecture du même worker vide le tampon d'abord
+        assert store.total("alice") == 1
+        assert database.stats()["pendingWrites"] == 0
+        assert database.stats()["totalFlushes"] == 1
+        assert other_worker.total("alice") == 1
+
+    async def test_background_flush(self, tmp_path):
+        path = tmp_path / "s.db"
+        database, store, _ = open_stores(path, batch_size=10, flush_interval=0.01)
+        _, other_worker, _ = open_stores(path)
+        database.start()
+
+        store.add(make_notification("1", "alice"))
+        await asyncio.sleep(0.05)
+        assert other_worker.total("alice") == 1
+
+        await database.stop()
+
+    def test_failing_batch_dropped_after_max_attempts(self, tmp_path):
+        database, store, _ = open_stores(tmp_path / "s.db", batch_size=10, max_flush_attempts=2)
+        database.write("INSERT INTO table_inconnue VALUES (?)", (1,))
+        store.add(make_notification("1", "alice"))
+
+        # La lecture aboutit malgré le lot en échec, qui est retenté une fois
+        assert store.total("alice") == 0
+        assert database.stats()["pendingWrites"] == 3
+        assert store.total("alice") == 0
+        assert database.stats()["pendingWrites"] == 0
+        assert database.stats()["droppedWrites"] == 3
+
+        store.add(make_notification("2", "alice"))
+        assert store.total("alice") == 1
+
+    def test_write_through_failure_not_retried(self, tmp_path):
+        database, store, _ = open_stores(tmp_path / "s.db")
+        with pytest.raises(sqlite3.OperationalError):
+            database.write("INSERT INTO table_inconnue VALUES (?)", (1,))
+
+        store.add(make_notification("1", "alice"))
+        assert store.total("alice") == 1
+        assert database.stats()["droppedWrites"] == 1
+
+
+class TestSQLDatabase:
+    """Tests de la connexion et du thread de la base"""
+
+    def test_connect_is_abstract(self):
+        with pytest.raises(TypeError):
+            SQLDatabase()
+
+    def test_failed_query_rolls_back_and_reconnects(self, tmp_path):
+        database, store, _ = open_stores(tmp_path / "s.db")
+        connection = database.connection
+        with pytest.raises(sqlite3.OperationalError):
+            database.query("SELECT * FROM table_inconnue")
+
+        assert database.stats()["reconnects"] == 1
+        assert database.connection is not connection
+        store.add(make_notification("1", "alice"))
+        assert store.total("alice") == 1
+
+    async def test_calls_run_off_the_event_loop(self, tmp_path):
+        database, store, _ = open_stores(tmp_path / "s.db")
+        state = build_state(make_settings(STATE_BACKEND="sqlite", STATE_SQLITE_PATH=str(tmp_path / "s.db")))
+        schema_threads = []
+        init_schema = state.conversations.init_schema
+
+        def record_schema():
+            schema_threads.append(threading.current_thread())
+            init_schema()
+
+        state.conversations.init_schema = record_schema
+        await state.start()
+        # Le DDL du schéma ne bloque pas la boucle d'événements
+        assert schema_threads[0] is not threading.current_thread()
+        threads = []
+
+        def add(notification):
+            threads.append(threading.current_thread())
+            state.notifications.add(notification)
+
+        state.submit(add, make_notification("1", "alice"))
+        assert await state.call(state.notifications.total, "alice") == 1
+        assert threads[0] is not threading.current_thread()
+
+        # Une erreur d'un appel sans attente est journalisée, pas levée
+        state.submit(database.write, "INSERT INTO table_inconnue VALUES (?)", (1,))
+        assert await state.call(state.notifications.unread_count, "alice") == 1
+        await state.aclose()
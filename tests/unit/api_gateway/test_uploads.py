@@ -0,0 +1,44 @@
+"""
+Tests unitaires pour le relais en flux des uploads de l'API Gateway
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from uploads import MultipartRelay, UploadTooLarge, HEAD_SNIFF_LIMIT
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def drain(relay):
+    return [chunk async for chunk in relay]
+
+
+class TestMultipartRelay:
+    """Tests de l'itérateur de relais multipart"""
+
+    async def test_chunks_forwarded_unchanged(self):
+        parts = [b"--b\r\n", b'Content-Disposition: form-data; name="file"; filename="cr.pdf"\r\n\r\n', b"x" * 1000]
+        relay = MultipartRelay(chunks(*parts), max_size=10_000)
+        assert await drain(relay) == parts
+        assert relay.size == sum(len(p) for p in parts)
+
+    async def test_filename_split_across_chunks(self):
+        relay = MultipartRelay(chunks(b'--b\r\nContent-Disposition: form-data; name="file"; file', b'name="Rapport_001.pdf"\r\n'), 10_000)
+        await drain(relay)
+        assert relay.filename == "Rapport_001.pdf"
+
+    async def test_filename_not_searched_beyond_head(self):
+        relay = MultipartRelay(chunks(b"x" * HEAD_SNIFF_LIMIT, b'filename="late.pdf"'), 10 ** 6)
+        await drain(relay)
+        assert relay.filename is None
+
+    async def test_too_large_aborts(self):
+        relay = MultipartRelay(chunks(b"a" * 600, b"b" * 600), max_size=1000)
+        with pytest.raises(UploadTooLarge):
+            await drain(relay)
@@ -0,0 +1,121 @@
+"""
+Tests unitaires pour le registre de clients HTTP de l'API Gateway
+"""
+import pytest
+import httpx
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'api-gateway'))
+
+from upstreams import UpstreamConfig, UpstreamClient, UpstreamRegistry, build_upstream_configs
+
+
+def make_settings(**overrides):
+    values = dict(
+        DOC_INGESTOR_URL="http://doc:8001",
+        DEID_SERVICE_URL="http://deid:8002",
+        INDEXEUR_URL="http://indexeur:8003",
+        LLM_QA_URL="http://llm:8004",
+        SYNTHESE_URL="http://synthese:8005",
+        AUDIT_URL="http://audit:8006",
+        UPSTREAM_MAX_CONNECTIONS=50,
+        UPSTREAM_MAX_KEEPALIVE=20,
+        UPSTREAM_KEEPALIVE_EXPIRY=30.0,
+        UPSTREAM_CONNECT_TIMEOUT=5.0,
+        UPSTREAM_READ_TIMEOUT=60.0,
+        LLM_MAX_CONNECTIONS=4,
+        LLM_READ_TIMEOUT=120.0,
+        UPSTREAM_HTTP2="",
+        CIRCUIT_FAILURE_THRESHOLD=5,
+        CIRCUIT_RESET_TIMEOUT=30.0,
+        CIRCUIT_HALF_OPEN_MAX_CALLS=1,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestBuildUpstreamConfigs:
+    """Tests de la construction des configurations par service"""
+
+    def test_all_services_configured(self):
+        configs = build_upstream_configs(make_settings())
+        names = [c.name for c in configs]
+        assert names == [
+            "doc-ingestor", "deid-service", "indexeur-semantique",
+            "llm-qa-module", "synthese-comparative", "audit-logger"
+        ]
+
+    def test_llm_services_have_dedicated_limits(self):
+        configs = {c.name: c for c in build_upstream_configs(make_settings())}
+        assert configs["llm-qa-module"].max_connections == 4
+        assert configs["llm-qa-module"].max_keepalive_connections == 4
+        assert configs["llm-qa-module"].read_timeout == 120.0
+        assert configs["doc-ingestor"].max_connections == 50
+        assert configs["doc-ingestor"].read_timeout == 60.0
+
+    def test_http2_opt_in(self):
+        configs = {c.name: c for c in build_upstream_configs(make_settings(UPSTREAM_HTTP2="audit-logger, deid-service"))}
+        assert configs["audit-logger"].http2 is True
+        assert configs["deid-service"].http2 is True
+        assert configs["doc-ingestor"].http2 is False
+
+
+class TestUpstreamClient:
+    """Tests du client HTTP par service"""
+
+    async def test_request_uses_base_url_and_counts(self):
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, json={"ok": True})
+
+        client = UpstreamClient(
+            UpstreamConfig(name="doc-ingestor", base_url="http://doc:8001/"),
+            transport=httpx.MockTransport(handler)
+        )
+        response = await client.get("/api/documents", params={"limit": 5})
+
+        assert response.json() == {"ok": True}
+        assert seen == ["http://doc:8001/api/documents?limit=5"]
+        stats = client.stats()
+        assert stats["totalRequests"] == 1
+        assert stats["inFlight"] == 0
+        assert stats["peakInFlight"] == 1
+        await client.aclose()
+
+    async def test_request_error_counted(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client = UpstreamClient(
+            UpstreamConfig(name="audit-logger", base_url="http://audit:8006"),
+            transport=httpx.MockTransport(handler)
+        )
+        with pytest.raises(httpx.RequestError):
+            await client.post("/api/audit/log", json={})
+
+        assert client.stats()["totalErrors"] == 1
+        assert client.in_flight == 0
+        await client.aclose()
+
+    async def test_pool_stats_on_real_transport(self):
+        client = UpstreamClient(UpstreamConfig(name="deid-service", base_url="http://deid:8002", max_connections=8))
+        stats = client.stats()
+        assert stats["pool"] == {"connections": 0, "idle": 0, "active": 0, "queued": 0}
+        assert stats["limits"]["maxConnections"] == 8
+        assert stats["saturation"] == 0
+        await client.aclose()
+
+
+class TestUpstreamRegistry:
+    """Tests du registre de clients"""
+
+    async def test_lookup_and_stats(self):
+        registry = UpstreamRegistry(build_upstream_configs(make_settings()))
+        assert len(registry) == 6
+        assert registry["llm-qa-module"].base_url == "http://llm:8004"
+        assert set(registry.stats()) == {c.name for c in registry}
+        await registry.aclose()
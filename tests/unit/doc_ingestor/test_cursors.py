@@ -0,0 +1,81 @@
+"""
+Tests unitaires pour la pagination par curseur de doc-ingestor
+(src/api/cursors.py et get_documents_page)
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Ajouter le chemin du microservice au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'doc-ingestor'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'doc-ingestor', 'src'))
+
+from api.cursors import InvalidCursor, decode_cursor, encode_cursor
+
+NOW = datetime(2026, 1, 15, 10, 30, 0, 123456)
+
+
+def rows(count):
+    return [
+        {"id": 100 - i, "filename": f"doc{i}.pdf", "created_at": NOW - timedelta(seconds=i), "upload_date": None}
+        for i in range(count)
+    ]
+
+
+class TestCursor:
+    """Tests de l'encodage des curseurs"""
+
+    def test_round_trip_keeps_microseconds(self):
+        cursor = encode_cursor(NOW, 42)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (NOW, 42)
+
+    @pytest.mark.parametrize("cursor", ["???", "bm9uLWpzb24", encode_cursor(NOW, 1)[:-3], "WzFd"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor)
+
+
+class TestDocumentsPage:
+    """Tests de la requête keyset du repository"""
+
+    def query(self, fetched, **kwargs):
+        from database.repository import get_documents_page
+
+        cursor = MagicMock()
+        cursor.fetchall.return_value = fetched
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        with patch('database.repository.get_connection', return_value=conn):
+            result = get_documents_page(**kwargs)
+        sql, params = cursor.execute.call_args[0]
+        return result, sql, params
+
+    def test_next_position_from_last_row(self):
+        (documents, next_position), sql, params = self.query(rows(3), limit=2)
+
+        assert len(documents) == 2
+        assert documents[1]["created_at"] == (NOW - timedelta(seconds=1)).isoformat()
+        assert next_position == (NOW - timedelta(seconds=1), 99)
+        assert "ORDER BY created_at DESC, id DESC LIMIT %s" in sql
+        assert "OFFSET" not in sql
+        assert params == [3]
+
+    def test_after_position_replaces_offset(self):
+        (documents, next_position), sql, params = self.query(
+            rows(1), limit=2, after=(NOW, 100), patient_id="P001", offset=500
+        )
+
+        assert next_position is None
+        assert "(created_at, id) < (%s, %s)" in sql
+        assert "OFFSET" not in sql
+        assert params == ["P001", NOW, 100, 3]
+
+    def test_empty_page_without_query(self):
+        from database.repository import get_documents_page
+
+        with patch('database.repository.get_connection') as get_connection:
+            assert get_documents_page(limit=0) == ([], None)
+        get_connection.assert_not_called()
@@ -0,0 +1,39 @@
+"""
+Tests unitaires pour doc-ingestor/src/api/etags.py
+"""
+import sys
+import os
+
+# Ajouter le chemin du microservice au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'doc-ingestor'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'doc-ingestor', 'src'))
+
+from api.etags import document_etag, etag_matches
+
+
+class TestDocumentEtag:
+    """Tests du calcul de l'ETag"""
+
+    def test_strong_quoted_etag(self):
+        etag = document_etag({"checksum": "abc", "updated_at": "2024-01-01T00:00:00"})
+        assert etag.startswith('"') and etag.endswith('"')
+        assert not etag.startswith("W/")
+
+    def test_stable_for_same_version(self):
+        document = {"checksum": "abc", "updated_at": "2024-01-01T00:00:00"}
+        assert document_etag(document) == document_etag(dict(document))
+
+    def test_changes_with_update_or_content(self):
+        base = document_etag({"checksum": "abc", "updated_at": "2024-01-01T00:00:00"})
+        assert base != document_etag({"checksum": "abc", "updated_at": "2024-01-02T00:00:00"})
+        assert base != document_etag({"checksum": "def", "updated_at": "2024-01-01T00:00:00"})
+
+
+class TestEtagMatches:
+    """Tests de la comparaison If-None-Match"""
+
+    def test_matches(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
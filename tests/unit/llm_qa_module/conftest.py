@@ -0,0 +1,50 @@
+"""
+Chargement des modules de llm-qa-module pour les tests unitaires
+
+Les microservices partagent les noms de modules `config` et `src` : les
+modules de llm-qa sont importés à part puis retirés de sys.modules, pour
+ne pas masquer ceux des autres services dans la même session pytest.
+"""
+import importlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+LLM_QA_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'microservices', 'llm-qa-module')
+)
+
+MODULES = (
+    "config",
+    "src.deadline",
+    "src.metrics",
+    "src.tracing",
+    "src.services.qa_service",
+    "src.services.context_service",
+    "src.api.routes",
+)
+
+
+def _shared_name(name: str) -> bool:
+    return name == "config" or name == "src" or name.startswith("src.")
+
+
+@pytest.fixture(scope="session")
+def llm_qa():
+    """Modules de llm-qa-module, par nom court (deadline, qa_service, routes...)"""
+    saved = {name: module for name, module in sys.modules.items() if _shared_name(name)}
+    for name in saved:
+        del sys.modules[name]
+    sys.path.insert(0, LLM_QA_DIR)
+    try:
+        modules = {name.rsplit(".", 1)[-1]: importlib.import_module(name) for name in MODULES}
+    finally:
+        sys.path.remove(LLM_QA_DIR)
+        for name in [name for name in sys.modules if _shared_name(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+    # Pas de fichier de traces pendant les tests
+    modules["tracing"].sink.enabled = False
+    return SimpleNamespace(**modules)
@@ -0,0 +1,180 @@
+"""
+Tests unitaires pour le respect de l'échéance (X-Deadline-Ms) dans llm-qa-module :
+retrieval, reranking et budget de tokens de la génération
+"""
+import time
+from contextlib import contextmanager
+
+import httpx
+import pytest
+
+DOCUMENTS = [{"document_id": f"d{i}", "content": f"document {i}", "score": 0.9} for i in range(8)]
+
+
+@contextmanager
+def deadline_in(llm_qa, seconds):
+    token = llm_qa.deadline._deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        llm_qa.deadline._deadline.reset(token)
+
+
+def mock_http(monkeypatch, handler):
+    """Appels sortants (indexeur, Ollama) simulés par handler(request)"""
+    client_class = httpx.AsyncClient
+
+    def client(**kwargs):
+        return client_class(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", client)
+
+
+def indexer(llm_qa, monkeypatch, handler):
+    """ContextService dont l'indexeur est simulé par handler(request)"""
+    mock_http(monkeypatch, handler)
+    return llm_qa.context_service.ContextService()
+
+
+class TestRetrieval:
+    """Tests de l'appel à l'indexeur sous échéance"""
+
+    async def test_post_timeout_does_not_fall_back_to_get(self, llm_qa, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            raise httpx.ReadTimeout("timeout", request=request)
+
+        service = indexer(llm_qa, monkeypatch, handler)
+        with deadline_in(llm_qa, 60):
+            documents = await service.search_relevant_documents("allergies", limit=2)
+
+        assert calls == ["POST"]
+        assert len(documents) == 2  # documents de secours
+
+    async def test_post_timeout_at_deadline_raises(self, llm_qa, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            # Le POST a consommé le budget jusqu'à la réserve de génération
+            llm_qa.deadline._deadline.set(time.monotonic() + 1)
+            raise httpx.ReadTimeout("timeout", request=request)
+
+        service = indexer(llm_qa, monkeypatch, handler)
+        with deadline_in(llm_qa, 60):
+            with pytest.raises(llm_qa.deadline.DeadlineExceeded):
+                await service.search_relevant_documents("allergies", limit=2)
+        assert calls == ["POST"]
+
+    async def test_get_fallback_uses_remaining_budget(self, llm_qa, monkeypatch):
+        seen = []
+
+        def handler(request):
+            seen.append((request.method, request.extensions["timeout"]["read"], request.headers.get("X-Deadline-Ms")))
+            if request.method == "POST":
+                llm_qa.deadline._deadline.set(time.monotonic() + 12)
+                raise httpx.RemoteProtocolError("connexion fermée", request=request)
+            return httpx.Response(200, json={"results": DOCUMENTS})
+
+        service = indexer(llm_qa, monkeypatch, handler)
+        with deadline_in(llm_qa, 60):
+            documents = await service.search_relevant_documents("allergies", limit=3)
+
+        assert [method for method, _, _ in seen] == ["POST", "GET"]
+        assert seen[0][1] == 30.0
+        # Budget restant (12 s) moins la réserve de génération (5 s)
+        assert 6.5 < seen[1][1] <= 7.0
+        assert int(seen[1][2]) <= 12000
+        assert [d["document_id"] for d in documents] == ["d0", "d1", "d2"]
+
+    async def test_get_fallback_refused_below_reserve(self, llm_qa, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            llm_qa.deadline._deadline.set(time.monotonic() + 2)
+            raise httpx.RemoteProtocolError("connexion fermée", request=request)
+
+        service = indexer(llm_qa, monkeypatch, handler)
+        with deadline_in(llm_qa, 60):
+            with pytest.raises(llm_qa.deadline.DeadlineExceeded):
+                await service.search_relevant_documents("allergies", limit=2)
+        assert calls == ["POST"]
+
+
+class TestRerank:
+    """Tests du reranking écourté par l'échéance"""
+
+    async def test_scoring_stops_at_generation_reserve(self, llm_qa, monkeypatch):
+        service = llm_qa.qa_service.QAService()
+        scored = []
+
+        async def score(question, content):
+            scored.append(content)
+            if len(scored) == 2:
+                # Le budget restant ne couvre plus que la génération
+                llm_qa.deadline._deadline.set(time.monotonic() + 10)
+            return {"document 0": 0.1, "document 1": 0.9}[content]
+
+        monkeypatch.setattr(service, "_score_relevance", score)
+        with deadline_in(llm_qa, 60):
+            ranked, count = await service._rerank_documents("question", DOCUMENTS)
+
+        assert count == 2
+        # Documents notés par score, puis non notés dans l'ordre de l'indexeur
+        assert [d["document_id"] for d in ranked] == ["d1", "d0", "d2", "d3", "d4"]
+
+    async def test_scoring_keeps_generation_reserve_and_estimates(self, llm_qa, monkeypatch):
+        service = llm_qa.qa_service.QAService()
+        seen = {}
+
+        def handler(request):
+            seen["read"] = request.extensions["timeout"]["read"]
+            return httpx.Response(200, json={
+                "response": "8", "eval_count": 10, "eval_duration": 100_000_000, "total_duration": 2_000_000_000
+            })
+
+        mock_http(monkeypatch, handler)
+        with deadline_in(llm_qa, 40):
+            assert await service._score_relevance("question", "document") == 0.8
+
+        # Budget (40 s) moins la réserve de génération (30 s)
+        assert 9.5 < seen["read"] <= 10.0
+        # Les notations de 10 tokens ne faussent pas le débit observé
+        assert service.tokens_per_second is None
+        assert service.overhead_seconds is None
+
+    async def test_scoring_propagates_deadline(self, llm_qa):
+        service = llm_qa.qa_service.QAService()
+        with deadline_in(llm_qa, 1):
+            with pytest.raises(llm_qa.deadline.DeadlineExceeded):
+                await service._score_relevance("question", "document")
+
+
+class TestBudgetedTokens:
+    """Tests du nombre de tokens demandé sous échéance"""
+
+    def test_without_deadline_or_estimate(self, llm_qa):
+        service = llm_qa.qa_service.QAService()
+        assert service._budgeted_tokens(1024) == 1024
+        with deadline_in(llm_qa, 10):
+            assert service._budgeted_tokens(1024) == 1024
+
+    def test_limited_by_observed_throughput(self, llm_qa):
+        service = llm_qa.qa_service.QAService()
+        service.tokens_per_second = 20.0
+        service.overhead_seconds = 1.0
+        with deadline_in(llm_qa, 11):
+            # (11 s - 1 s) x 20 tokens/s x 0.9
+            assert 175 <= service._budgeted_tokens(1024) <= 180
+        with deadline_in(llm_qa, 100):
+            assert service._budgeted_tokens(1024) == 1024
+
+    def test_minimum_tokens(self, llm_qa):
+        service = llm_qa.qa_service.QAService()
+        service.tokens_per_second = 20.0
+        service.overhead_seconds = 5.0
+        with deadline_in(llm_qa, 2):
+            assert service._budgeted_tokens(1024) == llm_qa.config.settings.DEADLINE_MIN_TOKENS
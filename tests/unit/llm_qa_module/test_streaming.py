@@ -0,0 +1,142 @@
+"""
+Tests unitaires pour les réponses streamées de llm-qa-module (POST /api/qa/ask/stream)
+avec un Ollama simulé (flux NDJSON)
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+CONTEXT = [
+    {"id": "d1", "filename": "cr.pdf", "content": "Allergie à la pénicilline.", "score": 0.9},
+    {"id": "d2", "filename": "ordo.pdf", "content": "Amoxicilline contre-indiquée.", "score": 0.8},
+]
+
+DONE = {"done": True, "eval_count": 3, "eval_duration": 300_000_000, "total_duration": 900_000_000}
+
+
+def ollama_lines(*chunks):
+    async def lines():
+        for chunk in chunks:
+            await asyncio.sleep(0)
+            yield (json.dumps(chunk) + "\n").encode()
+    return lines()
+
+
+def parse_events(text):
+    events = []
+    for frame in text.strip().split("\n\n"):
+        event, data = frame.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+@pytest.fixture
+def stream(llm_qa, monkeypatch):
+    """Appelle /api/qa/ask/stream avec ollama(request) comme Ollama ; audits postés dans audits"""
+    client_class = httpx.AsyncClient
+    audits = []
+
+    async def search(**kwargs):
+        return CONTEXT
+
+    monkeypatch.setattr(llm_qa.routes.context_service, "search_relevant_documents", search)
+
+    async def call(ollama):
+        def handler(request):
+            if request.url.path == "/api/audit/log":
+                audits.append(json.loads(request.content))
+                return httpx.Response(201)
+            return ollama(request)
+
+        monkeypatch.setattr(
+            httpx, "AsyncClient", lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs)
+        )
+        app = FastAPI()
+        app.include_router(llm_qa.routes.router, prefix="/api/qa")
+        transport = httpx.ASGITransport(app=app)
+        async with client_class(transport=transport, base_url="http://llm-qa") as client:
+            response = await client.post("/api/qa/ask/stream", json={"question": "Allergies connues ?"})
+        return response, parse_events(response.text), audits
+
+    return call
+
+
+def ttft_count(llm_qa):
+    return llm_qa.metrics.REGISTRY.get_sample_value("llm_qa_ttft_seconds_count") or 0
+
+
+class TestAskStream:
+    """Tests de l'ordre des événements SSE et des mesures"""
+
+    async def test_sources_tokens_then_done(self, llm_qa, stream):
+        requests = []
+
+        def ollama(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, content=ollama_lines(
+                {"response": "Allergie "}, {"response": "à la "}, {"response": "pénicilline."}, DONE
+            ))
+
+        before = ttft_count(llm_qa)
+        response, events, audits = await stream(ollama)
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert [event for event, _ in events] == ["sources", "token", "token", "token", "done"]
+        assert [s["document_id"] for s in events[0][1]["sources"]] == ["d1", "d2"]
+        assert "".join(data["token"] for event, data in events if event == "token") == "Allergie à la pénicilline."
+        done = events[-1][1]
+        assert done["answer"] == "Allergie à la pénicilline."
+        assert 0 <= done["ttft_ms"] <= done["processing_time_ms"]
+        assert requests[0]["stream"] is True
+
+        # Un seul premier token mesuré par réponse
+        assert ttft_count(llm_qa) == before + 1
+        assert [audit["query_text"] for audit in audits] == ["Allergies connues ?"]
+
+    async def test_error_event_when_ollama_fails_mid_stream(self, llm_qa, stream):
+        def ollama(request):
+            return httpx.Response(200, content=ollama_lines({"response": "Allergie "}, {"error": "model crashed"}))
+
+        response, events, audits = await stream(ollama)
+
+        assert response.status_code == 200
+        assert [event for event, _ in events] == ["sources", "token", "error"]
+        assert "model crashed" in events[-1][1]["detail"]
+        # Pas de réponse complète : rien à auditer
+        assert audits == []
+
+    async def test_error_event_when_ollama_unreachable(self, llm_qa, stream):
+        def ollama(request):
+            raise httpx.ConnectError("refus de connexion", request=request)
+
+        before = ttft_count(llm_qa)
+        response, events, _ = await stream(ollama)
+
+        assert [event for event, _ in events] == ["sources", "error"]
+        assert "Ollama" in events[-1][1]["detail"]
+        assert ttft_count(llm_qa) == before
+
+
+class TestStreamAnswer:
+    """Tests de QAService.stream_answer"""
+
+    async def test_tokens_then_final_answer(self, llm_qa, monkeypatch):
+        client_class = httpx.AsyncClient
+
+        def handler(request):
+            return httpx.Response(200, content=ollama_lines({"response": " Oui"}, {"response": "."}, DONE))
+
+        monkeypatch.setattr(
+            httpx, "AsyncClient", lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs)
+        )
+        service = llm_qa.qa_service.QAService()
+        chunks = [chunk async for chunk in service.stream_answer("Allergies ?", CONTEXT)]
+
+        assert chunks[:2] == [{"token": " Oui"}, {"token": "."}]
+        assert chunks[-1]["answer"] == "Oui."
+        assert set(chunks[-1]) == {"answer", "confidence", "query_id"}
+        # Débit de la réponse (done=true) retenu pour le budget de tokens
+        assert service.tokens_per_second == pytest.approx(10.0)
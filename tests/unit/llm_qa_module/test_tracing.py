@@ -0,0 +1,24 @@
+"""
+Tests unitaires pour l'export des spans de llm-qa-module (src/tracing.py)
+"""
+import json
+
+
+class TestTraceSink:
+    """Tests du fichier JSONL des traces"""
+
+    def test_disabled_by_default(self, llm_qa):
+        assert llm_qa.config.Settings().TRACE_ENABLED is False
+
+    def test_rotation_bounds_disk_usage(self, llm_qa, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        sink = llm_qa.tracing.TraceSink(str(path), max_bytes=1000, backup_count=2)
+        for i in range(100):
+            sink.emit({"span": "generation", "request_id": f"r{i:03d}", "padding": "x" * 50})
+        sink.close()
+
+        files = sorted(tmp_path.iterdir())
+        assert [f.name for f in files] == ["traces.jsonl", "traces.jsonl.1", "traces.jsonl.2"]
+        assert all(f.stat().st_size <= 1000 for f in files)
+        last = path.read_text(encoding="utf-8").splitlines()[-1]
+        assert json.loads(last)["request_id"] == "r099"
@@ -3,13 +3,16 @@ Script pour uploader automatiquement les documents médicaux de test
 dans le système DocQA
 """
 import os
+import json
 import requests
 import glob
-import time
+from contextlib import ExitStack
 
 # Configuration
 API_GATEWAY_URL = "http://localhost:8000"
 MEDICAL_DATA_DIR = "./medical_data"
+# Documents par appel à /api/documents/upload/bulk (BULK_UPLOAD_MAX_FILES côté gateway)
+BULK_CHUNK_SIZE = 50
 
 def upload_document(filepath: str, patient_id: str = None, document_type: str = "rapport_medical"):
     """Upload un document vers le système"""
@@ -46,6 +49,49 @@ def upload_document(filepath: str, patient_id: str = None, document_type: str =
         return False
 
 
+def patient_id_for(filepath: str):
+    """ID patient déduit du nom de fichier (ex: CR_Cardio_Benali_001.pdf -> P001)"""
+    filename = os.path.basename(filepath)
+    if "_" not in filename:
+        return None
+    parts = filename.replace(".pdf", "").split("_")
+    return f"P{parts[-1]}" if parts[-1].isdigit() else None
+
+
+def upload_bulk(filepaths: list, document_type: str = "rapport_medical"):
+    """
+    Upload un lot de documents en un seul appel (/api/documents/upload/bulk)
+    
+    Retourne un résultat par fichier, ou None si la gateway ne propose pas
+    l'upload groupé (ancienne version).
+    """
+    manifest = {
+        os.path.basename(path): {"patient_id": patient_id_for(path)}
+        for path in filepaths
+        if patient_id_for(path)
+    }
+    with ExitStack() as stack:
+        files = [
+            ('files', (os.path.basename(path), stack.enter_context(open(path, 'rb')), 'application/pdf'))
+            for path in filepaths
+        ]
+        response = requests.post(
+            f"{API_GATEWAY_URL}/api/documents/upload/bulk",
+            files=files,
+            data={'document_type': document_type, 'manifest': json.dumps(manifest)},
+            timeout=600
+        )
+    
+    if response.status_code in (404, 405):
+        return None
+    if response.status_code != 200:
+        return [
+            {"filename": os.path.basename(path), "status": response.status_code, "error": response.text[:100]}
+            for path in filepaths
+        ]
+    return response.json()["results"]
+
+
 def main():
     print("=" * 60)
     print("   DocQA - Upload des Documents Médicaux de Test")
@@ -74,29 +120,34 @@ def main():
     
     print(f"📁 {len(pdf_files)} documents PDF trouvés\n")
     
-    # Upload de chaque document
+    # Upload par lots (un appel par lot, documents traités en parallèle par la gateway)
     success_count = 0
     error_count = 0
     
-    for i, filepath in enumerate(pdf_files, 1):
-        print(f"[{i}/{len(pdf_files)}] ", end="")
+    for start in range(0, len(pdf_files), BULK_CHUNK_SIZE):
+        chunk = pdf_files[start:start + BULK_CHUNK_SIZE]
+        try:
+            results = upload_bulk(chunk)
+        except requests.exceptions.ConnectionError:
+            results = [{"filename": os.path.basename(p), "status": 503, "error": "Erreur de connexion au serveur"} for p in chunk]
         
-        # Générer un patient_id basé sur le nom du fichier
-        filename = os.path.basename(filepath)
-        if "_" in filename:
-            # Extraire un ID patient du nom de fichier (ex: CR_Cardio_Benali_001.pdf -> P001)
-            parts = filename.replace(".pdf", "").split("_")
-            patient_id = f"P{parts[-1]}" if parts[-1].isdigit() else None
-        else:
-            patient_id = None
+        if results is None:
+            # Gateway sans upload groupé : un appel par document
+            for i, filepath in enumerate(chunk, start + 1):
+                print(f"[{i}/{len(pdf_files)}] ", end="")
+                if upload_document(filepath, patient_id_for(filepath)):
+                    success_count += 1
+                else:
+                    error_count += 1
+            continue
         
-        if upload_document(filepath, patient_id):
-            success_count += 1
-        else:
-            error_count += 1
-        
-        # Petit délai entre les uploads
-        time.sleep(0.5)
+        for i, result in enumerate(results, start + 1):
+            if 200 <= result["status"] < 300:
+                print(f"[{i}/{len(pdf_files)}] ✅ {result['filename']} - Uploadé avec succès")
+                success_count += 1
+            else:
+                print(f"[{i}/{len(pdf_files)}] ❌ {result['filename']} - Erreur {result['status']}: {str(result.get('error'))[:100]}")
+                error_count += 1
     
     print()
     print("=" * 60)